@@ -9,6 +9,13 @@ import { BarcodeGenerator } from './modules/BarcodeGenerator.js';
 import { BarcodeScanner } from './modules/BarcodeScanner.js';
 import { StorageManager } from './modules/StorageManager.js';
 import { stateManager } from './modules/state.js';
+import { loadLibrary, prefetchLibrary } from './modules/loader.js';
+
+// Library each tab needs before it can do any work
+const TAB_LIBRARIES = {
+  generator: 'bwipjs',
+  scanner: 'zxing',
+};
 
 class BarcodeToolApp {
   constructor() {
@@ -190,6 +197,9 @@ class BarcodeToolApp {
         targetButton.classList.add('active');
       }
 
+      // Load this tab's library, then prefetch the others while idle
+      this.loadLibrariesForTab(tabId);
+
       // Handle tab-specific logic
       if (tabId !== 'scanner' && stateManager.get('scanner.isScanning')) {
         // Stop scanning when switching away from scanner tab
@@ -211,6 +221,30 @@ class BarcodeToolApp {
     }
   }
 
+  /**
+   * Load the library a tab depends on and prefetch the rest during idle time
+   */
+  loadLibrariesForTab(tabId) {
+    const prefetchOthers = () => {
+      Object.values(TAB_LIBRARIES)
+        .filter((name) => name !== TAB_LIBRARIES[tabId])
+        .forEach((name) => prefetchLibrary(name));
+    };
+
+    const library = TAB_LIBRARIES[tabId];
+    if (!library) {
+      prefetchOthers();
+      return;
+    }
+
+    loadLibrary(library)
+      .then(prefetchOthers)
+      .catch((error) => {
+        console.error('Error loading library:', error);
+        this.showError(error.message + '. Check your connection and try again.');
+      });
+  }
+
   /**
    * Show error message to user
    */
@@ -252,9 +286,9 @@ class BarcodeToolApp {
         clearTimeout(scanningTimeout);
       }
 
-      const drawingInterval = stateManager.get('scanner.drawingInterval');
-      if (drawingInterval) {
-        clearInterval(drawingInterval);
+      const previewTimeout = stateManager.get('generator.previewTimeout');
+      if (previewTimeout) {
+        clearTimeout(previewTimeout);
       }
 
       console.log('Application cleanup completed');
@@ -3,9 +3,43 @@
  */
 import { displayError, clearError, ErrorHandler } from './ui.js';
 import { stateManager } from './state.js';
+import { ZipWriter } from './ZipWriter.js';
+import { loadLibrary } from './loader.js';
+import { LABEL_TEMPLATES, parseBwipSvg, composeLabelSheet } from './labelSheet.js';
+import { optimizeSvg } from './svgOptimizer.js';
+import { LogoCache } from './LogoCache.js';
+import { DecodePool } from './DecodePool.js';
+import { verifySymbol, describeVerification } from './verification.js';
+import { pixelsPerModule } from './printSize.js';
+import { SEQUENCE_TYPES, generateSequence } from './sequence.js';
+import { validateRows } from './validation.js';
+import { planSymbol, describePlan } from './capacity.js';
+import { LINKED_TYPES, splitPayload, drawLinkedLayout, layoutLinkedSvg } from './linkedSymbols.js';
+import { FountainEncoder } from './fountain.js';
+import { clearQrPins } from './qrPinning.js';
+import {
+  validateText,
+  buildBwipOptions,
+  resolveScale,
+  renderCanvas,
+  renderSvg,
+  encodePng,
+  generate,
+  generateMany,
+} from './barcodeCore.js';
 
 export class BarcodeGenerator {
   constructor() {
+    this.previewDebounceMs = 250; // Coalesce bursts of keystrokes into one render
+    this.previewScale = 1; // Reduced scale keeps preview latency flat for large symbols
+    this.renderToken = 0; // Incremented on every input change; stale renders compare against it
+    this.previewInFlight = false;
+    this.previewPending = false;
+    this.batchLookahead = 2; // Images rendered ahead of the ZIP writer during batch export
+    this.verifyBacklog = 16; // Batch verifications queued in workers before rendering waits
+    this.decodePool = null; // Created on first verification
+    this.renderPool = null; // Created on first linked-symbol render
+    this.animation = null; // Running animated QR stream: { timer, encoder }
     this.initializeEventListeners();
     this.initializeUI();
   }
@@ -38,15 +72,132 @@ export class BarcodeGenerator {
     document.getElementById('removeLogoBtn').addEventListener('click', () => {
       this.removeLogo();
     });
+
+    // Batch export button click
+    document.getElementById('batchExportBtn').addEventListener('click', () => {
+      const lines = document.getElementById('batchInput').value.split(/\r?\n/);
+      this.exportBatch(lines);
+    });
+
+    // Batch check button click
+    document.getElementById('batchCheckBtn').addEventListener('click', () => {
+      const lines = document.getElementById('batchInput').value.split(/\r?\n/);
+      this.checkBatch(lines);
+    });
+
+    // Label sheet button click
+    document.getElementById('labelSheetBtn').addEventListener('click', () => {
+      const lines = document.getElementById('batchInput').value.split(/\r?\n/);
+      this.exportLabelSheet(lines, document.getElementById('labelTemplate').value, {
+        captions: document.getElementById('labelCaptions').value === 'true',
+      });
+    });
+
+    // Print size settings
+    ['printMode', 'printDpi', 'xDimension', 'xDimensionUnit'].forEach((id) => {
+      document.getElementById(id).addEventListener('input', () => {
+        this.updatePrintModeInfo();
+      });
+    });
+
+    // Sequence buttons
+    document.getElementById('sequenceExportBtn').addEventListener('click', () => {
+      this.exportSequence(this.getSequenceParams());
+    });
+    document.getElementById('sequenceFillBtn').addEventListener('click', () => {
+      this.fillBatchFromSequence(this.getSequenceParams());
+    });
+
+    // Animated QR stream
+    document.getElementById('animatedStartBtn').addEventListener('click', () => {
+      this.startAnimatedQr();
+    });
+    document.getElementById('animatedStopBtn').addEventListener('click', () => {
+      this.stopAnimatedQr();
+    });
+
+    // Live preview: listen on the whole tab since content fields are recreated by updateForm
+    const generatorTab = document.getElementById('generator');
+    ['input', 'change'].forEach((eventName) => {
+      generatorTab.addEventListener(eventName, (e) => {
+        if (e.target.id === 'logoUpload') {
+          return; // Rescheduled once the logo has been read
+        }
+        if (e.target.closest('#batchGroup, #sequenceGroup, #animatedGroup')) {
+          return; // Batch payloads, sequence and stream settings do not affect the preview
+        }
+        this.updateCapacityInfo();
+        this.schedulePreview();
+      });
+    });
   }
 
   /**
    * Initialize UI elements
    */
   initializeUI() {
+    const versionSelect = document.getElementById('qrVersion');
+    for (let version = 1; version <= 40; version++) {
+      const size = 17 + 4 * version;
+      versionSelect.add(new Option(`${version} (${size}x${size})`, version));
+    }
+
     // Set initial form state
     this.updateBarcodeOptionsVisibility();
     this.updateForm();
+    this.updatePrintModeInfo();
+  }
+
+  /**
+   * Show the predicted symbol size for the current input (2D types only)
+   */
+  updateCapacityInfo() {
+    const info = document.getElementById('capacityInfo');
+    const barcodeType = document.getElementById('barcodeType').value;
+    const text = this.getBarcodeText();
+    const plan = text ? planSymbol(barcodeType, text, this.getRenderOptions()) : null;
+    info.textContent = describePlan(plan);
+
+    if (plan && !plan.fits && LINKED_TYPES.includes(barcodeType)) {
+      try {
+        const parts = splitPayload(barcodeType, text, this.getRenderOptions());
+        info.textContent += ` - will be split across ${parts.length} linked symbols`;
+      } catch (error) {
+        info.textContent += ` - ${error.message}`;
+      }
+    }
+  }
+
+  /**
+   * Get print mode settings, or null when rendering at the default screen scale
+   * @returns {{dpi: number, pixels: number, actualMils: number, actualMm: number, deviation: number}|null}
+   */
+  getPrintSettings() {
+    const { print } = this.getRenderOptions();
+    if (!print) {
+      return null;
+    }
+    return { dpi: print.dpi, ...pixelsPerModule(print.dpi, print.xDimension, print.unit) };
+  }
+
+  /**
+   * Show the print options and the module size that will actually be printed
+   */
+  updatePrintModeInfo() {
+    const enabled = document.getElementById('printMode').value === 'true';
+    document.getElementById('printModeOptions').classList.toggle('hidden', !enabled);
+    if (!enabled) return;
+
+    const info = document.getElementById('printModeInfo');
+    try {
+      const print = this.getPrintSettings();
+      const deviation = Math.abs(print.deviation) >= 0.005 ? ` (${(print.deviation * 100).toFixed(0)}% from requested)` : '';
+      info.textContent =
+        `${print.pixels} dot${print.pixels === 1 ? '' : 's'} per module = ` +
+        `${print.actualMils.toFixed(1)} mil / ${print.actualMm.toFixed(3)} mm${deviation}`;
+    } catch (error) {
+      info.textContent = error.message;
+    }
   }
 
   /**
@@ -58,6 +209,7 @@ export class BarcodeGenerator {
     const pdf417OptionsGroup = document.getElementById('pdf417OptionsGroup');
     const logoGroup = document.getElementById('logoGroup');
     const oneDOptionsGroup = document.getElementById('oneDOptionsGroup');
+    const sequenceGroup = document.getElementById('sequenceGroup');
     const contentTypeSelect = document.getElementById('contentType');
 
     // Hide all specific option groups initially
@@ -65,6 +217,8 @@ export class BarcodeGenerator {
     pdf417OptionsGroup.classList.add('hidden');
     logoGroup.classList.add('hidden');
     oneDOptionsGroup.classList.add('hidden');
+    sequenceGroup.classList.toggle('hidden', !SEQUENCE_TYPES[barcodeType]);
+    document.getElementById('animatedGroup').classList.toggle('hidden', barcodeType !== 'qrcode');
 
     // Check if selected barcode type is a 1D barcode
     const is1DBarcode = [
@@ -267,18 +421,18 @@ export class BarcodeGenerator {
       if (barcodeType === 'ean13') {
         inputType = 'text';
         placeholder = 'Enter 12 digits (13th digit calculated automatically)';
-        pattern = '[0-9]{12}';
-        title = 'EAN-13 requires exactly 12 digits';
+        pattern = '[0-9]{12,13}';
+        title = 'EAN-13 requires 12 digits (or 13 including the check digit)';
       } else if (barcodeType === 'ean8') {
         inputType = 'text';
         placeholder = 'Enter 7 digits (8th digit calculated automatically)';
-        pattern = '[0-9]{7}';
-        title = 'EAN-8 requires exactly 7 digits';
+        pattern = '[0-9]{7,8}';
+        title = 'EAN-8 requires 7 digits (or 8 including the check digit)';
       } else if (barcodeType === 'upca') {
         inputType = 'text';
         placeholder = 'Enter 11 digits (12th digit calculated automatically)';
-        pattern = '[0-9]{11}';
-        title = 'UPC-A requires exactly 11 digits';
+        pattern = '[0-9]{11,12}';
+        title = 'UPC-A requires 11 digits (or 12 including the check digit)';
       } else if (barcodeType === 'upce') {
         inputType = 'text';
         placeholder = 'Enter 6 digits';
@@ -371,40 +525,36 @@ export class BarcodeGenerator {
       return;
     }
 
-    const reader = new FileReader();
-    reader.onload = (e) => {
-      try {
-        const logoImage = new Image();
-        logoImage.src = e.target.result;
-        stateManager.set('generator.selectedLogo', logoImage);
+    // Decode once; every later render reuses the bitmap and its pre-scaled copies
+    LogoCache.fromFile(file)
+      .then((logo) => {
+        stateManager.get('generator.selectedLogo')?.close();
+        stateManager.set('generator.selectedLogo', logo);
 
         // Update UI
         const logoPreview = document.getElementById('logoPreview');
         const removeLogoBtn = document.getElementById('removeLogoBtn');
 
-        logoPreview.src = e.target.result;
+        logoPreview.src = logo.previewUrl;
         logoPreview.style.display = 'inline-block';
         removeLogoBtn.style.display = 'inline-block';
 
         // Update barcode options if QR code is selected
         this.updateBarcodeOptionsVisibility();
         clearError();
-      } catch (error) {
+        this.updateCapacityInfo();
+        this.schedulePreview();
+      })
+      .catch((error) => {
         ErrorHandler.showUserError('Error loading logo: ' + error.message, error, 'BarcodeGenerator.handleLogoUpload');
-      }
-    };
-
-    reader.onerror = () => {
-      ErrorHandler.showUserError('Error reading logo file.');
-    };
-
-    reader.readAsDataURL(file);
+      });
   }
 
   /**
    * Remove logo
    */
   removeLogo() {
+    stateManager.get('generator.selectedLogo')?.close();
     stateManager.set('generator.selectedLogo', null);
 
     // Update UI
@@ -419,6 +569,120 @@ export class BarcodeGenerator {
     // Update barcode options
     this.updateBarcodeOptionsVisibility();
     clearError();
+    this.updateCapacityInfo();
+    this.schedulePreview();
+  }
+
+  /**
+   * Check whether live preview mode is enabled
+   */
+  isLivePreviewEnabled() {
+    const livePreview = document.getElementById('livePreview');
+    return !!livePreview && livePreview.value === 'true';
+  }
+
+  /**
+   * Invalidate any pending or in-flight preview render
+   */
+  cancelPreview() {
+    this.renderToken++;
+
+    const previewTimeout = stateManager.get('generator.previewTimeout');
+    if (previewTimeout) {
+      clearTimeout(previewTimeout);
+      stateManager.set('generator.previewTimeout', null);
+    }
+  }
+
+  /**
+   * Schedule a debounced live preview render after an input change
+   */
+  schedulePreview() {
+    // Any input change makes renders started before it stale
+    this.cancelPreview();
+
+    if (!this.isLivePreviewEnabled()) {
+      return;
+    }
+
+    const token = this.renderToken;
+    const previewTimeout = setTimeout(() => {
+      stateManager.set('generator.previewTimeout', null);
+      this.runPreview(token);
+    }, this.previewDebounceMs);
+
+    stateManager.set('generator.previewTimeout', previewTimeout);
+  }
+
+  /**
+   * Run a preview render, coalescing requests that arrive while one is in flight
+   */
+  async runPreview(token) {
+    if (this.previewInFlight) {
+      // Only the newest input matters; it is picked up when the current render finishes
+      this.previewPending = true;
+      return;
+    }
+
+    this.previewInFlight = true;
+    try {
+      await this.renderPreview(token);
+    } catch (error) {
+      console.warn('Live preview render failed:', error);
+    } finally {
+      this.previewInFlight = false;
+      if (this.previewPending) {
+        this.previewPending = false;
+        this.runPreview(this.renderToken);
+      }
+    }
+  }
+
+  /**
+   * Render a reduced-scale preview, abandoning it as soon as a newer input arrives
+   */
+  async renderPreview(token) {
+    const isStale = () => token !== this.renderToken || !this.isLivePreviewEnabled();
+
+    // Yield a frame so a burst of input events collapses into the newest one
+    await new Promise((resolve) => requestAnimationFrame(resolve));
+    await loadLibrary('bwipjs');
+    if (isStale()) return;
+
+    const barcodeType = document.getElementById('barcodeType').value;
+    const format = document.getElementById('outputFormat').value;
+    const text = this.getBarcodeText();
+    const errorMessage = document.getElementById('errorMessage');
+
+    // Incomplete input is normal while typing - stay quiet until it becomes valid
+    if (!text || !this.validateBarcodeInput(barcodeType, text, false)) {
+      return;
+    }
+
+    let preview;
+    try {
+      if (format === 'svg') {
+        preview = await this.generateSVGBarcode(barcodeType, text, this.previewScale);
+      } else {
+        preview = await this.generateCanvasBarcode(barcodeType, text, this.previewScale, token);
+      }
+    } catch (error) {
+      if (!isStale()) {
+        errorMessage.textContent = 'Preview: ' + error.message;
+      }
+      return;
+    }
+
+    if (!preview || isStale()) return;
+
+    const resultContainer = document.getElementById('generatedBarcodeContainer');
+    resultContainer.innerHTML = '';
+    resultContainer.style.display = 'block';
+    resultContainer.classList.toggle('square-barcode-container', ['qrcode', 'datamatrix', 'azteccode'].includes(barcodeType));
+
+    preview.classList.add('barcode-preview');
+    resultContainer.appendChild(preview);
+    clearError();
   }
 
   /**
@@ -428,6 +692,10 @@ export class BarcodeGenerator {
     return await ErrorHandler.wrapAsync(async () => {
       ErrorHandler.clearAllErrors();
 
+      // The full-scale render supersedes any pending preview
+      this.cancelPreview();
+      await loadLibrary('bwipjs');
+
       const barcodeType = document.getElementById('barcodeType').value;
       const format = document.getElementById('outputFormat').value;
 
@@ -438,6 +706,12 @@ export class BarcodeGenerator {
         return;
       }
 
+      // Too large for one symbol: split across linked symbols where the symbology allows it
+      if (LINKED_TYPES.includes(barcodeType) && !planSymbol(barcodeType, text, this.getRenderOptions()).fits) {
+        await this.generateLinkedSymbols(barcodeType, text, format);
+        return;
+      }
+
       // Validate specific barcode requirements
       if (!this.validateBarcodeInput(barcodeType, text)) {
         return; // Error already displayed in validation function
@@ -476,10 +750,205 @@ export class BarcodeGenerator {
         
         // Show success message
         ErrorHandler.showSuccess('Barcode generated successfully!');
+
+        if (this.isVerifyEnabled()) {
+          this.showVerification(resultContainer, barcodeType, text);
+        }
       }
     }, 'BarcodeGenerator.generateBarcode', 'Failed to generate barcode');
   }
 
+  /**
+   * Split an oversized payload across linked symbols, render the parts in parallel
+   * and show them together in the result container
+   */
+  async generateLinkedSymbols(barcodeType, text, format) {
+    // Logos are not carried into the parts (they cannot be sent to workers)
+    const { logo, ...options } = this.getRenderOptions({ backgroundcolor: 'ffffff' });
+    const parts = splitPayload(barcodeType, text, options);
+
+    ErrorHandler.showProgress(`Rendering ${parts.length} linked symbols...`);
+
+    const resultContainer = document.getElementById('generatedBarcodeContainer');
+    resultContainer.innerHTML = '';
+    resultContainer.style.display = 'block';
+    resultContainer.classList.remove('square-barcode-container');
+
+    let output;
+    let blob;
+    if (format === 'svg') {
+      const svg = layoutLinkedSvg(parts.map((part) => renderSvg(part.type, part.text, part.options)));
+      const wrapper = document.createElement('div');
+      wrapper.innerHTML = svg;
+      output = wrapper.querySelector('svg');
+      blob = new Blob([svg], { type: 'image/svg+xml' });
+    } else {
+      const bitmaps = await this.renderParts(parts);
+      output = drawLinkedLayout(bitmaps, document.createElement('canvas'));
+      blob = await this.encodePng(output);
+    }
+    output.classList.add('linked-symbols');
+    resultContainer.appendChild(output);
+
+    const downloadBtn = document.createElement('button');
+    downloadBtn.textContent = `📥 Download ${format.toUpperCase()}`;
+    downloadBtn.className = 'secondary-button';
+    downloadBtn.style.marginTop = '10px';
+    downloadBtn.addEventListener('click', () => {
+      this.downloadFile(blob, `barcode_${barcodeType}_linked_${Date.now()}.${format === 'svg' ? 'svg' : 'png'}`);
+    });
+    resultContainer.appendChild(downloadBtn);
+
+    ErrorHandler.showSuccess(
+      `Payload split across ${parts.length} linked ${this.getBarcodeTypeName(barcodeType)} symbols. Scan all of them to read it back.`
+    );
+  }
+
+  /**
+   * Stream a file (or the current content) as a loop of fountain-coded QR frames
+   */
+  async startAnimatedQr() {
+    return await ErrorHandler.wrapAsync(async () => {
+      ErrorHandler.clearAllErrors();
+      this.stopAnimatedQr();
+      await loadLibrary('bwipjs');
+
+      const file = document.getElementById('animatedFile').files[0];
+      const data = file
+        ? new Uint8Array(await file.arrayBuffer())
+        : new TextEncoder().encode(this.getBarcodeText());
+      if (data.length === 0) {
+        ErrorHandler.showUserError('Choose a file or enter content to stream.');
+        return;
+      }
+
+      const fps = Math.min(30, Math.max(1, parseInt(document.getElementById('animatedFps').value) || 8));
+      const blockSize = parseInt(document.getElementById('animatedBlockSize').value);
+      const encoder = new FountainEncoder(data, blockSize);
+
+      const canvas = document.getElementById('animatedCanvas');
+      const info = document.getElementById('animatedInfo');
+      canvas.classList.remove('hidden');
+
+      // Low error correction keeps frames small; lost frames are covered by the fountain code
+      const options = { scale: 4, padding: 16, eclevel: 'L', backgroundcolor: 'ffffff' };
+      const summary =
+        `${data.length} bytes in ${encoder.k} blocks at ${fps} fps (${blockSize * fps} B/s). ` +
+        `A clean capture needs about ${encoder.k} frames (${Math.ceil(encoder.k / fps)} s).`;
+
+      const showFrame = () => {
+        renderCanvas('qrcode', encoder.frame(), options, canvas);
+        info.textContent = `${summary} Frame ${encoder.seq}.`;
+      };
+      showFrame();
+      this.animation = { timer: setInterval(showFrame, 1000 / fps), encoder };
+    }, 'BarcodeGenerator.startAnimatedQr', 'Failed to start animated QR stream');
+  }
+
+  /**
+   * Stop the animated QR stream, leaving the last frame on screen
+   */
+  stopAnimatedQr() {
+    if (this.animation) {
+      clearInterval(this.animation.timer);
+      this.animation = null;
+    }
+  }
+
+  /**
+   * Get the worker pool that renders linked symbol parts
+   */
+  getRenderPool() {
+    if (!this.renderPool) {
+      this.renderPool = new DecodePool(DecodePool.defaultSize(), new URL('./renderWorker.js', import.meta.url));
+    }
+    return this.renderPool;
+  }
+
+  /**
+   * Render parts to ImageBitmaps, concurrently in workers where OffscreenCanvas is available
+   * @param {Array<{type: string, text: string, options: object}>} parts
+   * @returns {Promise<ImageBitmap[]>} In part order
+   */
+  async renderParts(parts) {
+    const renderHere = () => Promise.all(parts.map((part) => generate({ ...part, format: 'bitmap' })));
+    if (typeof OffscreenCanvas === 'undefined') {
+      return renderHere();
+    }
+
+    try {
+      const pool = this.getRenderPool();
+      return await Promise.all(parts.map((request) => pool.run({ type: 'render', request })));
+    } catch (error) {
+      // e.g. no module imports in classic workers - render on the main thread instead
+      console.warn('Worker rendering failed, rendering on the main thread:', error);
+      return renderHere();
+    }
+  }
+
+  /**
+   * Generate a barcode from explicit values, without reading the form
+   * @param {object} request - { type, text, options, format }; see barcodeCore.generate
+   */
+  generate(request) {
+    return generate(request);
+  }
+
+  /**
+   * Generate many barcodes in one call, e.g. from a single automation round-trip
+   * @param {Array<object>} requests - See barcodeCore.generateMany
+   */
+  generateMany(requests) {
+    return generateMany(requests);
+  }
+
+  /**
+   * Check if scannability verification is turned on
+   */
+  isVerifyEnabled() {
+    const select = document.getElementById('verifyScan');
+    return !!select && select.value === 'true';
+  }
+
+  /**
+   * Get the shared decode worker pool
+   */
+  getDecodePool() {
+    if (!this.decodePool) {
+      this.decodePool = new DecodePool();
+    }
+    return this.decodePool;
+  }
+
+  /**
+   * Decode a rendered canvas in a worker
+   * @returns {Promise<object>} See verifySymbol
+   */
+  async verifyCanvas(canvas, barcodeType, text) {
+    const bitmap = await createImageBitmap(canvas);
+    return verifySymbol(this.getDecodePool(), bitmap, barcodeType, text);
+  }
+
+  /**
+   * Verify the printable rendering of a generated barcode and report under it
+   */
+  async showVerification(container, barcodeType, text) {
+    const status = document.createElement('div');
+    status.className = 'info-message verify-result';
+    status.textContent = '🔍 Verifying scannability...';
+    container.appendChild(status);
+
+    try {
+      // The white-background PNG rendering is what gets printed
+      const canvas = await this.generatePngCanvas(barcodeType, text);
+      const result = await this.verifyCanvas(canvas, barcodeType, text);
+      status.textContent = describeVerification(result);
+      status.classList.toggle('verify-failed', !result.pass);
+    } catch (error) {
+      status.textContent = `Verification unavailable: ${error.message}`;
+    }
+  }
+
   /**
    * Get barcode text based on content type
    */
@@ -520,285 +989,114 @@ export class BarcodeGenerator {
 
   /**
    * Validate barcode input based on type
+   * @param {boolean} showErrors - Report failures to the user (disabled for live preview)
    */
-  validateBarcodeInput(barcodeType, text) {
-    // Validation logic for different barcode types
-    if (barcodeType === 'ean13') {
-      if (!/^[0-9]{12}$/.test(text)) {
-        ErrorHandler.showUserError('EAN-13 requires exactly 12 digits');
-        return false;
-      }
-    } else if (barcodeType === 'ean8') {
-      if (!/^[0-9]{7}$/.test(text)) {
-        ErrorHandler.showUserError('EAN-8 requires exactly 7 digits');
-        return false;
-      }
-    } else if (barcodeType === 'upca') {
-      if (!/^[0-9]{11}$/.test(text)) {
-        ErrorHandler.showUserError('UPC-A requires exactly 11 digits');
-        return false;
-      }
-    } else if (barcodeType === 'upce') {
-      if (!/^[0-9]{6}$/.test(text)) {
-        ErrorHandler.showUserError('UPC-E requires exactly 6 digits');
-        return false;
-      }
-    } else if (barcodeType === 'codabar') {
-      if (!/^[ABCD][0-9\-$:/.+]*[ABCD]$/.test(text)) {
-        ErrorHandler.showUserError('CODABAR must start and end with A, B, C, or D and contain only valid characters');
-        return false;
-      }
+  validateBarcodeInput(barcodeType, text, showErrors = true) {
+    const message = validateText(barcodeType, text);
+    if (message && showErrors) {
+      ErrorHandler.showUserError(message);
     }
-
-    return true;
+    return !message;
   }
 
   /**
    * Generate canvas-based barcode
+   * @param {number|null} previewToken - Render token of a live preview; previews skip the
+   *   container resize (CSS scales them) and drop out early once the token is stale
    */
-  async generateCanvasBarcode(barcodeType, text) {
-    return new Promise((resolve, reject) => {
-      try {
-        const canvas = document.createElement('canvas');
-        const options = this.getBwipOptions(barcodeType, text);
+  async generateCanvasBarcode(barcodeType, text, scale = null, previewToken = null) {
+    const isPreview = previewToken !== null;
+    const options = this.getRenderOptions({ scale });
+    const canvas = renderCanvas(barcodeType, text, options, document.createElement('canvas'));
+
+    // A newer input arrived while rendering - skip the remaining work
+    if (isPreview && previewToken !== this.renderToken) {
+      return null;
+    }
 
-        try {
-          bwipjs.toCanvas(canvas, options);
-          // If we reach here, generation was successful
-
-          // Handle logo overlay for QR codes
-          if (barcodeType === 'qrcode' && stateManager.get('generator.selectedLogo')) {
-            this.overlayLogo(canvas)
-              .then(() => {
-                this.resizeCanvasToFitContainer(canvas, document.getElementById('generatedBarcodeContainer'), barcodeType);
-                resolve(canvas);
-              })
-              .catch(reject);
-          } else {
-            this.resizeCanvasToFitContainer(canvas, document.getElementById('generatedBarcodeContainer'), barcodeType);
-            resolve(canvas);
-          }
-        } catch (bwipError) {
-          reject(new Error(`BWIP-JS Error: ${bwipError.message || bwipError}`));
-        }
-      } catch (err) {
-        reject(err);
-      }
-    });
+    if (isPreview) {
+      // CSS scales previews
+    } else if (resolveScale(options).dpi) {
+      // Print output keeps its exact dot grid; CSS only fits it on screen
+      canvas.classList.add('print-accurate');
+    } else {
+      this.resizeCanvasToFitContainer(canvas, document.getElementById('generatedBarcodeContainer'), barcodeType);
+    }
+    return canvas;
   }
 
   /**
    * Generate SVG-based barcode
    */
-  async generateSVGBarcode(barcodeType, text) {
-    return new Promise((resolve, reject) => {
-      try {
-        const options = this.getBwipOptions(barcodeType, text);
-
-        try {
-          const svg = bwipjs.toSVG(options);
-          // If we reach here, generation was successful
-
-          const container = document.createElement('div');
-          container.innerHTML = svg;
+  async generateSVGBarcode(barcodeType, text, scale = null) {
+    const container = document.createElement('div');
+    container.innerHTML = renderSvg(barcodeType, text, this.getRenderOptions({ scale }));
 
-          const svgElement = container.querySelector('svg');
-          if (!svgElement) {
-            reject(new Error('Failed to generate SVG'));
-            return;
-          }
-
-          // Handle logo for QR codes
-          if (barcodeType === 'qrcode' && stateManager.get('generator.selectedLogo')) {
-            this.addLogoToSvg(svgElement)
-              .then(() => resolve(svgElement))
-              .catch(reject);
-          } else {
-            resolve(svgElement);
-          }
-        } catch (bwipError) {
-          reject(new Error(`BWIP-JS Error: ${bwipError.message || bwipError}`));
-        }
-      } catch (err) {
-        reject(err);
-      }
-    });
+    const svgElement = container.querySelector('svg');
+    if (!svgElement) {
+      throw new Error('Failed to generate SVG');
+    }
+    return svgElement;
   }
 
   /**
    * Get BWIP-JS options for barcode generation
    */
-  getBwipOptions(barcodeType, text, backgroundColor = null) {
-    // Map our barcode type names to BWIP-JS bcid values
-    const bcidMapping = {
-      'codabar': 'rationalizedCodabar',
-      'qrcode': 'qrcode',
-      'datamatrix': 'datamatrix',
-      'pdf417': 'pdf417',
-      'azteccode': 'azteccode',
-      'ean13': 'ean13',
-      'ean8': 'ean8',
-      'upca': 'upca',
-      'upce': 'upce',
-      'code39': 'code39',
-      'code128': 'code128',
-      'interleaved2of5': 'interleaved2of5'
-    };
-
-    const bcid = bcidMapping[barcodeType] || barcodeType;
+  getBwipOptions(barcodeType, text, backgroundColor = null, scale = null) {
+    return buildBwipOptions(barcodeType, text, this.getRenderOptions({ backgroundcolor: backgroundColor, scale }));
+  }
 
+  /**
+   * Collect rendering options (see barcodeCore DEFAULT_OPTIONS) from the form
+   * @param {object} overrides - Values that take precedence over the form, e.g. scale
+   */
+  getRenderOptions(overrides = {}) {
+    const padding = parseInt(document.getElementById('padding').value);
     const options = {
-      bcid: bcid,
-      text: text,
-      scale: 3,
+      padding: Number.isNaN(padding) ? 10 : padding,
       includetext: document.getElementById('includetext').value === 'true',
-      padding: parseInt(document.getElementById('padding').value) || 10,
+      eclevel: document.getElementById('eclevel').value,
+      version: parseInt(document.getElementById('qrVersion').value) || null,
+      mask: this.getQrMask(),
+      securitylevel: parseInt(document.getElementById('securitylevel').value),
+      logo: stateManager.get('generator.selectedLogo'),
+      print: null,
     };
 
-    // Add background color if specified (for PNG downloads)
-    if (backgroundColor) {
-      options.backgroundcolor = backgroundColor;
+    if (document.getElementById('printMode').value === 'true') {
+      options.print = {
+        dpi: parseInt(document.getElementById('printDpi').value),
+        xDimension: parseFloat(document.getElementById('xDimension').value),
+        unit: document.getElementById('xDimensionUnit').value,
+      };
     }
 
-    // Don't set height for square barcodes (QR, DataMatrix, Aztec) 
-    // to preserve their natural 1:1 aspect ratio
-    const squareBarcodes = ['qrcode', 'datamatrix', 'azteccode'];
-    if (!squareBarcodes.includes(barcodeType)) {
-      options.height = 10;
-    }
-
-    // Add specific options for different barcode types
-    if (barcodeType === 'qrcode') {
-      options.eclevel = document.getElementById('eclevel').value;
-    } else if (barcodeType === 'pdf417') {
-      options.securitylevel = parseInt(document.getElementById('securitylevel').value);
-    }
-
-    return options;
-  }
-
-  /**
-   * Overlay logo on canvas (for QR codes)
-   */
-  async overlayLogo(canvas) {
-    return new Promise((resolve, reject) => {
-      try {
-        const selectedLogo = stateManager.get('generator.selectedLogo');
-        if (!selectedLogo) {
-          resolve();
-          return;
-        }
-
-        const ctx = canvas.getContext('2d');
-        if (!ctx) {
-          reject(new Error('Could not get canvas context'));
-          return;
-        }
-
-        selectedLogo.onload = () => {
-          try {
-            const logoSize = Math.min(canvas.width, canvas.height) * 0.2;
-            const x = (canvas.width - logoSize) / 2;
-            const y = (canvas.height - logoSize) / 2;
-
-            // Add white background behind logo
-            ctx.fillStyle = 'white';
-            ctx.fillRect(x - 5, y - 5, logoSize + 10, logoSize + 10);
-
-            // Draw logo
-            ctx.drawImage(selectedLogo, x, y, logoSize, logoSize);
-            resolve();
-          } catch (err) {
-            reject(err);
-          }
-        };
-
-        selectedLogo.onerror = () => {
-          reject(new Error('Error loading logo image'));
-        };
-
-        // Trigger onload if image is already loaded
-        if (selectedLogo.complete) {
-          selectedLogo.onload();
-        }
-      } catch (err) {
-        reject(err);
+    Object.entries(overrides).forEach(([key, value]) => {
+      if (value !== null && value !== undefined) {
+        options[key] = value;
       }
     });
+    return options;
   }
 
   /**
-   * Add logo to SVG (for QR codes)
+   * Read the QR mask setting: null (bwip-js evaluates all), 'auto' (auto-pin) or 1-8
    */
-  async addLogoToSvg(svgElement) {
-    return new Promise((resolve, reject) => {
-      try {
-        const selectedLogo = stateManager.get('generator.selectedLogo');
-        if (!selectedLogo) {
-          resolve();
-          return;
-        }
-
-        const svgRect = svgElement.getBBox();
-        const logoSize = Math.min(svgRect.width, svgRect.height) * 0.2;
-        const x = svgRect.x + (svgRect.width - logoSize) / 2;
-        const y = svgRect.y + (svgRect.height - logoSize) / 2;
-
-        // Create white background
-        const bgRect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
-        bgRect.setAttribute('x', x - 5);
-        bgRect.setAttribute('y', y - 5);
-        bgRect.setAttribute('width', logoSize + 10);
-        bgRect.setAttribute('height', logoSize + 10);
-        bgRect.setAttribute('fill', 'white');
-
-        // Create image element
-        const imgElement = document.createElementNS('http://www.w3.org/2000/svg', 'image');
-        imgElement.setAttribute('x', x);
-        imgElement.setAttribute('y', y);
-        imgElement.setAttribute('width', logoSize);
-        imgElement.setAttribute('height', logoSize);
-        imgElement.setAttribute('href', selectedLogo.src);
-
-        svgElement.appendChild(bgRect);
-        svgElement.appendChild(imgElement);
-
-        resolve();
-      } catch (err) {
-        reject(err);
-      }
-    });
+  getQrMask() {
+    const value = document.getElementById('qrMask').value;
+    return value === 'auto' ? 'auto' : parseInt(value) || null;
   }
 
   /**
    * Generate canvas specifically for PNG download with white background
    */
   async generatePngCanvas(barcodeType, text) {
-    return new Promise((resolve, reject) => {
-      try {
-        const canvas = document.createElement('canvas');
-        const options = this.getBwipOptions(barcodeType, text, 'ffffff'); // White background
-
-        try {
-          bwipjs.toCanvas(canvas, options);
-          
-          // Handle logo overlay for QR codes
-          if (barcodeType === 'qrcode' && stateManager.get('generator.selectedLogo')) {
-            this.overlayLogo(canvas)
-              .then(() => {
-                resolve(canvas);
-              })
-              .catch(reject);
-          } else {
-            resolve(canvas);
-          }
-        } catch (bwipError) {
-          reject(new Error(`BWIP-JS Error: ${bwipError.message || bwipError}`));
-        }
-      } catch (err) {
-        reject(err);
-      }
-    });
+    return renderCanvas(
+      barcodeType,
+      text,
+      this.getRenderOptions({ backgroundcolor: 'ffffff' }), // White background
+      document.createElement('canvas')
+    );
   }
 
   /**
@@ -822,9 +1120,8 @@ export class BarcodeGenerator {
         } else {
           // Download PNG with white background
           const pngCanvas = await this.generatePngCanvas(barcodeType, text);
-          pngCanvas.toBlob((blob) => {
-            this.downloadFile(blob, filename);
-          });
+          const blob = await this.encodePng(pngCanvas);
+          this.downloadFile(blob, filename);
         }
       } catch (error) {
         console.error('Error generating download:', error);
@@ -835,6 +1132,362 @@ export class BarcodeGenerator {
     container.appendChild(downloadBtn);
   }
 
+  /**
+   * Export one barcode per payload as a streamed ZIP archive
+   * @param {Iterable<string>|AsyncIterable<string>} payloads - Consumed lazily, so generators work
+   */
+  async exportBatch(payloads) {
+    return await ErrorHandler.wrapAsync(async () => {
+      ErrorHandler.clearAllErrors();
+      this.cancelPreview();
+      await loadLibrary('bwipjs');
+
+      const barcodeType = document.getElementById('barcodeType').value;
+      const format = document.getElementById('outputFormat').value;
+      const verify = this.isVerifyEnabled();
+      const summary = { exported: 0, skipped: [], unscannable: [] };
+
+      // Auto-pinned masks are measured from this batch alone, so it exports the same way every time
+      clearQrPins();
+
+      const entries = this.renderBatchEntries(payloads, barcodeType, format, summary, verify);
+      const stream = ZipWriter.createStream(entries);
+      const saved = await this.saveStream(stream, `barcodes_${barcodeType}_${Date.now()}.zip`, 'application/zip');
+
+      if (!saved) {
+        return; // User cancelled the save dialog
+      }
+
+      if (summary.exported === 0) {
+        ErrorHandler.showUserError('No valid payloads to export.');
+      } else if (summary.skipped.length > 0 || summary.unscannable.length > 0) {
+        const problems = [];
+        if (summary.skipped.length > 0) {
+          problems.push(`skipped ${summary.skipped.length} invalid rows (first: line ${summary.skipped[0]})`);
+        }
+        if (summary.unscannable.length > 0) {
+          const lines = summary.unscannable.slice(0, 10).join(', ');
+          const more = summary.unscannable.length > 10 ? ', ...' : '';
+          problems.push(`${summary.unscannable.length} failed scan verification (lines ${lines}${more})`);
+        }
+        ErrorHandler.showUserError(`Exported ${summary.exported} barcodes; ${problems.join('; ')}.`);
+      } else {
+        ErrorHandler.showSuccess(`Exported ${summary.exported} barcodes.`);
+      }
+
+      return summary;
+    }, 'BarcodeGenerator.exportBatch', 'Failed to export batch');
+  }
+
+  /**
+   * Validate every batch row and report the invalid ones
+   * @param {string[]} lines
+   * @returns {object} See validateRows; blank lines are ignored
+   */
+  checkBatch(lines) {
+    const barcodeType = document.getElementById('barcodeType').value;
+    const { results } = validateRows(barcodeType, lines);
+    const filled = results.filter((result) => result.errors[0]?.code !== 'empty');
+    const invalid = filled.filter((result) => !result.ok);
+
+    if (filled.length === 0) {
+      ErrorHandler.showUserError('The batch list is empty.');
+    } else if (invalid.length === 0) {
+      ErrorHandler.showSuccess(`All ${filled.length} rows are valid.`);
+    } else {
+      const examples = invalid
+        .slice(0, 3)
+        .map((result) => `line ${result.row}: ${result.errors.map((error) => error.message).join(', ')}`)
+        .join('; ');
+      ErrorHandler.showUserError(`${invalid.length} of ${filled.length} rows are invalid (${examples}).`);
+    }
+    return { results: filled, validCount: filled.length - invalid.length, invalidCount: invalid.length };
+  }
+
+  /**
+   * Read the sequence form fields
+   */
+  getSequenceParams() {
+    return {
+      type: document.getElementById('barcodeType').value,
+      prefix: document.getElementById('sequencePrefix').value.trim(),
+      start: Number(document.getElementById('sequenceStart').value),
+      count: Number(document.getElementById('sequenceCount').value),
+      step: Number(document.getElementById('sequenceStep').value),
+    };
+  }
+
+  /**
+   * Export a numbered range of codes through the batch ZIP pipeline
+   * @param {object} params - See generateSequence
+   */
+  async exportSequence(params) {
+    let sequence;
+    try {
+      sequence = generateSequence(params);
+    } catch (error) {
+      ErrorHandler.showUserError(error.message);
+      return;
+    }
+    return await this.exportBatch(sequence);
+  }
+
+  /**
+   * Write a numbered range of codes into the batch list for review or label sheets
+   * @param {object} params - See generateSequence
+   */
+  fillBatchFromSequence(params) {
+    const maxLines = 10000; // Beyond this a textarea becomes sluggish; export the ZIP directly instead
+    try {
+      if (params.count > maxLines) {
+        throw new Error(`The batch list holds at most ${maxLines} codes; use Export Sequence ZIP for larger ranges`);
+      }
+      const sequence = generateSequence(params);
+      document.getElementById('batchInput').value = Array.from(sequence).join('\n');
+      ErrorHandler.clearAllErrors();
+    } catch (error) {
+      ErrorHandler.showUserError(error.message);
+    }
+  }
+
+  /**
+   * Lazily render ZIP entries, keeping at most batchLookahead images in flight
+   */
+  async *renderBatchEntries(payloads, barcodeType, format, summary, verify = false) {
+    const pending = [];
+    const verifications = verify ? [] : null;
+
+    // Verification runs in the worker pool alongside rendering; only the oldest is awaited
+    const settleVerification = async () => {
+      const { row, promise } = verifications.shift();
+      const result = await promise.catch(() => null);
+      if (!result || !result.pass) {
+        summary.unscannable.push(row);
+      }
+    };
+    let row = 0;
+
+    const next = async () => {
+      const { entry, row: entryRow } = await pending.shift();
+      if (!entry) {
+        summary.skipped.push(entryRow);
+        return null;
+      }
+      summary.exported++;
+      if (summary.exported % 25 === 0) {
+        ErrorHandler.showProgress(`Exporting batch... ${summary.exported} barcodes written`);
+      }
+      return entry;
+    };
+
+    for await (const payload of payloads) {
+      row++;
+      const text = String(payload).trim();
+      if (!text) continue;
+
+      if (!this.validateBarcodeInput(barcodeType, text, false)) {
+        summary.skipped.push(row);
+        continue;
+      }
+
+      while (verifications && verifications.length >= this.verifyBacklog) {
+        await settleVerification();
+      }
+
+      const entryRow = row;
+      pending.push(
+        this.renderBatchEntry(barcodeType, text, format, entryRow, verifications)
+          .then((entry) => ({ entry, row: entryRow }))
+          .catch(() => ({ entry: null, row: entryRow }))
+      );
+
+      if (pending.length >= this.batchLookahead) {
+        const entry = await next();
+        if (entry) yield entry;
+      }
+    }
+
+    while (pending.length > 0) {
+      const entry = await next();
+      if (entry) yield entry;
+    }
+
+    while (verifications && verifications.length > 0) {
+      await settleVerification();
+    }
+    summary.unscannable?.sort((a, b) => a - b);
+  }
+
+  /**
+   * Render a single batch entry as a ZIP item
+   * @param {Array|null} verifications - When given, a worker verification of the symbol is queued here
+   */
+  async renderBatchEntry(barcodeType, text, format, row, verifications = null) {
+    const safeName = text.replace(/[^A-Za-z0-9._-]+/g, '_').slice(0, 40);
+    const baseName = `${String(row).padStart(5, '0')}_${safeName}`;
+
+    if (format === 'svg') {
+      if (verifications) {
+        const canvas = await this.generatePngCanvas(barcodeType, text);
+        verifications.push({ row, promise: this.verifyCanvas(canvas, barcodeType, text) });
+      }
+      const svgElement = await this.generateSVGBarcode(barcodeType, text);
+      const svgData = new XMLSerializer().serializeToString(svgElement);
+      // SVG text compresses well; PNG data is already deflated and is stored as-is
+      return { name: `${baseName}.svg`, data: svgData, compress: true };
+    }
+
+    const canvas = await this.generatePngCanvas(barcodeType, text);
+    if (verifications) {
+      verifications.push({ row, promise: this.verifyCanvas(canvas, barcodeType, text) });
+    }
+    const blob = await this.encodePng(canvas);
+    return { name: `${baseName}.png`, data: blob, compress: false };
+  }
+
+  /**
+   * Encode a canvas as PNG, tagged with the printer resolution in print mode
+   * @returns {Promise<Blob>}
+   */
+  async encodePng(canvas) {
+    return encodePng(canvas, resolveScale(this.getRenderOptions()).dpi);
+  }
+
+  /**
+   * Compose label sheet pages from a list of payloads
+   * @param {Iterable<string>} payloads - One label per payload; repeated payloads share a symbol
+   * @param {string} templateId - Key of LABEL_TEMPLATES
+   * @param {object} options - Layout overrides: marginTop, marginLeft, gutterX, gutterY,
+   *   padding, captions, captionSize, outlines
+   * @returns {Promise<{pages: string[], skipped: number[]}>}
+   */
+  async generateLabelSheet(payloads, templateId = 'avery5160', options = {}) {
+    await loadLibrary('bwipjs');
+
+    const baseTemplate = LABEL_TEMPLATES[templateId];
+    if (!baseTemplate) {
+      throw new Error(`Unknown label template: ${templateId}`);
+    }
+
+    // Margins and gutters can be tuned per printer without defining a new template
+    const template = { ...baseTemplate };
+    ['marginTop', 'marginLeft', 'gutterX', 'gutterY'].forEach((key) => {
+      if (typeof options[key] === 'number') {
+        template[key] = options[key];
+      }
+    });
+
+    const barcodeType = document.getElementById('barcodeType').value;
+    const selectedLogo = barcodeType === 'qrcode' ? stateManager.get('generator.selectedLogo') : null;
+    const symbolIndex = new Map();
+    const symbols = [];
+    const cells = [];
+    const skipped = [];
+    let row = 0;
+
+    for (const payload of payloads) {
+      row++;
+      const text = String(payload).trim();
+      if (!text) continue;
+
+      if (!this.validateBarcodeInput(barcodeType, text, false)) {
+        skipped.push(row);
+        continue;
+      }
+
+      // Render each distinct payload once; every label using it is a <use> reference
+      if (!symbolIndex.has(text)) {
+        try {
+          const svg = optimizeSvg(bwipjs.toSVG(this.getBwipOptions(barcodeType, text)));
+          const symbol = parseBwipSvg(svg);
+          if (selectedLogo) {
+            // Each symbol only references the logo; its bytes are defined once per page
+            symbol.content += selectedLogo.svgOverlay(symbol.viewBox);
+          }
+          symbolIndex.set(text, symbols.length);
+          symbols.push(symbol);
+        } catch (error) {
+          skipped.push(row);
+          continue;
+        }
+      }
+
+      cells.push({ symbol: symbolIndex.get(text), caption: text });
+    }
+
+    const layout = selectedLogo ? { ...options, defs: selectedLogo.svgDefinition() } : options;
+    return { pages: composeLabelSheet(template, symbols, cells, layout), skipped };
+  }
+
+  /**
+   * Generate a label sheet and download it (one SVG, or a ZIP of pages)
+   */
+  async exportLabelSheet(payloads, templateId, options = {}) {
+    return await ErrorHandler.wrapAsync(async () => {
+      ErrorHandler.clearAllErrors();
+      ErrorHandler.showProgress('Composing label sheet...');
+
+      const { pages, skipped } = await this.generateLabelSheet(payloads, templateId, options);
+      if (pages.length === 0) {
+        ErrorHandler.showUserError('No valid payloads to place on the label sheet.');
+        return;
+      }
+
+      const barcodeType = document.getElementById('barcodeType').value;
+      const baseName = `labels_${templateId}_${barcodeType}_${Date.now()}`;
+
+      if (pages.length === 1) {
+        this.downloadFile(new Blob([pages[0]], { type: 'image/svg+xml' }), `${baseName}.svg`);
+      } else {
+        const entries = pages.map((page, i) => ({
+          name: `${baseName}_page${String(i + 1).padStart(3, '0')}.svg`,
+          data: page,
+          compress: true,
+        }));
+        const saved = await this.saveStream(ZipWriter.createStream(entries), `${baseName}.zip`, 'application/zip');
+        if (!saved) return;
+      }
+
+      const pageLabel = pages.length === 1 ? '1 page' : `${pages.length} pages`;
+      if (skipped.length > 0) {
+        ErrorHandler.showUserError(
+          `Label sheet created (${pageLabel}); skipped ${skipped.length} invalid rows (first: line ${skipped[0]}).`
+        );
+      } else {
+        ErrorHandler.showSuccess(`Label sheet created (${pageLabel}).`);
+      }
+    }, 'BarcodeGenerator.exportLabelSheet', 'Failed to create label sheet');
+  }
+
+  /**
+   * Save a byte stream to disk, writing through a file handle when available
+   * @returns {Promise<boolean>} false if the user cancelled
+   */
+  async saveStream(stream, filename, mimeType) {
+    if (typeof window.showSaveFilePicker === 'function') {
+      let handle;
+      try {
+        handle = await window.showSaveFilePicker({ suggestedName: filename });
+      } catch (error) {
+        await stream.cancel();
+        if (error.name === 'AbortError') {
+          return false;
+        }
+        throw error;
+      }
+
+      // Bytes go straight to disk as they are produced
+      const writable = await handle.createWritable();
+      await stream.pipeTo(writable);
+      return true;
+    }
+
+    // Fallback: let the browser assemble the Blob, which it can spill to disk for large archives
+    const blob = await new Response(stream, { headers: { 'Content-Type': mimeType } }).blob();
+    this.downloadFile(blob, filename);
+    return true;
+  }
+
   /**
    * Download file helper
    */
@@ -4,11 +4,36 @@
 import { displayError, clearResults, addLinkStyles, ErrorHandler } from './ui.js';
 import { detectURLs, textWithLinks, addCopyButtonsToLinks, getBarcodeFormatName } from './utils.js';
 import { stateManager } from './state.js';
+import { loadLibrary } from './loader.js';
+import { LinkedSymbolAssembler, parseLinkedPart } from './linkedSymbols.js';
+import { FountainDecoder, parseFrame, describeTransfer } from './fountain.js';
+import { nativeSupport } from './nativeDetector.js';
+import { createEngines, chooseEngine } from './engines.js';
+import { scanWindowFor, captureWindow, toFrameCoordinates, drawScanWindow } from './scanWindow.js';
+import { ScanGovernor } from './scanGovernor.js';
+import { FormatProfile } from './formatProfile.js';
 
 export class BarcodeScanner {
   constructor() {
     this.lastClickTime = 0;
     this.clickDebounceMs = 500; // Prevent rapid clicking
+    this.linkedParts = new LinkedSymbolAssembler(); // Parts of split payloads, kept across scans and uploads
+    this.transfer = new FountainDecoder(); // Frames of an animated QR stream
+    this.scanSession = 0; // Incremented per startScan so loops of an earlier scan exit
+    this.scanStats = null; // { startedAt, framesDecoded, firstDecodeMs, latencyMs } of the current scan
+    this.currentFrame = null; // { number, timestamp, mediaTime, captureTime } of the last camera frame
+    this.engines = createEngines(); // Decoder engines by name
+    this.engine = null; // Engine chosen for this device, set on first scan or upload
+    this.choosingEngine = null; // Promise of the calibration in progress
+    this.nativeFallbackFrames = 10; // Empty frames from the chosen engine before ZXing gets a frame
+    this.fullFrameInterval = 8; // With a scan window, every 8th decode looks at the full frame
+    this.fullFormatInterval = 10; // With likely formats, every 10th decode tries all selected formats
+    this.formatProfile = new FormatProfile(); // Formats this device scans, learned from its scans
+    this.seenCodes = new Map(); // "format:text" -> time last seen, for deduplication in continuous mode
+    this.lastDecode = null; // { engine, decodeMs } of the last successful decode
+    this.governor = null; // ScanGovernor of the current scan
+    this.videoTrack = null; // Camera track of the current scan, for resolution changes
+    nativeSupport(); // Ask for the native detector's formats now so the first scan does not wait
     this.initializeUI();
     this.initializeEventListeners();
     this.initializeFormatSelection();
@@ -69,6 +94,16 @@ export class BarcodeScanner {
    * Initialize format selection checkboxes
    */
   initializeFormatSelection() {
+    // Scan window size, remembered per device
+    const scanWindowSize = document.getElementById('scanWindowSize');
+    const savedWindowSize = localStorage.getItem('scanWindowSize');
+    if (savedWindowSize !== null && scanWindowSize.querySelector(`option[value="${savedWindowSize}"]`)) {
+      scanWindowSize.value = savedWindowSize;
+    }
+    scanWindowSize.addEventListener('change', () => {
+      localStorage.setItem('scanWindowSize', scanWindowSize.value);
+    });
+
     // Add event listener for the "Select All" checkbox
     document.getElementById('selectAllFormats').addEventListener('change', (event) => {
       const checkboxes = document.querySelectorAll('#formatOptions input[type="checkbox"]');
@@ -125,6 +160,23 @@ export class BarcodeScanner {
     return selectedFormats.length > 0 ? selectedFormats : Object.values(formatMapping);
   }
 
+  /**
+   * Formats to try first, from the format profile
+   *
+   * Only used while every format (or none) is checked: a selection the user
+   * narrowed down is taken as it is.
+   * @param {number[]} formats - From getSelectedFormats
+   * @returns {number[]|null} The likely formats, or null to always decode all of formats
+   */
+  getLikelyFormats(formats) {
+    const checked = document.querySelectorAll('#formatOptions input[type="checkbox"]:checked:not(#selectAllFormats)').length;
+    const total = document.querySelectorAll('#formatOptions input[type="checkbox"]:not(#selectAllFormats)').length;
+    if (checked > 0 && checked < total) {
+      return null;
+    }
+    return this.formatProfile.likelyFormats(formats);
+  }
+
   /**
    * Start barcode scanning
    */
@@ -132,6 +184,7 @@ export class BarcodeScanner {
     return await ErrorHandler.wrapAsync(async () => {
       ErrorHandler.clearAllErrors();
       ErrorHandler.showProgress('Starting camera...');
+      await loadLibrary('zxing');
       
       clearResults();
       stateManager.set('scanner.isScanning', true);
@@ -145,11 +198,11 @@ export class BarcodeScanner {
       const scanButton = document.getElementById('scanButton');
       scanButton.textContent = '⏹️ Stop Scan';
 
-      // Create a new code reader
-      const codeReader = new ZXing.BrowserMultiFormatReader();
-      stateManager.set('scanner.codeReader', codeReader);
+      const session = ++this.scanSession;
 
-      const videoInputDevices = await codeReader.listVideoInputDevices();
+      const videoInputDevices = (await navigator.mediaDevices.enumerateDevices()).filter(
+        (device) => device.kind === 'videoinput'
+      );
       const cameraSelect = document.getElementById('cameraSelect');
 
       // Clear any existing options
@@ -226,76 +279,451 @@ export class BarcodeScanner {
         video.style.display = 'block';
         qrCanvas.style.display = 'none'; // Start hidden, will show when drawing starts
 
-        // Set up continuous video-to-canvas drawing (like main branch)
-        const setupCanvasDrawing = () => {
-          if (video.readyState >= video.HAVE_ENOUGH_DATA) {
-            qrCanvas.width = video.videoWidth;
-            qrCanvas.height = video.videoHeight;
-            
-            // Show canvas and hide video (canvas displays the video feed)
-            qrCanvas.style.display = 'block';
-            video.style.display = 'none';
-            
-            // Start continuous drawing of video frames to canvas
-            const canvasDrawingInterval = setInterval(() => {
-              if (video.readyState === video.HAVE_ENOUGH_DATA && stateManager.get('scanner.isScanning')) {
-                const canvasContext = qrCanvas.getContext('2d');
-                canvasContext.drawImage(video, 0, 0, qrCanvas.width, qrCanvas.height);
-              }
-            }, 20); // Update every 20ms (approximately 50 fps)
-            
-            stateManager.set('scanner.canvasDrawingInterval', canvasDrawingInterval);
-          }
+        // One persistent stream for both display and decoding
+        // (device IDs are blank until camera permission has been granted once);
+        // the governor picks its resolution and changes it on the same track later
+        const governor = new ScanGovernor();
+        const stream = await navigator.mediaDevices.getUserMedia({
+          video: {
+            ...(selectedDeviceId ? { deviceId: { exact: selectedDeviceId } } : { facingMode: 'environment' }),
+            ...governor.constraints(),
+          },
+          audio: false,
+        });
+        if (session !== this.scanSession || !stateManager.get('scanner.isScanning')) {
+          stream.getTracks().forEach((track) => track.stop()); // Stopped while waiting for permission
+          return;
+        }
+        video.srcObject = stream;
+        this.governor = governor;
+        this.videoTrack = stream.getVideoTracks()[0];
+        await video.play().catch(() => {
+          // Autoplay is allowed for muted inline video; play() can still reject if interrupted
+        });
+
+        this.scanStats = {
+          startedAt: performance.now(),
+          framesDecoded: 0,
+          firstDecodeMs: null,
+          latencyMs: null,
+          engines: {}, // engine -> { frames, found, totalMs }
+          uniqueCodes: 0, // Codes recorded in continuous mode
         };
-        
-        // Set up canvas drawing when video metadata is loaded
-        video.addEventListener('loadedmetadata', setupCanvasDrawing);
-        
-        // If metadata is already loaded, set up immediately
-        if (video.readyState >= video.HAVE_METADATA) {
-          setupCanvasDrawing();
+        // The camera starts first; on a device not calibrated yet, frames are
+        // only displayed until the calibration has chosen an engine
+        const decoder = this.startFramePump(session, video, this.engine);
+        if (!decoder.engine) {
+          this.selectEngine()
+            .catch((error) => {
+              console.warn('Decoder calibration failed, decoding with ZXing:', error);
+              return this.engines.zxing;
+            })
+            .then((chosen) => {
+              decoder.engine = chosen;
+            });
         }
 
-        // Get selected formats
-        const selectedFormats = this.getSelectedFormats();
+      } else {
+        ErrorHandler.showUserError('No camera devices found. Please check camera permissions.');
+        this.stopScan();
+      }
+    }, 'BarcodeScanner.startScan', 'Failed to start camera');
+  }
 
-        // Start decoding with selected device and formats
-        try {
-          const result = await codeReader.decodeOnceFromVideoDevice(selectedDeviceId, 'video', selectedFormats);
-          
-          if (result) {
-            this.handleZXingCode(result);
-          }
-        } catch (err) {
-          // Ignore initial decode errors (stream ended, no code detected, etc.)
-          // These are normal when scanner is stopped quickly or no barcode is present
-          console.log('Initial decode completed (no barcode found or stream ended)');
+  /**
+   * The decoder engine for this device, chosen by a one-off calibration
+   */
+  async selectEngine() {
+    if (!this.engine) {
+      if (!this.choosingEngine) {
+        ErrorHandler.showProgress('Choosing the fastest decoder for this device...');
+        this.choosingEngine = chooseEngine(this.engines).finally(() => {
+          this.choosingEngine = null;
+        });
+      }
+      this.engine = await this.choosingEngine;
+    }
+    return this.engine;
+  }
+
+  /**
+   * Drive display and decoding from the camera's own frames
+   *
+   * requestVideoFrameCallback fires once per new camera frame; browsers without
+   * it poll with requestAnimationFrame and skip frames whose media time has not
+   * changed. Each frame is drawn to #qrCanvas once, with a context fetched once
+   * per scan, and the same frame is handed to the decoder unless a decode is
+   * still running, in which case it is only displayed. The frame's timestamp is
+   * kept in this.currentFrame and travels with the decode result, so the delay
+   * from frame to result can be measured.
+   *
+   * In continuous mode every code in a frame is read, the outlines of the last
+   * codes found stay on the picture briefly, and the scan keeps running.
+   *
+   * this.governor (scanGovernor.js) decides which frames are decoded and when
+   * the camera's resolution changes, from the frames presented and dropped and
+   * from decode times and results.
+   *
+   * @param {object|null} engine - Decoder engine, see engines.js; null until calibration
+   *   has chosen one, which is then set on the returned decoder
+   * @returns {object} The decoder state of this scan
+   */
+  startFramePump(session, video, engine) {
+    const qrCanvas = document.getElementById('qrCanvas');
+    const displayContext = qrCanvas.getContext('2d');
+    const isCurrent = () => session === this.scanSession && stateManager.get('scanner.isScanning');
+    const formats = this.getSelectedFormats();
+    const decoder = {
+      engine,
+      formats,
+      likely: this.getLikelyFormats(formats), // Formats most decodes try, or null for all of formats
+      misses: 0, // Empty frames in a row from the chosen engine
+      decodes: 0,
+      window: null, // Scan window in frame pixels, or null to decode full frames
+      continuous: document.getElementById('continuousScan').checked,
+      outlines: null, // { scans, until } of the last codes found in continuous mode
+      busy: false,
+    };
+    document.getElementById('scanThroughput').textContent = '';
+    this.startSweep(decoder.continuous);
+    const windowSize = parseFloat(document.getElementById('scanWindowSize').value) || 0;
+    let frameNumber = 0;
+    let lastMediaTime = -1;
+
+    const governor = this.governor;
+
+    const processFrame = (timestamp, mediaTime, captureTime) => {
+      // Size the canvas to the stream and show it in place of the video on the first frame
+      if (qrCanvas.width !== video.videoWidth || qrCanvas.height !== video.videoHeight) {
+        qrCanvas.width = video.videoWidth;
+        qrCanvas.height = video.videoHeight;
+        decoder.window = scanWindowFor(decoder.likely || decoder.formats, video.videoWidth, video.videoHeight, windowSize);
+      }
+      if (qrCanvas.style.display !== 'block') {
+        qrCanvas.style.display = 'block';
+        video.style.display = 'none';
+      }
+      displayContext.drawImage(video, 0, 0, qrCanvas.width, qrCanvas.height);
+      if (decoder.window) {
+        drawScanWindow(displayContext, decoder.window);
+      }
+      if (decoder.outlines && timestamp < decoder.outlines.until) {
+        decoder.outlines.scans.forEach((scan) => this.drawOutline(displayContext, scan.points, 'lime'));
+      }
+
+      const frame = { number: ++frameNumber, timestamp, mediaTime, captureTime };
+      this.currentFrame = frame;
+      const resolution = governor.evaluate(timestamp);
+      if (resolution) {
+        this.applyResolution(resolution);
+      }
+      if (decoder.engine && !decoder.busy && governor.shouldDecode(timestamp)) {
+        decoder.busy = true;
+        this.decodeFrame(session, this.captureFrame(video, decoder), frame, decoder).finally(() => {
+          decoder.busy = false;
+        });
+      }
+    };
+
+    if (typeof video.requestVideoFrameCallback === 'function') {
+      const onVideoFrame = (now, metadata) => {
+        if (!isCurrent()) return;
+        governor.recordFrame(metadata.presentedFrames);
+        processFrame(now, metadata.mediaTime, metadata.captureTime ?? null);
+        video.requestVideoFrameCallback(onVideoFrame);
+      };
+      video.requestVideoFrameCallback(onVideoFrame);
+    } else {
+      const onAnimationFrame = (now) => {
+        if (!isCurrent()) return;
+        if (video.readyState >= video.HAVE_CURRENT_DATA && video.currentTime !== lastMediaTime) {
+          lastMediaTime = video.currentTime;
+          const quality = video.getVideoPlaybackQuality ? video.getVideoPlaybackQuality() : null;
+          governor.recordFrame(quality ? quality.droppedVideoFrames : null, true);
+          processFrame(now, video.currentTime, null);
         }
+        requestAnimationFrame(onAnimationFrame);
+      };
+      requestAnimationFrame(onAnimationFrame);
+    }
+    return decoder;
+  }
 
-        // Set up continuous scanning with interval
-        const drawingInterval = setInterval(async () => {
-          if (!stateManager.get('scanner.isScanning') || stateManager.get('scanner.resetInProgress')) {
-            clearInterval(drawingInterval);
-            return;
-          }
+  /**
+   * The engines that decode the next frame, each with the formats it reads
+   *
+   * The chosen engine reads frames while it finds codes; when it is not ZXing,
+   * ZXing gets the next frame after nativeFallbackFrames empty frames in a row,
+   * so symbols the chosen engine cannot read are still found. The native
+   * detector often supports only some of the formats: ZXing then reads the
+   * others on every frame alongside it, and all of them on a fallback frame.
+   * When it supports none of them, ZXing reads every frame.
+   * @returns {Promise<Array<{engine: object, formats: number[]}>>}
+   */
+  async decodePlan(decoder, formats) {
+    const zxing = this.engines.zxing;
+    const engine = decoder.engine;
+    if (engine === zxing) {
+      return [{ engine, formats }];
+    }
 
-          try {
-            const result = await codeReader.decodeOnceFromVideoDevice(selectedDeviceId, 'video', selectedFormats);
-            if (result) {
-              this.handleZXingCode(result);
-            }
-          } catch (err) {
-            // Ignore errors during continuous scanning
-          }
-        }, 100);
+    const native = engine.name === 'native' ? await engine.detectorFor(formats) : null;
+    if (engine.name === 'native' && !native) {
+      return [{ engine: zxing, formats }];
+    }
+    if (decoder.misses >= this.nativeFallbackFrames) {
+      decoder.misses = 0;
+      return [{ engine: zxing, formats }];
+    }
+    if (!native || native.complete) {
+      return [{ engine, formats }];
+    }
+    const missing = formats.filter((format) => !native.formats.includes(format));
+    return [
+      { engine, formats: native.formats },
+      { engine: zxing, formats: missing },
+    ];
+  }
 
-        stateManager.set('scanner.drawingInterval', drawingInterval);
+  /**
+   * Start capturing the frame being presented, for decodeFrame
+   *
+   * Called from the frame callback itself, so the bitmap holds the frame the
+   * callback reported and not whichever frame the video shows once an earlier
+   * await has returned. With a scan window only the window is captured,
+   * downscaled, except on every fullFrameInterval-th decode, which looks at
+   * the full frame for codes outside the window. Likewise, with likely formats
+   * from the format profile only those are decoded, except on every
+   * fullFormatInterval-th decode, which tries all selected formats so codes of
+   * a new format are found and counted.
+   * @returns {{bitmap: Promise<ImageBitmap>, region: object|null, formats: number[]}}
+   */
+  captureFrame(video, decoder) {
+    const decodeNumber = ++decoder.decodes;
+    const region = decoder.window && decodeNumber % this.fullFrameInterval !== 0 ? decoder.window : null;
+    const formats = decoder.likely && decodeNumber % this.fullFormatInterval !== 0 ? decoder.likely : decoder.formats;
+    const bitmap = region ? captureWindow(video, region) : createImageBitmap(video);
+    return { bitmap, region, formats };
+  }
 
+  /**
+   * Decode one captured frame from the pump
+   *
+   * decodePlan picks the engines and formats. The captured bitmap is handed to
+   * each engine, which for ZXing transfers it to the decode worker. Bitmaps
+   * not handed to an engine when a step fails are closed here.
+   * @param {object} capture - From captureFrame
+   */
+  async decodeFrame(session, capture, frame, decoder) {
+    const zxing = this.engines.zxing;
+    const { region, formats } = capture;
+
+    const start = performance.now();
+    const bitmaps = [];
+    let handed = 0; // bitmaps[0..handed) belong to the engines
+    let decodes;
+    try {
+      const plan = await this.decodePlan(decoder, formats);
+      bitmaps.push(await capture.bitmap);
+      // Every engine takes ownership of its bitmap, so each further engine gets a copy
+      while (bitmaps.length < plan.length) {
+        bitmaps.push(await createImageBitmap(bitmaps[0]));
+      }
+      handed = plan.length;
+      decodes = await Promise.all(
+        plan.map(async ({ engine, formats: engineFormats }, i) => {
+          const engineStart = performance.now();
+          let scans = await engine.decode(bitmaps[i], engineFormats, { multiple: decoder.continuous });
+          if (region) {
+            scans = scans.map((scan) => toFrameCoordinates(scan, region));
+          }
+          return { engine, scans, decodeMs: performance.now() - engineStart };
+        })
+      );
+    } catch (error) {
+      if (bitmaps.length === 0) {
+        capture.bitmap.then((bitmap) => bitmap.close(), () => {});
+      }
+      bitmaps.slice(handed).forEach((bitmap) => bitmap.close());
+      console.warn(`The ${decoder.engine.name} decoder failed, decoding with ZXing:`, error);
+      decoder.engine = zxing;
+      return;
+    }
+    const decodeMs = performance.now() - start;
+    const own = decodes.find((decode) => decode.engine === decoder.engine);
+    if (own) {
+      decoder.misses = own.scans.length > 0 ? 0 : decoder.misses + 1;
+    }
+    const found = decodes.find((decode) => decode.scans.length > 0);
+    const scans = decodes.flatMap((decode) => decode.scans);
+    const [scan = null] = scans;
+    const engine = (found || decodes[0]).engine;
+
+    if (session !== this.scanSession || !stateManager.get('scanner.isScanning')) return;
+    this.governor.recordDecode(decodeMs, !!scan || decodes.some((decode) => decode.engine.lastCandidates > 0));
+    this.scanStats.framesDecoded++;
+    for (const decode of decodes) {
+      if (!this.scanStats.engines[decode.engine.name]) {
+        this.scanStats.engines[decode.engine.name] = { frames: 0, found: 0, totalMs: 0 };
+      }
+      const engineStats = this.scanStats.engines[decode.engine.name];
+      engineStats.frames++;
+      engineStats.totalMs += decode.decodeMs;
+      if (decode.scans.length > 0) {
+        engineStats.found++;
+      }
+    }
+    if (scan) {
+      if (this.scanStats.firstDecodeMs === null) {
+        this.scanStats.firstDecodeMs = performance.now() - this.scanStats.startedAt;
+      }
+      this.scanStats.latencyMs = performance.now() - frame.timestamp;
+      if (decoder.continuous) {
+        decoder.outlines = { scans, until: performance.now() + 500 };
+        this.recordContinuousScans(scans);
       } else {
-        ErrorHandler.showUserError('No camera devices found. Please check camera permissions.');
-        this.stopScan();
+        this.handleScanResult({ ...scan, frame, engine: engine.name, decodeMs, region: region ? 'window' : 'full' });
       }
-    }, 'BarcodeScanner.startScan', 'Failed to start camera');
+    }
+  }
+
+  /**
+   * Switch the camera to a resolution chosen by the governor, on the running track
+   *
+   * Cameras that cannot change resolution keep theirs; the governor then still
+   * controls the decode rate.
+   */
+  applyResolution({ width, height }) {
+    if (!this.videoTrack || !this.videoTrack.applyConstraints) return;
+    this.videoTrack.applyConstraints({ width: { ideal: width }, height: { ideal: height } }).catch((error) => {
+      console.warn('Could not change the camera resolution:', error);
+    });
+  }
+
+  /**
+   * Record the codes from one frame in continuous mode, skipping repeats
+   *
+   * A code counts as a repeat while it was last seen less than the
+   * deduplication window ago, so a label held in view is recorded once.
+   * Animated QR frames and linked-symbol parts are recorded as read, not assembled.
+   */
+  recordContinuousScans(scans) {
+    const now = Date.now();
+    const windowMs = (parseFloat(document.getElementById('dedupeSeconds').value) || 10) * 1000;
+    for (const [key, lastSeen] of this.seenCodes) {
+      if (now - lastSeen > windowMs) {
+        this.seenCodes.delete(key);
+      }
+    }
+
+    for (const scan of scans) {
+      const key = `${scan.format}:${scan.text}`;
+      const repeat = this.seenCodes.has(key);
+      this.seenCodes.set(key, now);
+      if (repeat) continue;
+
+      const format = getBarcodeFormatName(scan.format);
+      const time = new Date().toLocaleString();
+      this.scanStats.uniqueCodes++;
+      this.addToScanHistory(scan.text, format, time);
+      this.addToSweep({ text: scan.text, format, time });
+      this.displayScanResult(scan.text, format, time);
+    }
+
+    this.updateSaveButtonsVisibility();
+    this.updateThroughput();
+  }
+
+  /**
+   * Start the code list of a continuous scan; a single scan clears and hides it
+   *
+   * Scan history keeps only the last few scans, so a sweep over many labels is
+   * listed, counted and saved from this list instead.
+   */
+  startSweep(continuous) {
+    stateManager.set('scanner.sweepCodes', []);
+    document.getElementById('sweepList').innerHTML = '';
+    document.getElementById('sweepCount').textContent = '0';
+    document.getElementById('sweepResults').classList.toggle('hidden', !continuous);
+  }
+
+  /**
+   * Add a code to the current sweep's list
+   * @param {{text: string, format: string, time: string}} scanData
+   */
+  addToSweep(scanData) {
+    const codes = stateManager.get('scanner.sweepCodes');
+    codes.push(scanData);
+
+    const item = document.createElement('div');
+    item.className = 'history-item';
+    const format = document.createElement('strong');
+    format.textContent = `${codes.length}. ${scanData.format} `;
+    const text = document.createElement('span');
+    text.textContent = scanData.text;
+    item.append(format, text);
+    document.getElementById('sweepList').appendChild(item);
+    document.getElementById('sweepCount').textContent = String(codes.length);
+  }
+
+  /**
+   * Codes of the last continuous scan, in the order they were found
+   */
+  getSweepCodes() {
+    return stateManager.get('scanner.sweepCodes') || [];
+  }
+
+  /**
+   * Show the number of unique codes and codes per minute of the current continuous scan
+   */
+  updateThroughput() {
+    const { uniqueCodes, startedAt } = this.scanStats;
+    const minutes = Math.max((performance.now() - startedAt) / 60000, 1 / 60);
+    const perMinute = Math.round(uniqueCodes / minutes);
+    document.getElementById('scanThroughput').textContent =
+      `${uniqueCodes} unique code${uniqueCodes === 1 ? '' : 's'} - ${perMinute} per minute`;
+  }
+
+  /**
+   * Outline a detected code on the canvas
+   */
+  drawOutline(ctx, points, color = 'red') {
+    if (!points || points.length < 2) return;
+    ctx.strokeStyle = color;
+    ctx.lineWidth = 4;
+    ctx.beginPath();
+    ctx.moveTo(points[0].x, points[0].y);
+    for (let i = 1; i < points.length; i++) {
+      ctx.lineTo(points[i].x, points[i].y);
+    }
+    ctx.closePath();
+    ctx.stroke();
+  }
+
+  /**
+   * Decode an image with the chosen engine, then with ZXing if that finds nothing
+   * @param {ImageBitmapSource} image
+   * @returns {Promise<object|null>} Result with the engine and decode time, or null
+   */
+  async decodeImage(image) {
+    const formats = this.getSelectedFormats();
+    const engines = [await this.selectEngine()];
+    if (engines[0] !== this.engines.zxing) {
+      engines.push(this.engines.zxing);
+    }
+
+    for (const engine of engines) {
+      const start = performance.now();
+      try {
+        const [scan] = await engine.decode(await createImageBitmap(image), formats);
+        if (scan) {
+          return { ...scan, engine: engine.name, decodeMs: performance.now() - start };
+        }
+      } catch (error) {
+        console.warn(`The ${engine.name} decoder failed:`, error);
+      }
+    }
+    return null;
   }
 
   /**
@@ -315,33 +743,11 @@ export class BarcodeScanner {
           stateManager.set('scanner.scanningTimeout', null);
         }
 
-        // Clear drawing interval
-        const drawingInterval = stateManager.get('scanner.drawingInterval');
-        if (drawingInterval) {
-          clearInterval(drawingInterval);
-          stateManager.set('scanner.drawingInterval', null);
-        }
-
-        // Clear canvas drawing interval
-        const canvasDrawingInterval = stateManager.get('scanner.canvasDrawingInterval');
-        if (canvasDrawingInterval) {
-          clearInterval(canvasDrawingInterval);
-          stateManager.set('scanner.canvasDrawingInterval', null);
-        }
+        // End the frame pump
+        this.scanSession++;
 
         // Auto-stop timeout removed - now using immediate stop on detection
 
-        // Stop code reader
-        const codeReader = stateManager.get('scanner.codeReader');
-        if (codeReader) {
-          try {
-            codeReader.reset();
-          } catch (err) {
-            console.warn('Error resetting code reader:', err);
-          }
-          stateManager.set('scanner.codeReader', null);
-        }
-
         // Update UI
         const scanButton = document.getElementById('scanButton');
         scanButton.textContent = '📱 Start Scan';
@@ -392,83 +798,70 @@ export class BarcodeScanner {
         });
         video.srcObject = null;
       }
-
-      // Clear any remaining intervals or timeouts
-      const drawingInterval = stateManager.get('scanner.drawingInterval');
-      if (drawingInterval) {
-        clearInterval(drawingInterval);
-        stateManager.set('scanner.drawingInterval', null);
-      }
-
-      const canvasDrawingInterval = stateManager.get('scanner.canvasDrawingInterval');
-      if (canvasDrawingInterval) {
-        clearInterval(canvasDrawingInterval);
-        stateManager.set('scanner.canvasDrawingInterval', null);
-      }
+      this.videoTrack = null;
 
       // Auto-stop timeout removed - now using immediate stop on detection
-
-      // Reset code reader
-      const codeReader = stateManager.get('scanner.codeReader');
-      if (codeReader) {
-        try {
-          codeReader.reset();
-        } catch (err) {
-          console.warn('Error in final code reader reset:', err);
-        }
-        stateManager.set('scanner.codeReader', null);
-      }
     } catch (err) {
       console.error('Error in ensureFullStop:', err);
     }
   }
 
   /**
-   * Handle successful barcode scan
+   * Handle a decoded barcode, from ZXing on the main thread or from the decode worker
+   * @param {{text: string, format: number, points: Array<{x: number, y: number}>, macro: object|null}} scan -
+   *   Results also carry the engine that read them and its decode time; live results carry the
+   *   camera frame they were decoded from
    */
-  handleZXingCode(result) {
+  handleScanResult(scan) {
     try {
-      const qrCanvas = document.getElementById('qrCanvas');
-      const canvasContext = qrCanvas.getContext('2d');
-      canvasContext.strokeStyle = 'red';
-      canvasContext.lineWidth = 4;
+      if (scan.engine) {
+        this.lastDecode = { engine: scan.engine, decodeMs: scan.decodeMs };
+      }
 
       // Draw detection box
-      const resultPoints = result.getResultPoints();
-      if (resultPoints && resultPoints.length >= 2) {
-        canvasContext.beginPath();
-        canvasContext.moveTo(resultPoints[0].getX(), resultPoints[0].getY());
-        for (let i = 1; i < resultPoints.length; i++) {
-          canvasContext.lineTo(resultPoints[i].getX(), resultPoints[i].getY());
-        }
-        canvasContext.closePath();
-        canvasContext.stroke();
-      }
+      const qrCanvas = document.getElementById('qrCanvas');
+      this.drawOutline(qrCanvas.getContext('2d'), scan.points);
 
       // Get scan data
-      const text = result.getText();
-      const format = getBarcodeFormatName(result.getBarcodeFormat());
+      let text = scan.text;
+      let format = getBarcodeFormatName(scan.format);
       const time = new Date().toLocaleString();
+      let transferData = null;
+
+      // A frame of an animated QR stream: keep scanning until the file can be rebuilt
+      const frame = parseFrame(text);
+      if (frame) {
+        const status = this.receiveTransferFrame(frame);
+        if (!status) {
+          return;
+        }
+        transferData = status.data;
+        text = this.describeTransferData(transferData);
+        format = `${format} (animated, ${status.frames} frames)`;
+      }
+
+      // One part of a payload split across linked symbols: keep going until all parts are in
+      const linkedPart = parseLinkedPart(scan);
+      if (linkedPart) {
+        const progress = this.linkedParts.add(linkedPart);
+        if (!progress.complete) {
+          ErrorHandler.showProgress(
+            `Linked symbol ${linkedPart.part} of ${progress.total || '?'} read ` +
+              `(${progress.received} received). Scan the remaining symbols.`
+          );
+          return;
+        }
+        text = progress.text;
+        format = `${format} (${progress.total} linked symbols)`;
+      }
 
       // Mark that we had a successful scan (for conditional canvas hiding)
       stateManager.set('scanner.lastScanSuccessful', true);
 
       // IMMEDIATELY stop all scanning processes to preserve the detection frame
       stateManager.set('scanner.isScanning', false);
-      
-      // Stop canvas drawing interval to preserve the current frame
-      const canvasDrawingInterval = stateManager.get('scanner.canvasDrawingInterval');
-      if (canvasDrawingInterval) {
-        clearInterval(canvasDrawingInterval);
-        stateManager.set('scanner.canvasDrawingInterval', null);
-      }
 
-      // Stop continuous scanning interval
-      const drawingInterval = stateManager.get('scanner.drawingInterval');
-      if (drawingInterval) {
-        clearInterval(drawingInterval);
-        stateManager.set('scanner.drawingInterval', null);
-      }
+      // The frame pump ends on its own once isScanning is false, leaving this frame on the canvas
 
       // Video is already hidden, canvas stays visible showing the detection frame
 
@@ -477,6 +870,9 @@ export class BarcodeScanner {
 
       // Display result
       this.displayScanResult(text, format, time);
+      if (transferData) {
+        this.addTransferDownload(transferData);
+      }
 
       // Update save buttons visibility
       this.updateSaveButtonsVisibility();
@@ -490,10 +886,66 @@ export class BarcodeScanner {
 
     } catch (err) {
       console.error('Error handling scan result:', err);
-      ErrorHandler.showUserError('Error processing scan result: ' + err.message, err, 'BarcodeScanner.handleZXingCode');
+      ErrorHandler.showUserError('Error processing scan result: ' + err.message, err, 'BarcodeScanner.handleScanResult');
     }
   }
 
+  /**
+   * Feed an animated QR frame to the fountain decoder and report progress
+   * @returns {object|null} Decoder status once the file is complete, otherwise null
+   */
+  receiveTransferFrame(frame) {
+    const progress = document.getElementById('transferProgress');
+    let status;
+    try {
+      status = this.transfer.receive(frame);
+    } catch (error) {
+      progress.textContent = `⚠️ ${error.message}`;
+      return null;
+    }
+
+    progress.textContent = describeTransfer(status);
+    if (!status.complete) {
+      return null;
+    }
+
+    // Ready for the next stream; the same stream scanned again starts a new transfer
+    this.transfer.reset();
+    return status;
+  }
+
+  /**
+   * Show received text directly; binary files get a summary instead
+   */
+  describeTransferData(data) {
+    try {
+      const text = new TextDecoder('utf-8', { fatal: true }).decode(data);
+      if (text.length <= 10000) {
+        return text;
+      }
+    } catch (error) {
+      // Not UTF-8 text
+    }
+    return `Animated QR transfer: ${data.length} bytes received`;
+  }
+
+  /**
+   * Offer a file received through an animated QR stream for download
+   */
+  addTransferDownload(data) {
+    const scanResult = document.getElementById('scanResult');
+    const url = URL.createObjectURL(new Blob([data], { type: 'application/octet-stream' }));
+
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `transfer_${Date.now()}.bin`;
+    link.textContent = `📥 Download received file (${data.length} bytes)`;
+    link.className = 'secondary-button';
+    link.style.display = 'inline-block';
+    link.style.marginTop = '10px';
+    scanResult.appendChild(link);
+  }
+
   /**
    * Handle image upload for scanning
    */
@@ -504,6 +956,7 @@ export class BarcodeScanner {
     return await ErrorHandler.wrapAsync(async () => {
       ErrorHandler.clearAllErrors();
       ErrorHandler.showProgress('Scanning uploaded image...');
+      await loadLibrary('zxing');
       
       clearResults();
 
@@ -530,15 +983,10 @@ export class BarcodeScanner {
           // Draw the uploaded image
           canvasContext.drawImage(img, 0, 0);
 
-          // Create code reader and decode
-          const codeReader = new ZXing.BrowserMultiFormatReader();
-          const selectedFormats = this.getSelectedFormats();
-          
-          const result = await codeReader.decodeFromImageElement(img, selectedFormats);
-          
-          if (result) {
+          const scan = await this.decodeImage(img);
+          if (scan) {
             // Use existing visual feedback system - draws detection box and handles everything
-            this.handleZXingCode(result);
+            this.handleScanResult(scan);
           } else {
             this.showNoDetectionMessage();
           }
@@ -578,6 +1026,7 @@ export class BarcodeScanner {
   addToScanHistory(text, format, time) {
     const scanData = { text, format, time };
     stateManager.addToScanHistory(scanData);
+    this.formatProfile.record(format);
     this.updateHistoryDisplay();
   }
 
@@ -655,7 +1104,7 @@ export class BarcodeScanner {
     const saveButtons = document.getElementById('saveButtons');
     
     if (saveButtons) {
-      if (scanHistory && scanHistory.length > 0) {
+      if ((scanHistory && scanHistory.length > 0) || this.getSweepCodes().length > 0) {
         saveButtons.style.display = 'block';
       } else {
         saveButtons.style.display = 'none';
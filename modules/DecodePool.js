@@ -0,0 +1,154 @@
+/**
+ * DecodePool - A small pool of decode workers
+ *
+ * Requests are queued and handed to whichever worker is idle, so a batch of
+ * verifications runs in parallel across cores while each worker only ever
+ * processes one bitmap at a time. Bitmaps are transferred, not copied.
+ *
+ * The same pool runs other worker scripts with the same protocol, e.g.
+ * renderWorker.js for rendering symbols off the main thread.
+ */
+import { LIBRARIES } from './loader.js';
+
+export class DecodePool {
+  /**
+   * @param {number} size - Number of workers; defaults to the spare cores, at most 4
+   * @param {URL} script - Worker script; replies { id, result } or { id, error } to each request
+   */
+  constructor(size = DecodePool.defaultSize(), script = new URL('./decodeWorker.js', import.meta.url)) {
+    this.size = size;
+    this.script = script;
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.pending = new Map(); // request id -> { resolve, reject }
+    this.nextId = 0;
+  }
+
+  static defaultSize() {
+    const cores = navigator.hardwareConcurrency || 2;
+    return Math.max(1, Math.min(4, cores - 1));
+  }
+
+  /**
+   * Number of requests queued or running
+   */
+  get load() {
+    return this.pending.size;
+  }
+
+  /**
+   * Send a request to the next idle worker
+   * @param {object} message - Must include a `type` understood by the worker script
+   * @param {Transferable[]} transfer - Objects to transfer (e.g. the ImageBitmap)
+   * @returns {Promise<any>}
+   */
+  run(message, transfer = []) {
+    this.spawnWorkers();
+
+    return new Promise((resolve, reject) => {
+      const id = this.nextId++;
+      this.pending.set(id, { resolve, reject });
+      this.queue.push({ message: { ...message, id }, transfer });
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Create the workers on first use
+   */
+  spawnWorkers() {
+    if (this.workers.length > 0) return;
+
+    for (let i = 0; i < this.size; i++) {
+      this.spawnWorker();
+    }
+  }
+
+  spawnWorker() {
+    const worker = new Worker(this.script);
+    worker.served = 0; // Requests answered, so a worker whose script never loads is not replaced
+    worker.onmessage = (event) => this.handleReply(worker, event.data);
+    worker.onerror = (event) => {
+      event.preventDefault();
+      this.handleFailure(worker, event.message || 'Worker failed');
+    };
+    worker.postMessage({ type: 'init', libraryUrl: new URL(LIBRARIES.zxing.url, location.href).href });
+    this.workers.push(worker);
+    this.idle.push(worker);
+  }
+
+  dispatch() {
+    while (this.idle.length > 0 && this.queue.length > 0) {
+      const worker = this.idle.pop();
+      const { message, transfer } = this.queue.shift();
+      try {
+        worker.postMessage(message, transfer);
+        worker.currentId = message.id;
+      } catch (error) {
+        // Not sent (e.g. a detached bitmap): the worker is still idle
+        this.idle.push(worker);
+        this.settle(message.id, { error: error.message });
+      }
+    }
+  }
+
+  handleReply(worker, { id, result, error }) {
+    worker.currentId = null;
+    worker.served++;
+    if (!this.idle.includes(worker)) {
+      this.idle.push(worker);
+    }
+    this.settle(id, { result, error });
+    this.dispatch();
+  }
+
+  /**
+   * A worker threw or failed to load: its state is unknown, so it is replaced
+   *
+   * A worker that never answered a request is not replaced, as its
+   * replacement would most likely fail the same way; without workers left,
+   * queued requests are rejected.
+   */
+  handleFailure(worker, error) {
+    const id = worker.currentId;
+    worker.terminate();
+    this.workers = this.workers.filter((other) => other !== worker);
+    this.idle = this.idle.filter((other) => other !== worker);
+    if (worker.served > 0) {
+      this.spawnWorker();
+    }
+    if (id !== null && id !== undefined) {
+      this.settle(id, { error });
+    }
+    if (this.workers.length === 0) {
+      this.queue.forEach(({ message }) => this.settle(message.id, { error }));
+      this.queue = [];
+    }
+    this.dispatch();
+  }
+
+  settle(id, { result, error }) {
+    const callbacks = this.pending.get(id);
+    this.pending.delete(id);
+    if (callbacks) {
+      if (error) {
+        callbacks.reject(new Error(error));
+      } else {
+        callbacks.resolve(result);
+      }
+    }
+  }
+
+  /**
+   * Stop all workers and reject anything still outstanding
+   */
+  terminate() {
+    this.workers.forEach((worker) => worker.terminate());
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.pending.forEach(({ reject }) => reject(new Error('Decode pool terminated')));
+    this.pending.clear();
+  }
+}
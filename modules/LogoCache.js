@@ -0,0 +1,181 @@
+/**
+ * LogoCache - Decodes an overlay logo once and serves pre-scaled copies
+ *
+ * The uploaded file is decoded to an ImageBitmap a single time. Canvas renders
+ * draw a copy already scaled to the exact pixel size being drawn, so repeated
+ * renders (live preview, batch export) are a plain blit. SVG output references
+ * one embedded copy of the file through a <symbol>, so a page with many
+ * symbols carries the logo bytes only once.
+ */
+
+const SVG_LOGO_ID = 'qrlogo';
+
+export class LogoCache {
+  /**
+   * @param {ImageBitmap} bitmap - Decoded logo
+   * @param {string} dataUrl - Original file bytes, embedded in SVG output
+   * @param {string} previewUrl - Object URL for the <img> preview
+   */
+  constructor(bitmap, dataUrl, previewUrl) {
+    this.bitmap = bitmap;
+    this.dataUrl = dataUrl;
+    this.previewUrl = previewUrl;
+    this.scaled = new Map(); // size in px -> canvas holding the logo at that size
+    this.maxScaledSizes = 8; // Preview, full size and download sizes all fit comfortably
+  }
+
+  /**
+   * Decode a logo file
+   * @param {File|Blob} file
+   * @returns {Promise<LogoCache>}
+   */
+  static async fromFile(file) {
+    const previewUrl = URL.createObjectURL(file);
+    try {
+      const [bitmap, dataUrl] = await Promise.all([LogoCache.decode(file, previewUrl), LogoCache.readDataUrl(file)]);
+      return new LogoCache(bitmap, dataUrl, previewUrl);
+    } catch (error) {
+      URL.revokeObjectURL(previewUrl);
+      throw error;
+    }
+  }
+
+  /**
+   * Decode to an ImageBitmap, going through <img> for formats createImageBitmap rejects (SVG)
+   */
+  static async decode(file, url) {
+    try {
+      return await createImageBitmap(file);
+    } catch (error) {
+      const image = new Image();
+      image.src = url;
+      await image.decode();
+      return await createImageBitmap(image);
+    }
+  }
+
+  static readDataUrl(file) {
+    return new Promise((resolve, reject) => {
+      const reader = new FileReader();
+      reader.onload = () => resolve(reader.result);
+      reader.onerror = () => reject(new Error('Error reading logo file'));
+      reader.readAsDataURL(file);
+    });
+  }
+
+  /**
+   * Centre a square logo with a white margin inside a symbol of the given size
+   * @returns {{x: number, y: number, size: number, margin: number}}
+   */
+  static placement(width, height) {
+    const size = Math.round(Math.min(width, height) * 0.2);
+    return {
+      x: Math.round((width - size) / 2),
+      y: Math.round((height - size) / 2),
+      size,
+      margin: 5,
+    };
+  }
+
+  /**
+   * Get the logo scaled to a square of the given pixel size
+   * @param {number} size
+   * @returns {HTMLCanvasElement|OffscreenCanvas}
+   */
+  getScaled(size) {
+    let canvas = this.scaled.get(size);
+    if (canvas) {
+      // Refresh insertion order so the least recently used size is evicted first
+      this.scaled.delete(size);
+      this.scaled.set(size, canvas);
+      return canvas;
+    }
+
+    if (typeof OffscreenCanvas !== 'undefined') {
+      canvas = new OffscreenCanvas(size, size);
+    } else {
+      canvas = document.createElement('canvas');
+      canvas.width = size;
+      canvas.height = size;
+    }
+    const ctx = canvas.getContext('2d');
+    ctx.imageSmoothingQuality = 'high';
+    ctx.drawImage(this.bitmap, 0, 0, size, size);
+
+    this.scaled.set(size, canvas);
+    if (this.scaled.size > this.maxScaledSizes) {
+      this.scaled.delete(this.scaled.keys().next().value);
+    }
+    return canvas;
+  }
+
+  /**
+   * Draw the logo centred on a rendered barcode canvas
+   * @param {HTMLCanvasElement} canvas
+   */
+  drawOnto(canvas) {
+    const ctx = canvas.getContext('2d');
+    if (!ctx) {
+      throw new Error('Could not get canvas context');
+    }
+
+    const { x, y, size, margin } = LogoCache.placement(canvas.width, canvas.height);
+    ctx.fillStyle = 'white';
+    ctx.fillRect(x - margin, y - margin, size + 2 * margin, size + 2 * margin);
+    // Drawn at its natural size, so no resampling happens per render
+    ctx.drawImage(this.getScaled(size), x, y);
+  }
+
+  /**
+   * The shared definition every logo overlay refers to; emit it once per SVG document
+   * @returns {string}
+   */
+  svgDefinition() {
+    return (
+      `<symbol id="${SVG_LOGO_ID}" viewBox="0 0 1 1">` +
+      `<image width="1" height="1" preserveAspectRatio="none" href="${this.dataUrl}"/>` +
+      '</symbol>'
+    );
+  }
+
+  /**
+   * Markup placing the logo on a symbol with the given viewBox
+   * @param {string} viewBox - "minX minY width height"
+   * @returns {string}
+   */
+  svgOverlay(viewBox) {
+    const [minX, minY, width, height] = viewBox.split(/[\s,]+/).map(Number);
+    const { x, y, size, margin } = LogoCache.placement(width, height);
+    return (
+      `<rect x="${minX + x - margin}" y="${minY + y - margin}" width="${size + 2 * margin}" height="${size + 2 * margin}" fill="#fff"/>` +
+      `<use href="#${SVG_LOGO_ID}" x="${minX + x}" y="${minY + y}" width="${size}" height="${size}"/>`
+    );
+  }
+
+  /**
+   * Add the logo to a standalone SVG document
+   * @param {string} svg - Serialized SVG with a viewBox
+   * @returns {string}
+   */
+  addToSvg(svg) {
+    const viewBox = svg.match(/viewBox="([^"]+)"/);
+    const closeStart = svg.lastIndexOf('</svg>');
+    if (!viewBox || closeStart < 0) {
+      throw new Error('Unrecognized SVG output');
+    }
+    return (
+      svg.slice(0, closeStart) +
+      `<defs>${this.svgDefinition()}</defs>${this.svgOverlay(viewBox[1])}` +
+      svg.slice(closeStart)
+    );
+  }
+
+  /**
+   * Release the decoded bitmap, scaled copies and preview URL
+   */
+  close() {
+    this.bitmap.close();
+    this.scaled.clear();
+    URL.revokeObjectURL(this.previewUrl);
+  }
+}
@@ -154,13 +154,15 @@ export class StorageManager {
   }
 
   /**
-   * Save all scans from scan history
+   * Save all scans: every code of the last continuous scan, otherwise the scan history
+   * (which keeps only the last 10 scans)
    */
   async saveAllScans() {
     return await ErrorHandler.wrapAsync(async () => {
       ErrorHandler.showProgress('Saving all scans...');
       
-      const scanHistory = stateManager.get('scanner.scanHistory');
+      const sweepCodes = stateManager.get('scanner.sweepCodes');
+      const scanHistory = sweepCodes && sweepCodes.length > 0 ? sweepCodes : stateManager.get('scanner.scanHistory');
       
       if (!scanHistory || scanHistory.length === 0) {
         ErrorHandler.showUserError('No scans to save');
@@ -312,10 +314,11 @@ export class StorageManager {
    */
   updateSaveButtonsVisibility() {
     const scanHistory = stateManager.get('scanner.scanHistory');
+    const sweepCodes = stateManager.get('scanner.sweepCodes');
     const saveButtons = document.getElementById('saveButtons');
     
     if (saveButtons) {
-      if (scanHistory && scanHistory.length > 0) {
+      if ((scanHistory && scanHistory.length > 0) || (sweepCodes && sweepCodes.length > 0)) {
         saveButtons.style.display = 'block';
       } else {
         saveButtons.style.display = 'none';
@@ -0,0 +1,238 @@
+/**
+ * ZipWriter class - Streams ZIP archives entry by entry
+ *
+ * Entries are pulled from an (async) iterable only when the consumer of the
+ * returned ReadableStream asks for more bytes, so peak memory is bounded by
+ * the entry being written rather than by the size of the archive. Sizes and
+ * CRCs go into data descriptors after each entry, which means no entry ever
+ * has to be buffered to learn its length up front.
+ */
+import { crc32 } from './utils.js';
+
+const LOCAL_FILE_HEADER_SIGNATURE = 0x04034b50;
+const DATA_DESCRIPTOR_SIGNATURE = 0x08074b50;
+const CENTRAL_DIRECTORY_SIGNATURE = 0x02014b50;
+const END_OF_CENTRAL_DIRECTORY_SIGNATURE = 0x06054b50;
+
+const FLAG_DATA_DESCRIPTOR = 0x0008; // Sizes and CRC follow the entry data
+const FLAG_UTF8 = 0x0800; // File names are UTF-8
+
+const METHOD_STORE = 0;
+const METHOD_DEFLATE = 8;
+
+const ZIP_VERSION = 20; // 2.0 - deflate and data descriptors
+const MAX_UINT32 = 0xffffffff;
+const MAX_ENTRIES = 0xffff; // Without ZIP64
+
+const textEncoder = new TextEncoder();
+
+export class ZipWriter {
+  constructor() {
+    this.centralDirectory = [];
+    this.offset = 0;
+  }
+
+  /**
+   * Check whether the browser can deflate natively
+   */
+  static supportsDeflate() {
+    if (typeof CompressionStream === 'undefined') {
+      return false;
+    }
+    try {
+      new CompressionStream('deflate-raw');
+      return true;
+    } catch (error) {
+      return false;
+    }
+  }
+
+  /**
+   * Create a pull-based stream of ZIP bytes
+   * @param {Iterable|AsyncIterable} entries - Items of {name, data, compress}, where data is a
+   *   Blob, string or Uint8Array and compress requests deflate (PNGs should be stored as-is)
+   * @returns {ReadableStream<Uint8Array>}
+   */
+  static createStream(entries) {
+    const writer = new ZipWriter();
+    const chunks = writer.generate(entries);
+
+    return new ReadableStream({
+      async pull(controller) {
+        const { value, done } = await chunks.next();
+        if (done) {
+          controller.close();
+        } else {
+          controller.enqueue(value);
+        }
+      },
+      async cancel() {
+        await chunks.return();
+      },
+    });
+  }
+
+  /**
+   * Yield the archive as a sequence of byte chunks
+   */
+  async *generate(entries) {
+    for await (const entry of entries) {
+      yield* this.writeEntry(entry);
+    }
+    yield* this.writeCentralDirectory();
+  }
+
+  /**
+   * Yield local header, data and data descriptor for one entry
+   */
+  async *writeEntry({ name, data, compress = false }) {
+    if (this.centralDirectory.length >= MAX_ENTRIES) {
+      throw new Error(`ZIP archives are limited to ${MAX_ENTRIES} entries`);
+    }
+
+    const nameBytes = textEncoder.encode(name);
+    const method = compress && ZipWriter.supportsDeflate() ? METHOD_DEFLATE : METHOD_STORE;
+    const { time, date } = toDosDateTime(new Date());
+    const headerOffset = this.offset;
+
+    // Local file header - CRC and sizes are left zero and written to the data descriptor
+    const header = new Uint8Array(30 + nameBytes.length);
+    const headerView = new DataView(header.buffer);
+    headerView.setUint32(0, LOCAL_FILE_HEADER_SIGNATURE, true);
+    headerView.setUint16(4, ZIP_VERSION, true);
+    headerView.setUint16(6, FLAG_DATA_DESCRIPTOR | FLAG_UTF8, true);
+    headerView.setUint16(8, method, true);
+    headerView.setUint16(10, time, true);
+    headerView.setUint16(12, date, true);
+    headerView.setUint16(26, nameBytes.length, true);
+    header.set(nameBytes, 30);
+    yield this.track(header);
+
+    // Checksum the uncompressed bytes on their way through
+    let crc = 0;
+    let uncompressedSize = 0;
+    let compressedSize = 0;
+
+    let source = toBlob(data).stream().pipeThrough(
+      new TransformStream({
+        transform(chunk, controller) {
+          crc = crc32(chunk, crc);
+          uncompressedSize += chunk.length;
+          controller.enqueue(chunk);
+        },
+      })
+    );
+    if (method === METHOD_DEFLATE) {
+      source = source.pipeThrough(new CompressionStream('deflate-raw'));
+    }
+
+    const reader = source.getReader();
+    let finished = false;
+    try {
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        compressedSize += value.length;
+        yield this.track(value);
+      }
+      finished = true;
+    } finally {
+      if (!finished) {
+        reader.cancel().catch(() => {});
+      }
+    }
+
+    if (uncompressedSize > MAX_UINT32 || compressedSize > MAX_UINT32) {
+      throw new Error(`Entry "${name}" exceeds 4 GB, which requires ZIP64`);
+    }
+
+    const descriptor = new Uint8Array(16);
+    const descriptorView = new DataView(descriptor.buffer);
+    descriptorView.setUint32(0, DATA_DESCRIPTOR_SIGNATURE, true);
+    descriptorView.setUint32(4, crc, true);
+    descriptorView.setUint32(8, compressedSize, true);
+    descriptorView.setUint32(12, uncompressedSize, true);
+    yield this.track(descriptor);
+
+    // Only the small central directory record is retained per entry
+    this.centralDirectory.push({
+      nameBytes,
+      method,
+      time,
+      date,
+      crc,
+      compressedSize,
+      uncompressedSize,
+      headerOffset,
+    });
+  }
+
+  /**
+   * Yield the central directory and end-of-central-directory record
+   */
+  async *writeCentralDirectory() {
+    const directoryOffset = this.offset;
+
+    for (const entry of this.centralDirectory) {
+      const record = new Uint8Array(46 + entry.nameBytes.length);
+      const view = new DataView(record.buffer);
+      view.setUint32(0, CENTRAL_DIRECTORY_SIGNATURE, true);
+      view.setUint16(4, ZIP_VERSION, true); // Version made by
+      view.setUint16(6, ZIP_VERSION, true); // Version needed to extract
+      view.setUint16(8, FLAG_DATA_DESCRIPTOR | FLAG_UTF8, true);
+      view.setUint16(10, entry.method, true);
+      view.setUint16(12, entry.time, true);
+      view.setUint16(14, entry.date, true);
+      view.setUint32(16, entry.crc, true);
+      view.setUint32(20, entry.compressedSize, true);
+      view.setUint32(24, entry.uncompressedSize, true);
+      view.setUint16(28, entry.nameBytes.length, true);
+      view.setUint32(42, entry.headerOffset, true);
+      record.set(entry.nameBytes, 46);
+      yield this.track(record);
+    }
+
+    const directorySize = this.offset - directoryOffset;
+    if (this.offset > MAX_UINT32) {
+      throw new Error('Archive exceeds 4 GB, which requires ZIP64');
+    }
+
+    const end = new Uint8Array(22);
+    const endView = new DataView(end.buffer);
+    endView.setUint32(0, END_OF_CENTRAL_DIRECTORY_SIGNATURE, true);
+    endView.setUint16(8, this.centralDirectory.length, true);
+    endView.setUint16(10, this.centralDirectory.length, true);
+    endView.setUint32(12, directorySize, true);
+    endView.setUint32(16, directoryOffset, true);
+    yield this.track(end);
+  }
+
+  /**
+   * Advance the running archive offset past a chunk
+   */
+  track(chunk) {
+    this.offset += chunk.length;
+    return chunk;
+  }
+}
+
+/**
+ * Normalize entry data to a Blob so it can be streamed
+ */
+function toBlob(data) {
+  if (data instanceof Blob) {
+    return data;
+  }
+  return new Blob([data]);
+}
+
+/**
+ * Convert a date to the MS-DOS time/date pair used in ZIP headers
+ */
+function toDosDateTime(date) {
+  const year = Math.max(date.getFullYear(), 1980);
+  return {
+    time: (date.getHours() << 11) | (date.getMinutes() << 5) | (date.getSeconds() >> 1),
+    date: ((year - 1980) << 9) | ((date.getMonth() + 1) << 5) | date.getDate(),
+  };
+}
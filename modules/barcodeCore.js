@@ -0,0 +1,307 @@
+/**
+ * Barcode core - DOM-free barcode generation
+ *
+ * Everything here takes plain values instead of reading form fields, so the
+ * same code renders for the generator tab, batch jobs, workers and automation.
+ * BarcodeGenerator collects the form values and calls into this module.
+ *
+ * In a classic worker, import it dynamically; bwip-js is then pulled in with
+ * importScripts on first use:
+ *   const { generate } = await import('/modules/barcodeCore.js');
+ *   const blob = await generate({ type: 'qrcode', text: 'hello' });
+ */
+import { loadLibrary } from './loader.js';
+import { optimizeSvg } from './svgOptimizer.js';
+import { pixelsPerModule, setSvgPhysicalSize, setPngResolution } from './printSize.js';
+import { VALIDATION_RULES, validateValue } from './validation.js';
+import { planSymbol } from './capacity.js';
+import { autoPin } from './qrPinning.js';
+
+/**
+ * Barcode type names -> bwip-js bcid values
+ */
+export const BCID = {
+  codabar: 'rationalizedCodabar',
+  qrcode: 'qrcode',
+  datamatrix: 'datamatrix',
+  pdf417: 'pdf417',
+  azteccode: 'azteccode',
+  ean13: 'ean13',
+  ean8: 'ean8',
+  upca: 'upca',
+  upce: 'upce',
+  code39: 'code39',
+  code128: 'code128',
+  interleaved2of5: 'interleaved2of5',
+};
+
+// Square symbols keep their natural 1:1 aspect ratio, so no bar height is set
+export const SQUARE_TYPES = ['qrcode', 'datamatrix', 'azteccode'];
+
+export const OUTPUT_FORMATS = ['png', 'svg', 'bitmap', 'dataurl', 'canvas'];
+
+/**
+ * Rendering options understood by buildBwipOptions; null means "not set"
+ */
+export const DEFAULT_OPTIONS = {
+  scale: null, // Pixels per module; defaults to 3, or the print mode dot count
+  padding: 10,
+  includetext: false,
+  barHeight: 10, // 1D bar height in millimetres
+  backgroundcolor: null, // e.g. 'ffffff'; transparent when unset
+  eclevel: null, // QR Code: L, M, Q or H
+  version: null, // QR Code: 1-40; chosen by bwip-js when unset
+  mask: null, // QR Code: 1-8, or 'auto' to measure once per length class (see qrPinning.js)
+  securitylevel: null, // PDF417: 0-8
+  logo: null, // LogoCache overlaid on QR Codes
+  print: null, // { dpi, xDimension, unit: 'mil' | 'mm' } for print-accurate output
+  bwip: null, // Extra bwip-js options applied last, e.g. { raw: true, rows, columns } for PDF417 codewords
+};
+
+const DEFAULT_SCALE = 3;
+
+/**
+ * Check text against the rules of a barcode type
+ * @param {string} type - Key of BCID
+ * @param {string} text
+ * @returns {string|null} Error message, or null when the text is valid
+ */
+export function validateText(type, text) {
+  if (!text && VALIDATION_RULES[type]) {
+    return 'Please enter content to generate a barcode.';
+  }
+  const errors = validateValue(type, text);
+  return errors.length > 0 ? errors[0].message : null;
+}
+
+/**
+ * Resolve the pixels per module and whether output is print-accurate
+ * @param {object} options - See DEFAULT_OPTIONS
+ * @returns {{scale: number, dpi: number|null}} dpi is set only when rendering at exact printer dots
+ */
+export function resolveScale(options = {}) {
+  const print = options.print
+    ? pixelsPerModule(options.print.dpi, options.print.xDimension, options.print.unit)
+    : null;
+  const scale = options.scale ?? (print ? print.pixels : DEFAULT_SCALE);
+  return { scale, dpi: print && scale === print.pixels ? options.print.dpi : null };
+}
+
+/**
+ * Build the bwip-js options object for a symbol
+ * Throws when the capacity model says the payload cannot fit; may raise the QR
+ * error correction level when a logo is present (see capacity.planSymbol).
+ * @param {string} type - Key of BCID
+ * @param {string} text
+ * @param {object} options - See DEFAULT_OPTIONS
+ * @returns {object}
+ */
+export function buildBwipOptions(type, text, options = {}) {
+  let settings = { ...DEFAULT_OPTIONS, ...options };
+
+  // Reject payloads that cannot fit before bwip-js spends time trying
+  // (raw codewords are sized by whoever built them)
+  const plan = settings.bwip?.raw ? null : planSymbol(type, text, settings);
+  if (plan) {
+    if (!plan.fits) {
+      throw new Error(plan.message);
+    }
+    settings = { ...settings, ...plan.overrides };
+  }
+
+  const { scale, dpi } = resolveScale(settings);
+
+  const bwipOptions = {
+    bcid: BCID[type] || type,
+    text,
+    scale,
+    includetext: !!settings.includetext,
+    padding: settings.padding ?? DEFAULT_OPTIONS.padding,
+  };
+
+  if (settings.backgroundcolor) {
+    bwipOptions.backgroundcolor = settings.backgroundcolor;
+  }
+
+  if (!SQUARE_TYPES.includes(type)) {
+    // bwip-js measures height at 72 points per inch, each point `scale` pixels wide;
+    // print output converts so the bars come out barHeight millimetres tall on paper
+    bwipOptions.height = dpi ? (settings.barHeight * dpi) / (72 * scale) : settings.barHeight;
+  }
+
+  if (type === 'qrcode') {
+    if (settings.eclevel) {
+      bwipOptions.eclevel = settings.eclevel;
+    }
+    // Pinning skips bwip-js's search over versions and its scoring of all eight masks
+    const pin =
+      settings.mask === 'auto'
+        ? autoPin(text, settings.eclevel || 'M', settings.version, createCanvas)
+        : { version: settings.version, mask: settings.mask };
+    if (pin.version) {
+      bwipOptions.version = String(pin.version);
+    }
+    if (pin.mask) {
+      bwipOptions.mask = pin.mask;
+    }
+  } else if (type === 'pdf417' && Number.isFinite(settings.securitylevel)) {
+    bwipOptions.securitylevel = settings.securitylevel;
+  }
+
+  if (settings.bwip) {
+    Object.assign(bwipOptions, settings.bwip);
+  }
+
+  return bwipOptions;
+}
+
+/**
+ * Create a canvas: a DOM canvas on the main thread (so it can be displayed), otherwise offscreen
+ */
+export function createCanvas() {
+  if (typeof document !== 'undefined') {
+    return document.createElement('canvas');
+  }
+  return new OffscreenCanvas(1, 1);
+}
+
+/**
+ * Render a symbol onto a canvas; bwip-js must already be loaded (see ensureEncoder)
+ * @param {string} type
+ * @param {string} text
+ * @param {object} options - See DEFAULT_OPTIONS
+ * @param {HTMLCanvasElement|OffscreenCanvas} canvas
+ * @returns {HTMLCanvasElement|OffscreenCanvas}
+ */
+export function renderCanvas(type, text, options = {}, canvas = createCanvas()) {
+  const bwipOptions = buildBwipOptions(type, text, options);
+  try {
+    bwipjs.toCanvas(canvas, bwipOptions);
+  } catch (bwipError) {
+    throw new Error(`BWIP-JS Error: ${bwipError.message || bwipError}`);
+  }
+
+  if (type === 'qrcode' && options.logo) {
+    options.logo.drawOnto(canvas);
+  }
+  return canvas;
+}
+
+/**
+ * Render a symbol as optimized SVG markup; bwip-js must already be loaded
+ * @returns {string}
+ */
+export function renderSvg(type, text, options = {}) {
+  const bwipOptions = buildBwipOptions(type, text, options);
+  let svg;
+  try {
+    svg = bwipjs.toSVG(bwipOptions);
+  } catch (bwipError) {
+    throw new Error(`BWIP-JS Error: ${bwipError.message || bwipError}`);
+  }
+
+  // Merge modules into runs before anything has to parse every segment
+  svg = optimizeSvg(svg);
+
+  if (type === 'qrcode' && options.logo) {
+    svg = options.logo.addToSvg(svg);
+  }
+
+  // Full-size print output carries its physical dimensions
+  const { dpi } = resolveScale(options);
+  if (dpi) {
+    svg = setSvgPhysicalSize(svg, dpi);
+  }
+  return svg;
+}
+
+/**
+ * Encode a canvas as PNG, tagged with its print resolution when given
+ * @param {HTMLCanvasElement|OffscreenCanvas} canvas
+ * @param {number|null} dpi
+ * @returns {Promise<Blob>}
+ */
+export async function encodePng(canvas, dpi = null) {
+  const blob =
+    typeof canvas.convertToBlob === 'function'
+      ? await canvas.convertToBlob({ type: 'image/png' })
+      : await new Promise((resolve) => canvas.toBlob(resolve, 'image/png'));
+  if (!blob) {
+    throw new Error('Failed to encode PNG');
+  }
+  return dpi ? await setPngResolution(blob, dpi) : blob;
+}
+
+function blobToDataUrl(blob) {
+  return new Promise((resolve, reject) => {
+    const reader = new FileReader();
+    reader.onload = () => resolve(reader.result);
+    reader.onerror = () => reject(new Error('Failed to read image data'));
+    reader.readAsDataURL(blob);
+  });
+}
+
+/**
+ * Load bwip-js if needed (a <script> on the main thread, importScripts in classic workers)
+ */
+export function ensureEncoder() {
+  return loadLibrary('bwipjs');
+}
+
+/**
+ * Generate one barcode
+ * @param {object} request
+ * @param {string} request.type - Key of BCID
+ * @param {string} request.text
+ * @param {object} request.options - See DEFAULT_OPTIONS
+ * @param {string} request.format - 'png' (Blob), 'svg' (string), 'bitmap' (ImageBitmap),
+ *   'dataurl' (string, PNG unless options.vector) or 'canvas'
+ * @returns {Promise<Blob|string|ImageBitmap|HTMLCanvasElement|OffscreenCanvas>}
+ */
+export async function generate({ type, text, options = {}, format = 'png' }) {
+  if (!OUTPUT_FORMATS.includes(format)) {
+    throw new Error(`Unsupported output format: ${format}`);
+  }
+  const error = options.bwip?.raw ? null : validateText(type, text);
+  if (error) {
+    throw new Error(error);
+  }
+  await ensureEncoder();
+
+  if (format === 'svg') {
+    return renderSvg(type, text, options);
+  }
+  if (format === 'dataurl' && options.vector) {
+    return 'data:image/svg+xml;charset=utf-8,' + encodeURIComponent(renderSvg(type, text, options));
+  }
+
+  const canvas = renderCanvas(type, text, options);
+  if (format === 'canvas') {
+    return canvas;
+  }
+  if (format === 'bitmap') {
+    return createImageBitmap(canvas);
+  }
+
+  const blob = await encodePng(canvas, resolveScale(options).dpi);
+  return format === 'dataurl' ? blobToDataUrl(blob) : blob;
+}
+
+/**
+ * Generate many barcodes in one call; a failing request does not stop the rest
+ * @param {Array<object>} requests - Same shape as generate()
+ * @returns {Promise<Array<{ok: true, data: any}|{ok: false, error: string}>>} In request order
+ */
+export async function generateMany(requests) {
+  await ensureEncoder();
+
+  const results = [];
+  for (const request of requests) {
+    try {
+      results.push({ ok: true, data: await generate(request) });
+    } catch (error) {
+      results.push({ ok: false, error: error.message });
+    }
+  }
+  return results;
+}
@@ -0,0 +1,388 @@
+/**
+ * Capacity model - Predicts symbol size before anything is rendered
+ *
+ * QR Code capacities come from the ISO 18004 block tables. A payload is
+ * rejected here, instead of after a slow bwip-js attempt, only when even the
+ * cheapest mix of numeric, alphanumeric and byte segments (qrSegments.js)
+ * cannot fit; the size reported for mixed content is a lower bound and
+ * bwip-js picks the final version. Data Matrix, PDF417 and Aztec use the
+ * standard size tables with an estimated per-character cost; bwip-js mixes
+ * encodation modes more cleverly than the estimate, so for these a payload is
+ * only rejected when it is over the largest symbol's limit in validation.js.
+ * Below that the plan is advisory: an estimate past the largest symbol is
+ * reported as near capacity and bwip-js decides.
+ */
+
+import { validateValue } from './validation.js';
+import { qrSegmentBits, qrSizeClass } from './qrSegments.js';
+
+// ---- QR Code ---------------------------------------------------------------
+
+const QR_EC_LEVELS = ['L', 'M', 'Q', 'H'];
+
+// Error correction codewords per block, index = version (ISO 18004 table 9)
+const QR_ECC_PER_BLOCK = {
+  L: [0, 7, 10, 15, 20, 26, 18, 20, 24, 30, 18, 20, 24, 26, 30, 22, 24, 28, 30, 28, 28, 28, 28, 30, 30, 26, 28, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30],
+  M: [0, 10, 16, 26, 18, 24, 16, 18, 22, 22, 26, 30, 22, 22, 24, 24, 28, 28, 26, 26, 26, 26, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28],
+  Q: [0, 13, 22, 18, 26, 18, 24, 18, 22, 20, 24, 28, 26, 24, 20, 30, 24, 28, 28, 26, 30, 28, 30, 30, 30, 30, 28, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30],
+  H: [0, 17, 28, 22, 16, 22, 28, 26, 26, 24, 28, 24, 28, 22, 24, 24, 30, 28, 28, 26, 28, 30, 24, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30],
+};
+
+// Number of error correction blocks, index = version
+const QR_BLOCKS = {
+  L: [0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 4, 4, 4, 4, 4, 6, 6, 6, 6, 7, 8, 8, 9, 9, 10, 12, 12, 12, 13, 14, 15, 16, 17, 18, 19, 19, 20, 21, 22, 24, 25],
+  M: [0, 1, 1, 1, 2, 2, 4, 4, 4, 5, 5, 5, 8, 9, 9, 10, 10, 11, 13, 14, 16, 17, 17, 18, 20, 21, 23, 25, 26, 28, 29, 31, 33, 35, 37, 38, 40, 43, 45, 47, 49],
+  Q: [0, 1, 1, 2, 2, 4, 4, 6, 6, 8, 8, 8, 10, 12, 16, 12, 17, 16, 18, 21, 20, 23, 23, 25, 27, 29, 34, 34, 35, 38, 40, 43, 45, 48, 51, 53, 56, 59, 62, 65, 68],
+  H: [0, 1, 1, 2, 4, 4, 4, 5, 6, 8, 8, 11, 11, 16, 16, 18, 16, 19, 21, 25, 25, 25, 34, 30, 32, 35, 37, 40, 42, 45, 48, 51, 54, 57, 60, 63, 66, 70, 74, 77, 81],
+};
+
+/**
+ * Data codewords per version and level, computed once from the module count
+ */
+const QR_DATA_CODEWORDS = (() => {
+  const table = { L: [0], M: [0], Q: [0], H: [0] };
+  for (let version = 1; version <= 40; version++) {
+    let modules = (16 * version + 128) * version + 64;
+    if (version >= 2) {
+      const alignment = Math.floor(version / 7) + 2;
+      modules -= (25 * alignment - 10) * alignment - 55;
+      if (version >= 7) modules -= 36;
+    }
+    const total = Math.floor(modules / 8);
+    QR_EC_LEVELS.forEach((level) => {
+      table[level].push(total - QR_ECC_PER_BLOCK[level][version] * QR_BLOCKS[level][version]);
+    });
+  }
+  return table;
+})();
+
+const QR_ALPHANUMERIC = /^[0-9A-Z $%*+\-./:]*$/;
+
+/**
+ * Count UTF-8 bytes without allocating an encoded copy
+ */
+function utf8Length(text) {
+  let bytes = 0;
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    if (code < 0x80) bytes += 1;
+    else if (code < 0x800) bytes += 2;
+    else if (code >= 0xd800 && code <= 0xdbff) {
+      bytes += 4;
+      i++;
+    } else bytes += 3;
+  }
+  return bytes;
+}
+
+/**
+ * Bits needed to encode text in a single QR mode at a given version
+ */
+function qrDataBits(text, version) {
+  const sizeClass = qrSizeClass(version);
+  if (/^[0-9]*$/.test(text)) {
+    const remainder = [0, 4, 7][text.length % 3];
+    return 4 + [10, 12, 14][sizeClass] + Math.floor(text.length / 3) * 10 + remainder;
+  }
+  if (QR_ALPHANUMERIC.test(text)) {
+    return 4 + [9, 11, 13][sizeClass] + Math.floor(text.length / 2) * 11 + (text.length % 2) * 6;
+  }
+  return 4 + [8, 16, 16][sizeClass] + utf8Length(text) * 8;
+}
+
+/**
+ * Smallest QR version holding the text in a single mode at a level, or 0 if none does;
+ * any encoder fits the text in this version (mixing modes may fit a smaller one)
+ */
+export function qrVersionFor(text, level) {
+  const dataCodewords = QR_DATA_CODEWORDS[level];
+  for (let version = 1; version <= 40; version++) {
+    if (qrDataBits(text, version) <= dataCodewords[version] * 8) {
+      return version;
+    }
+  }
+  return 0;
+}
+
+/**
+ * Smallest QR version holding the text at a level with the cheapest mode segmentation, or 0
+ * if none does; no encoder fits the text in a smaller version
+ */
+export function qrMinVersionFor(text, level) {
+  const dataCodewords = QR_DATA_CODEWORDS[level];
+  const bits = []; // By size class
+  for (let version = 1; version <= 40; version++) {
+    const sizeClass = qrSizeClass(version);
+    if (bits[sizeClass] === undefined) {
+      bits[sizeClass] = qrSegmentBits(text, version);
+    }
+    if (bits[sizeClass] <= dataCodewords[version] * 8) {
+      return version;
+    }
+  }
+  return 0;
+}
+
+function estimateQr(text, options) {
+  const requested = QR_EC_LEVELS.includes(options.eclevel) ? options.eclevel : 'M';
+  // A logo hides modules, so prefer the strongest level that still fits
+  const candidates = options.logo ? ['H', 'Q', requested] : [requested];
+
+  if (options.version) {
+    // A pinned version must be able to hold the payload at the requested level
+    const needed = qrMinVersionFor(text, requested);
+    if (!needed || needed > options.version) {
+      return {
+        fits: false,
+        message: `Too long for QR Code version ${options.version} at error correction ${requested}` +
+          (needed ? `; version ${needed} fits` : ''),
+      };
+    }
+    const used = Math.min(1, qrSegmentBits(text, options.version) / (QR_DATA_CODEWORDS[requested][options.version] * 8));
+    const size = 17 + 4 * options.version;
+    return { fits: true, size: `Version ${options.version} (${size}x${size})`, used, overrides: {}, note: 'version pinned' };
+  }
+
+  // Prefer a level where a single mode certainly fits; at one where only mixed segments fit, bwip-js decides
+  const levels = candidates.map((eclevel) => ({
+    eclevel,
+    min: qrMinVersionFor(text, eclevel),
+    max: qrVersionFor(text, eclevel),
+  }));
+  const chosen = levels.find((level) => level.max) || levels.find((level) => level.min);
+  if (chosen) {
+    const { eclevel, min: version } = chosen;
+    const notes = [];
+    if (eclevel !== requested) notes.push(`error correction raised to ${eclevel} for the logo`);
+    if (chosen.max !== version) notes.push('mixed content; bwip-js picks the final version');
+    return {
+      fits: true,
+      size: `Version ${version} (${17 + 4 * version}x${17 + 4 * version})`,
+      used: qrSegmentBits(text, version) / (QR_DATA_CODEWORDS[eclevel][version] * 8),
+      overrides: eclevel !== requested ? { eclevel } : {},
+      note: notes.join('; '),
+    };
+  }
+
+  // Suggest the strongest level that would still fit
+  const fallback = [...QR_EC_LEVELS].reverse().find((level) => qrMinVersionFor(text, level));
+  return {
+    fits: false,
+    message: fallback
+      ? `Too long for QR Code at error correction ${requested}; level ${fallback} fits`
+      : 'Too long for any QR Code (max 2953 bytes, 4296 alphanumeric or 7089 digits)',
+  };
+}
+
+/**
+ * Plan for a payload the estimate cannot place: rejected when it is over the
+ * format's hard maximum (validation.js), otherwise left to bwip-js
+ */
+function beyondEstimate(type, text, largest, note = 'near capacity; bwip-js decides the final size') {
+  const error = validateValue(type, text).find(({ code }) => code === 'capacity');
+  if (error) {
+    return { fits: false, message: `Too long: ${error.message}` };
+  }
+  return { fits: true, size: largest, used: 1, overrides: {}, note };
+}
+
+// ---- Data Matrix -----------------------------------------------------------
+
+// Square ECC 200 sizes and their data codewords
+const DATAMATRIX_SIZES = [
+  [10, 3], [12, 5], [14, 8], [16, 12], [18, 18], [20, 22], [22, 30], [24, 36], [26, 44],
+  [32, 62], [36, 86], [40, 114], [44, 144], [48, 174], [52, 204], [64, 280], [72, 368],
+  [80, 456], [88, 576], [96, 696], [104, 816], [120, 1050], [132, 1304], [144, 1558],
+];
+
+/**
+ * Codewords in the cheapest single encodation:
+ *   - ASCII: digit pairs share a codeword, other ASCII takes one
+ *   - C40 (upper case) and Text (lower case): three basic characters per two
+ *     codewords, other ASCII two values (shift + character), plus latch and unlatch
+ *   - anything non-ASCII goes to Base 256 at one codeword per byte plus a header
+ */
+function dataMatrixCodewords(text) {
+  let ascii = 0;
+  let c40 = 0; // C40 values
+  let textValues = 0; // Text values
+  let i = 0;
+  while (i < text.length) {
+    const code = text.charCodeAt(i);
+    if (code >= 128) {
+      return utf8Length(text) + 2;
+    }
+    const next = text.charCodeAt(i + 1);
+    const digit = code >= 48 && code <= 57;
+    const shared = digit || code === 32;
+    c40 += shared || (code >= 65 && code <= 90) ? 1 : 2;
+    textValues += shared || (code >= 97 && code <= 122) ? 1 : 2;
+    i += digit && next >= 48 && next <= 57 ? 2 : 1;
+    ascii++;
+  }
+  const packed = (values) => Math.ceil(values / 3) * 2 + 2;
+  return Math.min(ascii, packed(c40), packed(textValues));
+}
+
+function estimateDataMatrix(text) {
+  const codewords = dataMatrixCodewords(text);
+  const size = DATAMATRIX_SIZES.find(([, capacity]) => capacity >= codewords);
+  if (!size) {
+    return beyondEstimate('datamatrix', text, '144x144');
+  }
+  return { fits: true, size: `${size[0]}x${size[0]}`, used: codewords / size[1], overrides: {}, note: '' };
+}
+
+// ---- PDF417 ----------------------------------------------------------------
+
+const PDF417_MAX_CODEWORDS = 928;
+
+function pdf417DataCodewords(text) {
+  if (/^[0-9]+$/.test(text)) {
+    // Numeric compaction: 15 codewords per 44 digits
+    const remainder = text.length % 44;
+    return Math.floor(text.length / 44) * 15 + (remainder ? Math.floor(remainder / 3) + 1 : 0) + 1;
+  }
+  if (/^[\x20-\x7e\t\r\n]*$/.test(text)) {
+    // Text compaction: two values per codeword, plus a latch value whenever the
+    // sub-mode (upper, lower, digits and mixed, punctuation) changes
+    let values = 0;
+    let subMode = 'upper';
+    for (let i = 0; i < text.length; i++) {
+      const char = text[i];
+      const mode = char === ' ' ? subMode
+        : /[A-Z]/.test(char) ? 'upper'
+        : /[a-z]/.test(char) ? 'lower'
+        : /[0-9&\r\t,:#\-.$/+%*=^]/.test(char) ? 'mixed'
+        : 'punctuation';
+      if (mode !== subMode) {
+        values++;
+        subMode = mode;
+      }
+      values++;
+    }
+    return Math.ceil(values / 2) + 1;
+  }
+  // Byte compaction: 5 codewords per 6 bytes
+  return Math.ceil((utf8Length(text) * 5) / 6) + 1;
+}
+
+function estimatePdf417(text, options) {
+  const requested = Number.isFinite(options.securitylevel) ? options.securitylevel : 2;
+  const data = pdf417DataCodewords(text) + 1; // Symbol length descriptor
+  const fitsAt = (level) => data + 2 ** (level + 1) <= PDF417_MAX_CODEWORDS;
+
+  if (!fitsAt(requested)) {
+    let level = requested - 1;
+    while (level >= 0 && !fitsAt(level)) level--;
+    return beyondEstimate(
+      'pdf417',
+      text,
+      `${PDF417_MAX_CODEWORDS} codewords`,
+      level >= 0 ? `near capacity; may need security level ${level}` : undefined
+    );
+  }
+
+  const total = data + 2 ** (requested + 1);
+  return { fits: true, size: `${total} codewords`, used: total / PDF417_MAX_CODEWORDS, overrides: {}, note: '' };
+}
+
+// ---- Aztec Code ------------------------------------------------------------
+
+/**
+ * Data bits available per layer count at the default 23% error correction
+ */
+function aztecCapacityBits(layers, compact) {
+  const totalBits = ((compact ? 88 : 112) + 16 * layers) * layers;
+  const wordSize = layers <= 2 ? 6 : layers <= 8 ? 8 : layers <= 22 ? 10 : 12;
+  const words = Math.floor(totalBits / wordSize);
+  return Math.floor(words * 0.77) * wordSize - 33;
+}
+
+/**
+ * Estimated bit cost: digits 4, letters 5 with a latch (up to 10 bits) whenever
+ * the case changes, other ASCII 10 (shift + code), non-ASCII bytes 8 plus binary
+ * shift overhead
+ */
+function aztecDataBits(text) {
+  let bits = 0;
+  let binary = 0;
+  let mode = 'upper';
+  const latchTo = (next) => {
+    if (next !== mode) {
+      bits += 10;
+      mode = next;
+    }
+  };
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    if (code === 32) bits += 5; // Space exists in the upper, lower and digit modes
+    else if (code >= 48 && code <= 57) {
+      latchTo('digit');
+      bits += 4;
+    } else if (code >= 65 && code <= 90) {
+      latchTo('upper');
+      bits += 5;
+    } else if (code >= 97 && code <= 122) {
+      latchTo('lower');
+      bits += 5;
+    } else if (code < 128) bits += 10;
+    else binary++;
+  }
+  if (binary) {
+    const bytes = utf8Length(text.replace(/[\x00-\x7f]/g, ''));
+    bits += bytes * 8 + 5 + (bytes > 31 ? 16 : 5);
+  }
+  return bits;
+}
+
+function estimateAztec(text) {
+  const bits = aztecDataBits(text);
+  for (let layers = 1; layers <= 4; layers++) {
+    if (aztecCapacityBits(layers, true) >= bits) {
+      const size = 11 + 4 * layers;
+      return { fits: true, size: `Compact, ${layers} layer${layers > 1 ? 's' : ''} (${size}x${size})`, used: bits / aztecCapacityBits(layers, true), overrides: {}, note: '' };
+    }
+  }
+  for (let layers = 1; layers <= 32; layers++) {
+    if (aztecCapacityBits(layers, false) >= bits) {
+      // Full symbols add reference grid lines every 16 modules from the centre
+      const base = 14 + 4 * layers;
+      const size = base + 1 + 2 * Math.floor((base / 2 - 1) / 15);
+      return { fits: true, size: `${layers} layers (${size}x${size})`, used: bits / aztecCapacityBits(layers, false), overrides: {}, note: '' };
+    }
+  }
+  return beyondEstimate('azteccode', text, '32 layers (151x151)');
+}
+
+// ---- Public API ------------------------------------------------------------
+
+const ESTIMATORS = {
+  qrcode: estimateQr,
+  datamatrix: estimateDataMatrix,
+  pdf417: estimatePdf417,
+  azteccode: estimateAztec,
+};
+
+/**
+ * Predict the symbol size for a payload and pick the configuration to render
+ * @param {string} type - Barcode type
+ * @param {string} text
+ * @param {object} options - Rendering options (eclevel, securitylevel, logo)
+ * @returns {{fits: boolean, size?: string, used?: number, overrides?: object, note?: string, message?: string}|null}
+ *   overrides are option changes to apply (e.g. a raised eclevel); null for linear symbologies
+ */
+export function planSymbol(type, text, options = {}) {
+  const estimator = ESTIMATORS[type];
+  return estimator ? estimator(text, options) : null;
+}
+
+/**
+ * One-line summary of a plan for the UI
+ */
+export function describePlan(plan) {
+  if (!plan) return '';
+  if (!plan.fits) return `⚠️ ${plan.message}`;
+  const note = plan.note ? `; ${plan.note}` : '';
+  return `📐 ${plan.size}, ${Math.round(plan.used * 100)}% full${note}`;
+}
@@ -0,0 +1,284 @@
+/**
+ * Decode worker - Runs ZXing on rendered bitmaps off the main thread
+ *
+ * This is a classic worker so the UMD build of ZXing can be pulled in with
+ * importScripts; the library URL arrives in the 'init' message so it is kept
+ * in one place (loader.js). Requests carry an id and get exactly one reply:
+ * { id, result } or { id, error }.
+ */
+
+/* global ZXing */
+
+let libraryUrl = null;
+
+/**
+ * Load ZXing on first use
+ */
+function ensureLibrary() {
+  if (self.ZXing) return;
+  if (!libraryUrl) {
+    throw new Error('Decode worker used before init');
+  }
+  importScripts(libraryUrl);
+}
+
+/**
+ * Draw a bitmap onto a white canvas, optionally scaled and blurred, and return its pixels
+ * @param {ImageBitmap} bitmap
+ * @param {{scale?: number, blur?: number}} variant
+ * @returns {ImageData}
+ */
+function rasterize(bitmap, variant = {}) {
+  const scale = variant.scale || 1;
+  const width = Math.max(1, Math.round(bitmap.width * scale));
+  const height = Math.max(1, Math.round(bitmap.height * scale));
+
+  const canvas = new OffscreenCanvas(width, height);
+  const ctx = canvas.getContext('2d', { willReadFrequently: true });
+  ctx.fillStyle = '#fff';
+  ctx.fillRect(0, 0, width, height);
+  if (variant.blur) {
+    ctx.filter = `blur(${variant.blur}px)`;
+  }
+  ctx.drawImage(bitmap, 0, 0, width, height);
+  return ctx.getImageData(0, 0, width, height);
+}
+
+/**
+ * Convert RGBA pixels to 8-bit luminance (ITU-R BT.601 weights, integer math)
+ * @param {ImageData} imageData
+ * @returns {Uint8ClampedArray}
+ */
+function toLuminance(imageData) {
+  const { data, width, height } = imageData;
+  const luminance = new Uint8ClampedArray(width * height);
+  for (let i = 0, j = 0; j < luminance.length; i += 4, j++) {
+    luminance[j] = (data[i] * 306 + data[i + 1] * 601 + data[i + 2] * 117) >> 10;
+  }
+  return luminance;
+}
+
+/**
+ * Decode one code from pixels
+ * @param {ImageData} imageData
+ * @param {string[]} formats - ZXing.BarcodeFormat names; empty for all formats
+ * @returns {object|null} ZXing Result, or null when nothing was found
+ */
+function decodePixels(imageData, formats) {
+  const source = new ZXing.RGBLuminanceSource(toLuminance(imageData), imageData.width, imageData.height);
+  const binaryBitmap = new ZXing.BinaryBitmap(new ZXing.HybridBinarizer(source));
+
+  const hints = new Map();
+  hints.set(ZXing.DecodeHintType.TRY_HARDER, true);
+  if (formats.length > 0) {
+    hints.set(
+      ZXing.DecodeHintType.POSSIBLE_FORMATS,
+      formats.map((name) => ZXing.BarcodeFormat[name])
+    );
+  }
+
+  try {
+    return new ZXing.MultiFormatReader().decode(binaryBitmap, hints);
+  } catch (error) {
+    // NotFound, Checksum and Format exceptions all mean "did not scan"
+    return null;
+  }
+}
+
+/**
+ * Decode the bitmap as rendered, then degraded copies of it
+ * @param {object} message - { bitmap, formats, variants: [{name, scale?, blur?}] }
+ */
+function verify({ bitmap, formats = [], variants = [] }) {
+  ensureLibrary();
+
+  const start = performance.now();
+  const result = decodePixels(rasterize(bitmap), formats);
+  const decodeMs = performance.now() - start;
+  const text = result ? result.getText() : null;
+
+  // A variant passes when it still reads back the same text
+  const variantResults = variants.map((variant) => {
+    if (text === null) {
+      return { name: variant.name, ok: false };
+    }
+    const decoded = decodePixels(rasterize(bitmap, variant), formats);
+    return { name: variant.name, ok: !!decoded && decoded.getText() === text };
+  });
+
+  bitmap.close();
+
+  return {
+    text,
+    format: result ? ZXing.BarcodeFormat[result.getBarcodeFormat()] : null,
+    decodeMs,
+    variants: variantResults,
+  };
+}
+
+// Live decoding keeps one reader per format set, with its hints applied once
+const frameReaders = new Map();
+let frameCanvas = null;
+let regionCanvas = null;
+let localizer = null; // localizer.js, imported on the first request that locates codes
+const MAX_MULTIPLE = 12; // Regions tried per frame when reading every code in it
+
+function frameReader(formats) {
+  const key = formats.join();
+  if (!frameReaders.has(key)) {
+    const reader = new ZXing.MultiFormatReader();
+    const hints = new Map();
+    if (formats.length > 0) {
+      hints.set(
+        ZXing.DecodeHintType.POSSIBLE_FORMATS,
+        formats.map((name) => ZXing.BarcodeFormat[name])
+      );
+    }
+    reader.setHints(hints);
+    frameReaders.set(key, reader);
+  }
+  return frameReaders.get(key);
+}
+
+/**
+ * Macro PDF417 control block of a result, as plain data
+ */
+function macroMetadata(result) {
+  const metadata = result.getResultMetadata && result.getResultMetadata();
+  const macro = metadata && metadata.get(ZXing.ResultMetadataType.PDF417_EXTRA_METADATA);
+  if (!macro) return null;
+  return {
+    segmentIndex: macro.getSegmentIndex(),
+    fileId: macro.getFileId(),
+    segmentCount: macro.getSegmentCount ? macro.getSegmentCount() : -1,
+    lastSegment: macro.isLastSegment(),
+  };
+}
+
+/**
+ * Decode luminance with the reader for a format set
+ * @returns {object|null} ZXing Result, or null when nothing was found
+ */
+function decodeLuminance(luminance, width, height, formats) {
+  const source = new ZXing.RGBLuminanceSource(luminance, width, height);
+  const binaryBitmap = new ZXing.BinaryBitmap(new ZXing.HybridBinarizer(source));
+  try {
+    return frameReader(formats).decodeWithState(binaryBitmap);
+  } catch (error) {
+    return null; // Nothing readable here
+  }
+}
+
+/**
+ * Decode the regions the localizer finds in the frame on frameCanvas
+ * @param {boolean} multiple - Decode every region, not just up to the first that reads
+ * @returns {{decoded: Array<{result: object, region: object}>, candidates: number}} Regions that
+ *   decoded, and the number of regions found
+ */
+function decodeCandidates(luminance, width, height, formats, multiple) {
+  const small = localizer.downscaleLuminance(luminance, width, height);
+  const candidates = localizer.findCandidates(small, multiple ? MAX_MULTIPLE : undefined);
+  const decoded = [];
+  for (const candidate of candidates) {
+    const region = localizer.regionFor(candidate, small.scale);
+    if (!regionCanvas) {
+      regionCanvas = new OffscreenCanvas(region.width, region.height);
+    } else {
+      regionCanvas.width = region.width;
+      regionCanvas.height = region.height;
+    }
+    const ctx = regionCanvas.getContext('2d', { willReadFrequently: true });
+    localizer.drawRegion(ctx, frameCanvas, region);
+
+    const pixels = ctx.getImageData(0, 0, region.width, region.height);
+    const result = decodeLuminance(toLuminance(pixels), region.width, region.height, formats);
+    if (result) {
+      decoded.push({ result, region });
+      if (!multiple) break;
+    }
+  }
+  return { decoded, candidates: candidates.length };
+}
+
+/**
+ * Plain data for a result; points are mapped out of the region it was decoded from
+ */
+function plainResult(result, region) {
+  const points = (result.getResultPoints() || []).map((point) => ({ x: point.getX(), y: point.getY() }));
+  return {
+    text: result.getText(),
+    format: result.getBarcodeFormat(),
+    points: region ? points.map((point) => localizer.regionToFrame(point, region)) : points,
+    macro: macroMetadata(result),
+    located: !!region,
+  };
+}
+
+/**
+ * Decode one camera frame or uploaded image
+ *
+ * With locate set, the regions the localizer finds are decoded upright first,
+ * and the whole frame only if none of them reads. With multiple set, every
+ * region is decoded and so is the whole frame, to read all codes in view.
+ * @param {object} message - { bitmap, formats, locate, multiple }; formats are ZXing.BarcodeFormat
+ *   names, empty for all
+ * @returns {Promise<{results: Array<{text: string, format: number, points: Array<{x: number, y: number}>,
+ *   macro: object|null, located: boolean, decodeMs: number}>, candidates: number}>} Plain data (ZXing
+ *   objects cannot be posted), results empty when nothing was found; candidates is the number of
+ *   regions the localizer found, readable or not
+ */
+async function decode({ bitmap, formats = [], locate = false, multiple = false }) {
+  ensureLibrary();
+  if (locate && !localizer) {
+    localizer = await import('./localizer.js');
+  }
+  const start = performance.now();
+
+  const { width, height } = bitmap;
+  if (!frameCanvas) {
+    frameCanvas = new OffscreenCanvas(width, height);
+  } else if (frameCanvas.width !== width || frameCanvas.height !== height) {
+    frameCanvas.width = width;
+    frameCanvas.height = height;
+  }
+  const ctx = frameCanvas.getContext('2d', { willReadFrequently: true });
+  ctx.drawImage(bitmap, 0, 0);
+  bitmap.close();
+
+  const luminance = toLuminance(ctx.getImageData(0, 0, width, height));
+  const { decoded, candidates } = locate
+    ? decodeCandidates(luminance, width, height, formats, multiple)
+    : { decoded: [], candidates: 0 };
+  const results = decoded.map(({ result, region }) => plainResult(result, region));
+
+  if (results.length === 0 || multiple) {
+    const result = decodeLuminance(luminance, width, height, formats);
+    if (result && !results.some((found) => found.text === result.getText())) {
+      results.push(plainResult(result, null));
+    }
+  }
+
+  const decodeMs = performance.now() - start;
+  return { results: results.map((result) => ({ ...result, decodeMs })), candidates };
+}
+
+const handlers = { verify, decode };
+
+self.onmessage = async (event) => {
+  const { id, type } = event.data;
+
+  if (type === 'init') {
+    libraryUrl = event.data.libraryUrl;
+    return;
+  }
+
+  try {
+    const handler = handlers[type];
+    if (!handler) {
+      throw new Error(`Unknown request: ${type}`);
+    }
+    self.postMessage({ id, result: await handler(event.data) });
+  } catch (error) {
+    self.postMessage({ id, error: error.message || String(error) });
+  }
+};
@@ -0,0 +1,411 @@
+/**
+ * Decoder engines and per-device engine selection
+ *
+ * Every engine has the same contract, so the scanner does not care which one
+ * reads a frame:
+ *
+ *   name                      - 'zxing', 'native' or 'zxing-wasm'
+ *   available() -> boolean    - whether the engine can run on this device (async)
+ *   decode(bitmap, formats,   - resolves to an array of results
+ *          { multiple })        { text, format, points: [{x, y}], macro }; with multiple
+ *                               set, every code the engine can find, otherwise at least
+ *                               the first one
+ *
+ * decode takes ownership of the ImageBitmap (it is transferred or closed), and
+ * formats are ZXing.BarcodeFormat values. Engines differ a lot in speed from one
+ * device to the next, so a short calibration decodes the sample images in
+ * calibration/ with each available engine and picks the fastest one that reads
+ * them reliably. The choice is stored per device and only redone when the
+ * browser changes.
+ */
+import { DecodePool } from './DecodePool.js';
+import { loadLibrary } from './loader.js';
+import { createNativeDetector, nativeSupport, detectNative } from './nativeDetector.js';
+import { downscaleLuminance, findCandidates, regionFor, drawRegion, regionToFrame } from './localizer.js';
+
+const CALIBRATION_KEY = 'decoderCalibration';
+const MIN_ACCURACY = 0.8; // Share of the samples an engine must read to be chosen
+const CALIBRATION_RUNS = 3; // Timed decodes per sample
+const MAX_MULTIPLE = 12; // Localized regions tried per image when reading every code in it
+
+// Pre-rendered 640x480 frames, cached by the service worker, so calibrating
+// needs neither bwip-js nor the network
+const CALIBRATION_SAMPLES = [
+  { image: 'calibration/qrcode.png', format: 'QR_CODE', text: 'https://example.com/calibration' },
+  { image: 'calibration/code128.png', format: 'CODE_128', text: 'CAL-0123456789' },
+  { image: 'calibration/ean13.png', format: 'EAN_13', text: '5901234123457' },
+];
+
+/**
+ * Convert a ZXing Result to a plain result
+ * @returns {{text: string, format: number, points: Array<{x: number, y: number}>, macro: object|null}}
+ */
+export function scanFromResult(result) {
+  const metadata = result.getResultMetadata?.();
+  const macro = metadata?.get(ZXing.ResultMetadataType.PDF417_EXTRA_METADATA);
+  return {
+    text: result.getText(),
+    format: result.getBarcodeFormat(),
+    points: (result.getResultPoints() || []).map((point) => ({ x: point.getX(), y: point.getY() })),
+    macro: macro
+      ? {
+          segmentIndex: macro.getSegmentIndex(),
+          fileId: macro.getFileId(),
+          segmentCount: macro.getSegmentCount ? macro.getSegmentCount() : -1,
+          lastSegment: macro.isLastSegment(),
+        }
+      : null,
+  };
+}
+
+/**
+ * ZXing-js, in a decode worker where the browser can decode off the main thread
+ *
+ * One worker is enough: frames are sent one at a time, and the worker keeps
+ * its reader and format hints between frames and between scans. Browsers
+ * without OffscreenCanvas (or a worker that fails to start) decode here.
+ * Regions found by the localizer are decoded first, upright (see localizer.js).
+ */
+export class ZXingEngine {
+  constructor() {
+    this.name = 'zxing';
+    this.pool = null; // Created on first decode
+    this.useWorker = typeof OffscreenCanvas !== 'undefined';
+    this.locate = true; // Decode localized regions before the whole image
+    this.lastCandidates = 0; // Regions the localizer found in the last image, readable or not
+    this.readers = new Map(); // Main-thread readers by format set
+    this.canvas = null;
+    this.context = null;
+    this.regionCanvas = null;
+  }
+
+  async available() {
+    await loadLibrary('zxing');
+    return true;
+  }
+
+  async decode(bitmap, formats, { multiple = false } = {}) {
+    if (this.useWorker) {
+      try {
+        this.pool = this.pool || new DecodePool(1);
+        const names = formats.map((format) => ZXing.BarcodeFormat[format]);
+        const message = { type: 'decode', bitmap, formats: names, locate: this.locate, multiple };
+        const { results, candidates } = await this.pool.run(message, [bitmap]);
+        this.lastCandidates = candidates;
+        return results;
+      } catch (error) {
+        console.warn('Decode worker unavailable, decoding on the main thread:', error);
+        this.useWorker = false;
+        if (bitmap.width === 0) {
+          return []; // Transferred to the failed worker: the frame is gone
+        }
+      }
+    }
+    return this.decodeHere(bitmap, formats, multiple);
+  }
+
+  decodeHere(bitmap, formats, multiple) {
+    const { width, height } = bitmap;
+    if (!this.canvas) {
+      this.canvas = document.createElement('canvas');
+      this.context = this.canvas.getContext('2d', { willReadFrequently: true });
+    }
+    if (this.canvas.width !== width || this.canvas.height !== height) {
+      this.canvas.width = width;
+      this.canvas.height = height;
+    }
+    this.context.drawImage(bitmap, 0, 0);
+    bitmap.close();
+
+    const key = formats.join();
+    if (!this.readers.has(key)) {
+      const reader = new ZXing.MultiFormatReader();
+      const hints = new Map();
+      hints.set(ZXing.DecodeHintType.POSSIBLE_FORMATS, formats);
+      reader.setHints(hints);
+      this.readers.set(key, reader);
+    }
+    const reader = this.readers.get(key);
+
+    const scans = this.locate ? this.decodeCandidates(reader, multiple) : [];
+    if (scans.length === 0 || multiple) {
+      const result = this.decodeCanvas(reader, this.canvas);
+      if (result && !scans.some((scan) => scan.text === result.getText())) {
+        scans.push(scanFromResult(result));
+      }
+    }
+    return scans;
+  }
+
+  /**
+   * Decode the regions the localizer finds in the image on this.canvas, upright
+   * @param {boolean} multiple - Decode every region, not just up to the first that reads
+   */
+  decodeCandidates(reader, multiple) {
+    const { width, height } = this.canvas;
+    const { data } = this.context.getImageData(0, 0, width, height);
+    const luminance = new Uint8ClampedArray(width * height);
+    for (let i = 0, j = 0; j < luminance.length; i += 4, j++) {
+      luminance[j] = (data[i] * 306 + data[i + 1] * 601 + data[i + 2] * 117) >> 10;
+    }
+
+    const small = downscaleLuminance(luminance, width, height);
+    this.regionCanvas = this.regionCanvas || document.createElement('canvas');
+    const candidates = findCandidates(small, multiple ? MAX_MULTIPLE : undefined);
+    this.lastCandidates = candidates.length;
+    const scans = [];
+    for (const candidate of candidates) {
+      const region = regionFor(candidate, small.scale);
+      this.regionCanvas.width = region.width;
+      this.regionCanvas.height = region.height;
+      drawRegion(this.regionCanvas.getContext('2d'), this.canvas, region);
+
+      const result = this.decodeCanvas(reader, this.regionCanvas);
+      if (result) {
+        const scan = scanFromResult(result);
+        scans.push({ ...scan, points: scan.points.map((point) => regionToFrame(point, region)) });
+        if (!multiple) break;
+      }
+    }
+    return scans;
+  }
+
+  decodeCanvas(reader, canvas) {
+    try {
+      const source = new ZXing.HTMLCanvasElementLuminanceSource(canvas);
+      return reader.decodeWithState(new ZXing.BinaryBitmap(new ZXing.HybridBinarizer(source)));
+    } catch (error) {
+      // NotFound, Checksum and Format exceptions all mean "nothing readable here"
+      return null;
+    }
+  }
+}
+
+/**
+ * The browser's BarcodeDetector (see nativeDetector.js)
+ */
+export class NativeEngine {
+  constructor() {
+    this.name = 'native';
+    this.detectors = new Map(); // Format set -> Promise of createNativeDetector's result
+  }
+
+  async available() {
+    return (await nativeSupport()).length > 0;
+  }
+
+  /**
+   * The detector for a format set, created once per set
+   * @param {number[]} formats - ZXing.BarcodeFormat values
+   * @returns {Promise<{detector: BarcodeDetector, formats: number[], complete: boolean}|null>}
+   *   See createNativeDetector
+   */
+  detectorFor(formats) {
+    const key = formats.join();
+    if (!this.detectors.has(key)) {
+      this.detectors.set(key, createNativeDetector(formats));
+    }
+    return this.detectors.get(key);
+  }
+
+  async decode(bitmap, formats) {
+    const native = await this.detectorFor(formats);
+    try {
+      return native ? await detectNative(native, bitmap) : [];
+    } finally {
+      bitmap.close();
+    }
+  }
+}
+
+// ZXing.BarcodeFormat names -> zxing-wasm format names
+const WASM_FORMATS = {
+  AZTEC: 'Aztec',
+  CODABAR: 'Codabar',
+  CODE_39: 'Code39',
+  CODE_93: 'Code93',
+  CODE_128: 'Code128',
+  DATA_MATRIX: 'DataMatrix',
+  EAN_8: 'EAN-8',
+  EAN_13: 'EAN-13',
+  ITF: 'ITF',
+  PDF_417: 'PDF417',
+  QR_CODE: 'QRCode',
+  UPC_A: 'UPC-A',
+  UPC_E: 'UPC-E',
+};
+
+/**
+ * zxing-cpp compiled to WebAssembly (zxing-wasm), loaded only when it is calibrated or chosen
+ */
+export class ZXingWasmEngine {
+  constructor() {
+    this.name = 'zxing-wasm';
+    this.canvas = null;
+    this.context = null;
+  }
+
+  async available() {
+    if (typeof ZXingWASM === 'undefined' && navigator.onLine === false) {
+      return false; // Loaded from the CDN and not cached by the service worker
+    }
+    try {
+      await loadLibrary('zxingWasm');
+      return true;
+    } catch (error) {
+      return false; // Offline, or blocked
+    }
+  }
+
+  async decode(bitmap, formats) {
+    const { width, height } = bitmap;
+    if (!this.canvas) {
+      this.canvas = document.createElement('canvas');
+      this.context = this.canvas.getContext('2d', { willReadFrequently: true });
+    }
+    if (this.canvas.width !== width || this.canvas.height !== height) {
+      this.canvas.width = width;
+      this.canvas.height = height;
+    }
+    this.context.drawImage(bitmap, 0, 0);
+    bitmap.close();
+
+    const zxingNames = Object.fromEntries(Object.entries(WASM_FORMATS).map(([zxing, name]) => [name, zxing]));
+    const results = await ZXingWASM.readBarcodes(this.context.getImageData(0, 0, width, height), {
+      formats: formats.map((format) => WASM_FORMATS[ZXing.BarcodeFormat[format]]),
+      tryHarder: false,
+    });
+
+    return results
+      .filter((result) => result.isValid)
+      .map(({ text, format, position }) => ({
+        text,
+        format: ZXing.BarcodeFormat[zxingNames[format]],
+        points: [position.topLeft, position.topRight, position.bottomRight, position.bottomLeft],
+        macro: null,
+      }));
+  }
+}
+
+/**
+ * Create one of each engine
+ * @returns {Object<string, object>} Engines by name
+ */
+export function createEngines() {
+  return Object.fromEntries(
+    [new ZXingEngine(), new NativeEngine(), new ZXingWasmEngine()].map((engine) => [engine.name, engine])
+  );
+}
+
+/**
+ * Load the calibration sample images
+ * @returns {Promise<Array<{image: ImageBitmap, text: string}>>}
+ */
+async function loadSamples() {
+  return Promise.all(
+    CALIBRATION_SAMPLES.map(async ({ image, text }) => {
+      const response = await fetch(image);
+      if (!response.ok) {
+        throw new Error(`Calibration sample ${image}: ${response.status}`);
+      }
+      return { image: await createImageBitmap(await response.blob()), text };
+    })
+  );
+}
+
+/**
+ * Decode the samples with every available engine
+ *
+ * The samples are decoded with all of their formats enabled, so the result
+ * does not depend on the formats selected when calibration happened to run.
+ * @param {Object<string, object>} engines - From createEngines
+ * @returns {Promise<Object<string, {accuracy: number, medianMs: number}>>} Results of the available engines
+ */
+export async function calibrateEngines(engines) {
+  const samples = await loadSamples();
+  const formats = CALIBRATION_SAMPLES.map((sample) => ZXing.BarcodeFormat[sample.format]);
+  const results = {};
+
+  for (const engine of Object.values(engines)) {
+    if (!(await engine.available())) continue;
+
+    try {
+      // Untimed first decode: starts the worker or instantiates the module
+      await engine.decode(await createImageBitmap(samples[0].image), formats);
+
+      let read = 0;
+      const times = [];
+      for (const sample of samples) {
+        for (let run = 0; run < CALIBRATION_RUNS; run++) {
+          const bitmap = await createImageBitmap(sample.image);
+          const start = performance.now();
+          const scans = await engine.decode(bitmap, formats);
+          times.push(performance.now() - start);
+          if (run === 0 && scans.some((scan) => scan.text === sample.text)) read++;
+        }
+      }
+      times.sort((a, b) => a - b);
+      results[engine.name] = { accuracy: read / samples.length, medianMs: times[Math.floor(times.length / 2)] };
+    } catch (error) {
+      console.warn(`Calibration of the ${engine.name} decoder failed:`, error);
+    }
+  }
+  samples.forEach((sample) => sample.image.close());
+  return results;
+}
+
+/**
+ * The engine to decode with on this device, calibrating on first use
+ * @param {Object<string, object>} engines - From createEngines
+ * @returns {Promise<object>} The fastest engine that reads at least MIN_ACCURACY of the samples;
+ *   ZXing when none does
+ */
+export async function chooseEngine(engines) {
+  const cached = readCalibration();
+  if (cached && engines[cached.engine]) {
+    if (await engines[cached.engine].available()) {
+      return engines[cached.engine];
+    }
+  }
+
+  const results = await calibrateEngines(engines);
+  const name =
+    Object.entries(results)
+      .filter(([, result]) => result.accuracy >= MIN_ACCURACY)
+      .sort(([, a], [, b]) => a.medianMs - b.medianMs)
+      .map(([engineName]) => engineName)[0] || 'zxing';
+
+  // Offline, zxing-wasm could not take part: calibrate again once it can
+  if (navigator.onLine === false) {
+    return engines[name];
+  }
+  try {
+    localStorage.setItem(
+      CALIBRATION_KEY,
+      JSON.stringify({ engine: name, results, userAgent: navigator.userAgent, calibratedAt: Date.now() })
+    );
+  } catch (error) {
+    // Storage full or disabled: calibrate again next time
+  }
+  return engines[name];
+}
+
+/**
+ * The stored calibration, unless the browser has changed since
+ * @returns {{engine: string, results: object, userAgent: string, calibratedAt: number}|null}
+ */
+export function readCalibration() {
+  try {
+    const calibration = JSON.parse(localStorage.getItem(CALIBRATION_KEY));
+    return calibration && calibration.userAgent === navigator.userAgent ? calibration : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * Forget the stored calibration so the next scan calibrates again
+ */
+export function clearCalibration() {
+  localStorage.removeItem(CALIBRATION_KEY);
+}
@@ -0,0 +1,119 @@
+/**
+ * Format profile - which barcode formats this device actually scans
+ *
+ * With every format selected ZXing runs every reader on every frame, although
+ * a scanning station usually sees one or two symbologies. The profile counts
+ * the formats of scanned codes and is kept in localStorage, so it belongs to
+ * the device. On first use it is seeded from the saved scans. The scanner
+ * decodes most frames with the likely formats only and the full set
+ * periodically, so a new format is still read and then counted.
+ */
+
+import { stateManager } from './state.js';
+
+const PROFILE_KEY = 'formatProfile';
+const MIN_SCANS = 5; // Scans needed before the profile narrows the formats
+const MIN_SHARE = 0.05; // Formats below this share of scans are left to the full-set decodes
+const MAX_TOTAL = 500; // Counts are halved above this total, so old habits fade
+
+/**
+ * The format name in a scan history label such as "QR_CODE (animated, 12 frames)"
+ */
+function formatName(label) {
+  return String(label).split(' ')[0];
+}
+
+export class FormatProfile {
+  constructor() {
+    this.counts = this.load(); // ZXing.BarcodeFormat name -> scans
+  }
+
+  /**
+   * The stored counts, or counts seeded from saved scans when there are none yet
+   */
+  load() {
+    try {
+      const stored = JSON.parse(localStorage.getItem(PROFILE_KEY));
+      if (stored && stored.counts) {
+        return stored.counts;
+      }
+    } catch (error) {
+      // Unreadable profile: seed a new one
+    }
+
+    const counts = {};
+    for (const scan of this.savedScans()) {
+      if (scan.format) {
+        const name = formatName(scan.format);
+        counts[name] = (counts[name] || 0) + 1;
+      }
+    }
+    return counts;
+  }
+
+  savedScans() {
+    try {
+      return JSON.parse(localStorage.getItem(stateManager.get('storage.storageKey'))) || [];
+    } catch (error) {
+      return [];
+    }
+  }
+
+  save() {
+    try {
+      localStorage.setItem(PROFILE_KEY, JSON.stringify({ counts: this.counts, updatedAt: Date.now() }));
+    } catch (error) {
+      // Storage full or disabled: the profile lasts for this page only
+    }
+  }
+
+  /**
+   * Count a scanned code
+   * @param {string} format - Format label from scan history
+   */
+  record(format) {
+    const name = formatName(format);
+    this.counts[name] = (this.counts[name] || 0) + 1;
+    const total = Object.values(this.counts).reduce((sum, count) => sum + count, 0);
+    if (total > MAX_TOTAL) {
+      for (const [key, count] of Object.entries(this.counts)) {
+        const halved = Math.floor(count / 2);
+        if (halved > 0) {
+          this.counts[key] = halved;
+        } else {
+          delete this.counts[key];
+        }
+      }
+    }
+    this.save();
+  }
+
+  /**
+   * The formats worth trying first, most scanned first
+   * @param {number[]} formats - ZXing.BarcodeFormat values that may be decoded
+   * @returns {number[]|null} A subset of formats; null while the profile is too small to
+   *   narrow them down
+   */
+  likelyFormats(formats) {
+    const total = formats.reduce((sum, format) => sum + (this.counts[ZXing.BarcodeFormat[format]] || 0), 0);
+    if (total < MIN_SCANS) {
+      return null;
+    }
+
+    const likely = formats
+      .map((format) => ({ format, count: this.counts[ZXing.BarcodeFormat[format]] || 0 }))
+      .filter(({ count }) => count / total >= MIN_SHARE)
+      .sort((a, b) => b.count - a.count)
+      .map(({ format }) => format);
+    return likely.length < formats.length ? likely : null;
+  }
+
+  clear() {
+    this.counts = {};
+    try {
+      localStorage.removeItem(PROFILE_KEY);
+    } catch (error) {
+      // Nothing stored
+    }
+  }
+}
@@ -0,0 +1,383 @@
+/**
+ * Fountain-coded QR streams - Moves files through a looping sequence of QR frames
+ *
+ * The file is cut into fixed-size blocks and encoded with an LT (Luby
+ * Transform) code: every frame carries the XOR of a pseudo-random set of
+ * blocks, drawn from the robust soliton distribution with a PRNG seeded by the
+ * frame number. The sender can emit frames forever and the receiver can start
+ * at any point, miss frames and read them in any order; it is done once it has
+ * slightly more than one frame per block. The first pass over the blocks is
+ * sent uncoded (degree 1), so a clean capture finishes in about one loop.
+ *
+ * Frames are Base45 text (RFC 9285) so QR Codes encode them in alphanumeric
+ * mode, about 5.5 bits per character instead of 8 for byte mode.
+ *
+ * Packet layout (big-endian), before Base45:
+ *   0      format version (1)
+ *   1-4    file length in bytes
+ *   5-6    block size in bytes
+ *   7-10   CRC-32 of the file (also identifies the stream)
+ *   11-14  frame sequence number
+ *   15-    block data (XOR of the frame's blocks)
+ */
+import { crc32 } from './utils.js';
+
+export const FRAME_PREFIX = 'QF:';
+
+const FORMAT_VERSION = 1;
+const HEADER_SIZE = 15;
+
+// Robust soliton parameters: c tunes the expected ripple size, delta the failure probability
+const SOLITON_C = 0.1;
+const SOLITON_DELTA = 0.5;
+
+// ---- Base45 ----------------------------------------------------------------
+
+const BASE45_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:';
+const BASE45_VALUES = new Int8Array(128).fill(-1);
+for (let i = 0; i < BASE45_ALPHABET.length; i++) {
+  BASE45_VALUES[BASE45_ALPHABET.charCodeAt(i)] = i;
+}
+
+/**
+ * Encode bytes as Base45: each byte pair becomes three characters, a trailing byte two
+ * @param {Uint8Array} bytes
+ * @returns {string}
+ */
+export function base45Encode(bytes) {
+  let out = '';
+  let i = 0;
+  for (; i + 1 < bytes.length; i += 2) {
+    let value = bytes[i] * 256 + bytes[i + 1];
+    const c = value % 45;
+    value = (value - c) / 45;
+    out += BASE45_ALPHABET[c] + BASE45_ALPHABET[value % 45] + BASE45_ALPHABET[Math.floor(value / 45)];
+  }
+  if (i < bytes.length) {
+    const value = bytes[i];
+    out += BASE45_ALPHABET[value % 45] + BASE45_ALPHABET[Math.floor(value / 45)];
+  }
+  return out;
+}
+
+/**
+ * Decode Base45 text
+ * @param {string} text
+ * @returns {Uint8Array|null} null when the text is not valid Base45
+ */
+export function base45Decode(text) {
+  if (text.length % 3 === 1) return null;
+  const bytes = new Uint8Array(Math.floor(text.length / 3) * 2 + (text.length % 3 ? 1 : 0));
+  let j = 0;
+  for (let i = 0; i < text.length; i += 3) {
+    const remaining = Math.min(3, text.length - i);
+    let value = 0;
+    for (let k = remaining - 1; k >= 0; k--) {
+      const code = text.charCodeAt(i + k);
+      const digit = code < 128 ? BASE45_VALUES[code] : -1;
+      if (digit < 0) return null;
+      value = value * 45 + digit;
+    }
+    if (remaining === 3) {
+      if (value > 0xffff) return null;
+      bytes[j++] = value >> 8;
+      bytes[j++] = value & 0xff;
+    } else {
+      if (value > 0xff) return null;
+      bytes[j++] = value;
+    }
+  }
+  return bytes;
+}
+
+// ---- LT code ---------------------------------------------------------------
+
+/**
+ * Small seeded PRNG (mulberry32); sender and receiver derive the same sequence
+ * @param {number} seed - 32-bit integer
+ * @returns {() => number} Uniform values in [0, 1)
+ */
+export function seededRandom(seed) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * Cumulative robust soliton distribution over degrees 1..k
+ * @param {number} k - Number of source blocks
+ * @returns {Float64Array} cdf[d] = P(degree <= d)
+ */
+export function robustSoliton(k) {
+  const ripple = SOLITON_C * Math.log(k / SOLITON_DELTA) * Math.sqrt(k);
+  const spike = Math.max(1, Math.min(k, Math.floor(k / ripple)));
+
+  const weights = new Float64Array(k + 1);
+  let total = 0;
+  for (let d = 1; d <= k; d++) {
+    let weight = d === 1 ? 1 / k : 1 / (d * (d - 1)); // Ideal soliton
+    if (d < spike) weight += ripple / (d * k);
+    else if (d === spike) weight += (ripple * Math.log(ripple / SOLITON_DELTA)) / k;
+    weights[d] = Math.max(0, weight);
+    total += weights[d];
+  }
+
+  const cdf = new Float64Array(k + 1);
+  let sum = 0;
+  for (let d = 1; d <= k; d++) {
+    sum += weights[d] / total;
+    cdf[d] = sum;
+  }
+  cdf[k] = 1;
+  return cdf;
+}
+
+/**
+ * Source blocks combined into a frame; identical on both sides
+ * @param {number} seq - Frame sequence number
+ * @param {number} k - Number of source blocks
+ * @param {number} checksum - File CRC-32, so different files use different sequences
+ * @param {Float64Array} cdf - From robustSoliton(k)
+ * @returns {number[]}
+ */
+export function frameBlocks(seq, k, checksum, cdf) {
+  if (seq < k) {
+    return [seq]; // Systematic first pass
+  }
+
+  const random = seededRandom(checksum ^ Math.imul(seq, 0x9e3779b1));
+  const sample = random();
+  let degree = 1;
+  while (degree < k && cdf[degree] < sample) degree++;
+
+  const blocks = new Set();
+  while (blocks.size < degree) {
+    blocks.add(Math.floor(random() * k));
+  }
+  return [...blocks];
+}
+
+function xorInto(target, source) {
+  for (let i = 0; i < source.length; i++) {
+    target[i] ^= source[i];
+  }
+}
+
+/**
+ * Produces an endless stream of frames for one file
+ */
+export class FountainEncoder {
+  /**
+   * @param {Uint8Array} data - File contents
+   * @param {number} blockSize - Bytes per frame
+   */
+  constructor(data, blockSize = 400) {
+    if (data.length === 0) {
+      throw new Error('Nothing to send');
+    }
+    this.data = data;
+    this.blockSize = blockSize;
+    this.k = Math.ceil(data.length / blockSize);
+    this.checksum = crc32(data);
+    this.cdf = robustSoliton(this.k);
+    this.seq = 0;
+  }
+
+  /**
+   * Build a frame
+   * @param {number} seq - Sequence number; defaults to the next one
+   * @returns {string} QR payload text
+   */
+  frame(seq = this.seq++) {
+    const packet = new Uint8Array(HEADER_SIZE + this.blockSize);
+    const view = new DataView(packet.buffer);
+    view.setUint8(0, FORMAT_VERSION);
+    view.setUint32(1, this.data.length);
+    view.setUint16(5, this.blockSize);
+    view.setUint32(7, this.checksum);
+    view.setUint32(11, seq);
+
+    const payload = packet.subarray(HEADER_SIZE);
+    for (const block of frameBlocks(seq, this.k, this.checksum, this.cdf)) {
+      const start = block * this.blockSize;
+      // The last block is zero-padded
+      xorInto(payload, this.data.subarray(start, start + this.blockSize));
+    }
+    return FRAME_PREFIX + base45Encode(packet);
+  }
+}
+
+/**
+ * Parse QR text as a fountain frame
+ * @param {string} text
+ * @returns {{length: number, blockSize: number, checksum: number, seq: number, payload: Uint8Array}|null}
+ */
+export function parseFrame(text) {
+  if (!text.startsWith(FRAME_PREFIX)) return null;
+  const packet = base45Decode(text.slice(FRAME_PREFIX.length));
+  if (!packet || packet.length <= HEADER_SIZE || packet[0] !== FORMAT_VERSION) return null;
+
+  const view = new DataView(packet.buffer);
+  const blockSize = view.getUint16(5);
+  if (packet.length !== HEADER_SIZE + blockSize) return null;
+  return {
+    length: view.getUint32(1),
+    blockSize,
+    checksum: view.getUint32(7),
+    seq: view.getUint32(11),
+    payload: packet.subarray(HEADER_SIZE),
+  };
+}
+
+/**
+ * Rebuilds a file from frames received in any order (peeling / belief propagation)
+ */
+export class FountainDecoder {
+  constructor() {
+    this.reset();
+  }
+
+  reset() {
+    this.checksum = null;
+    this.length = 0;
+    this.k = 0;
+    this.blocks = [];
+    this.decodedCount = 0;
+    this.pending = new Map(); // block index -> Set of frames still waiting on it
+    this.seen = new Set();
+    this.startTime = 0;
+    this.result = null;
+  }
+
+  /**
+   * Add a frame
+   * @param {object} frame - From parseFrame
+   * @returns {{complete: boolean, duplicate: boolean, decoded: number, blocks: number,
+   *   frames: number, bytes: number, elapsedMs: number, data?: Uint8Array}}
+   */
+  receive(frame) {
+    // A frame from a different file starts over
+    if (frame.checksum !== this.checksum) {
+      this.reset();
+      this.checksum = frame.checksum;
+      this.length = frame.length;
+      this.blockSize = frame.blockSize;
+      this.k = Math.ceil(frame.length / frame.blockSize);
+      this.blocks = new Array(this.k).fill(null);
+      this.cdf = robustSoliton(this.k);
+      this.startTime = performance.now();
+    }
+
+    const duplicate = this.seen.has(frame.seq) || this.result !== null;
+    if (!duplicate) {
+      this.seen.add(frame.seq);
+      this.addFrame(frame);
+    }
+    return this.status(duplicate);
+  }
+
+  addFrame(frame) {
+    const data = new Uint8Array(frame.payload);
+    const unknown = new Set();
+    for (const block of frameBlocks(frame.seq, this.k, this.checksum, this.cdf)) {
+      if (this.blocks[block]) {
+        xorInto(data, this.blocks[block]);
+      } else {
+        unknown.add(block);
+      }
+    }
+
+    if (unknown.size === 1) {
+      this.solve(unknown.values().next().value, data);
+    } else if (unknown.size > 1) {
+      const entry = { unknown, data };
+      unknown.forEach((block) => {
+        if (!this.pending.has(block)) this.pending.set(block, new Set());
+        this.pending.get(block).add(entry);
+      });
+    }
+  }
+
+  /**
+   * Record a decoded block and peel it out of every frame that contains it
+   */
+  solve(index, data) {
+    const ripple = [[index, data]];
+    while (ripple.length > 0) {
+      const [block, value] = ripple.pop();
+      if (this.blocks[block]) continue;
+      this.blocks[block] = value;
+      this.decodedCount++;
+
+      const waiting = this.pending.get(block);
+      if (!waiting) continue;
+      this.pending.delete(block);
+      waiting.forEach((entry) => {
+        xorInto(entry.data, value);
+        entry.unknown.delete(block);
+        if (entry.unknown.size === 1) {
+          const last = entry.unknown.values().next().value;
+          this.pending.get(last)?.delete(entry);
+          ripple.push([last, entry.data]);
+        }
+      });
+    }
+
+    if (this.decodedCount === this.k) {
+      this.finish();
+    }
+  }
+
+  finish() {
+    const data = new Uint8Array(this.k * this.blockSize);
+    this.blocks.forEach((block, i) => data.set(block, i * this.blockSize));
+    const file = data.subarray(0, this.length);
+
+    if (crc32(file) !== this.checksum) {
+      // A misread frame slipped through; start collecting again
+      const checksum = this.checksum;
+      this.reset();
+      throw new Error(`Animated QR checksum mismatch (stream ${checksum.toString(16)}); rescanning`);
+    }
+    this.result = file;
+  }
+
+  status(duplicate = false) {
+    return {
+      complete: this.result !== null,
+      duplicate,
+      decoded: this.decodedCount,
+      blocks: this.k,
+      frames: this.seen.size,
+      bytes: this.length || 0,
+      elapsedMs: this.startTime ? performance.now() - this.startTime : 0,
+      data: this.result || undefined,
+    };
+  }
+}
+
+/**
+ * Progress line for the scanner
+ * @param {object} status - Return value of FountainDecoder.receive
+ * @returns {string}
+ */
+export function describeTransfer(status) {
+  const seconds = status.elapsedMs / 1000;
+  const rate = seconds > 0 ? Math.round((status.bytes * (status.decoded / status.blocks)) / seconds) : 0;
+  const overhead = status.blocks ? (status.frames / status.blocks).toFixed(2) : '0';
+  if (status.complete) {
+    return (
+      `✅ Received ${status.bytes} bytes in ${seconds.toFixed(1)} s (${Math.round(status.bytes / seconds)} B/s); ` +
+      `${status.frames} frames for ${status.blocks} blocks (${overhead}x)`
+    );
+  }
+  return (
+    `🎞️ Animated QR: ${status.decoded}/${status.blocks} blocks from ${status.frames} frames, ` +
+    `${rate} B/s so far`
+  );
+}
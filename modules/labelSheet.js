@@ -0,0 +1,169 @@
+/**
+ * Label sheet layout - Tiles barcode symbols onto printable label pages
+ *
+ * Each unique symbol is emitted once as a <symbol> in <defs> and placed into
+ * label cells with <use>, so a sheet of hundreds of codes stays one small SVG
+ * per page instead of hundreds of embedded SVG documents.
+ */
+
+/**
+ * Standard label sheet templates (all dimensions in millimetres)
+ */
+export const LABEL_TEMPLATES = {
+  avery5160: {
+    name: 'Avery 5160 (3 x 10, Letter)',
+    pageWidth: 215.9,
+    pageHeight: 279.4,
+    columns: 3,
+    rows: 10,
+    labelWidth: 66.675,
+    labelHeight: 25.4,
+    marginTop: 12.7,
+    marginLeft: 4.7625,
+    gutterX: 3.175,
+    gutterY: 0,
+  },
+  avery5167: {
+    name: 'Avery 5167 (4 x 20, Letter)',
+    pageWidth: 215.9,
+    pageHeight: 279.4,
+    columns: 4,
+    rows: 20,
+    labelWidth: 44.45,
+    labelHeight: 12.7,
+    marginTop: 12.7,
+    marginLeft: 7.62,
+    gutterX: 7.62,
+    gutterY: 0,
+  },
+  averyL7651: {
+    name: 'Avery L7651 (5 x 13, A4)',
+    pageWidth: 210,
+    pageHeight: 297,
+    columns: 5,
+    rows: 13,
+    labelWidth: 38.1,
+    labelHeight: 21.2,
+    marginTop: 10.7,
+    marginLeft: 4.75,
+    gutterX: 2.5,
+    gutterY: 0,
+  },
+};
+
+const DEFAULT_LAYOUT = {
+  padding: 1.5, // Quiet space inside each label
+  captions: true,
+  captionSize: 2.5, // Caption font size
+  outlines: false, // Draw label borders, useful for printer alignment
+  defs: '', // Shared definitions referenced from symbol content (e.g. an overlay logo)
+};
+
+/**
+ * Split bwip-js SVG output into the parts a <symbol> needs
+ * @param {string} svg - Output of bwipjs.toSVG
+ * @returns {{viewBox: string, content: string}}
+ */
+export function parseBwipSvg(svg) {
+  const viewBoxMatch = svg.match(/viewBox="([^"]+)"/);
+  const openEnd = svg.indexOf('>', svg.indexOf('<svg'));
+  const closeStart = svg.lastIndexOf('</svg>');
+
+  if (!viewBoxMatch || openEnd < 0 || closeStart < 0) {
+    throw new Error('Unrecognized SVG output');
+  }
+
+  return {
+    viewBox: viewBoxMatch[1],
+    content: svg.slice(openEnd + 1, closeStart).trim(),
+  };
+}
+
+/**
+ * Escape text for use in SVG markup
+ */
+function escapeXml(text) {
+  return String(text)
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
+/**
+ * Round a coordinate so page markup stays compact
+ */
+function mm(value) {
+  return Math.round(value * 1000) / 1000;
+}
+
+/**
+ * Lay out symbols onto label pages
+ * @param {object} template - Entry of LABEL_TEMPLATES, optionally with overridden margins/gutters
+ * @param {Array<{viewBox: string, content: string}>} symbols - Unique symbols
+ * @param {Array<{symbol: number, caption?: string}>} cells - One entry per label, in fill order
+ * @param {object} options - padding, captions, captionSize, outlines, defs
+ * @returns {string[]} One SVG document per page
+ */
+export function composeLabelSheet(template, symbols, cells, options = {}) {
+  const layout = { ...DEFAULT_LAYOUT, ...options };
+  const perPage = template.columns * template.rows;
+  const pitchX = template.labelWidth + template.gutterX;
+  const pitchY = template.labelHeight + template.gutterY;
+
+  const captionHeight = layout.captions ? layout.captionSize * 1.4 : 0;
+  const symbolWidth = template.labelWidth - 2 * layout.padding;
+  const symbolHeight = template.labelHeight - 2 * layout.padding - captionHeight;
+
+  if (symbolWidth <= 0 || symbolHeight <= 0) {
+    throw new Error('Label padding and caption leave no room for the barcode');
+  }
+
+  const pages = [];
+  for (let start = 0; start < cells.length; start += perPage) {
+    const pageCells = cells.slice(start, start + perPage);
+
+    // Only the symbols used on this page are defined on it
+    const used = [...new Set(pageCells.map((cell) => cell.symbol))];
+    const defs = used.map(
+      (index) => `<symbol id="s${index}" viewBox="${symbols[index].viewBox}">${symbols[index].content}</symbol>`
+    );
+
+    const uses = [];
+    const captions = [];
+    const outlines = [];
+
+    pageCells.forEach((cell, i) => {
+      const x = template.marginLeft + (i % template.columns) * pitchX;
+      const y = template.marginTop + Math.floor(i / template.columns) * pitchY;
+
+      // <use> scales the symbol into the box and centres it (preserveAspectRatio defaults to meet)
+      uses.push(
+        `<use href="#s${cell.symbol}" x="${mm(x + layout.padding)}" y="${mm(y + layout.padding)}" width="${mm(symbolWidth)}" height="${mm(symbolHeight)}"/>`
+      );
+
+      if (layout.captions && cell.caption) {
+        captions.push(
+          `<text x="${mm(x + template.labelWidth / 2)}" y="${mm(y + template.labelHeight - layout.padding)}">${escapeXml(cell.caption)}</text>`
+        );
+      }
+
+      if (layout.outlines) {
+        outlines.push(`M${mm(x)} ${mm(y)}h${mm(template.labelWidth)}v${mm(template.labelHeight)}h${mm(-template.labelWidth)}z`);
+      }
+    });
+
+    pages.push(
+      `<svg xmlns="http://www.w3.org/2000/svg" width="${template.pageWidth}mm" height="${template.pageHeight}mm" viewBox="0 0 ${template.pageWidth} ${template.pageHeight}">` +
+        `<defs>${layout.defs}${defs.join('')}</defs>` +
+        uses.join('') +
+        (captions.length
+          ? `<g font-family="monospace" font-size="${layout.captionSize}" text-anchor="middle">${captions.join('')}</g>`
+          : '') +
+        (outlines.length ? `<path fill="none" stroke="#ccc" stroke-width="0.1" d="${outlines.join('')}"/>` : '') +
+        '</svg>'
+    );
+  }
+
+  return pages;
+}
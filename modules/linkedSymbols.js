@@ -0,0 +1,406 @@
+/**
+ * Linked symbols - Splits payloads that are too large for one symbol and reassembles them
+ *
+ * PDF417 uses Macro PDF417: every part carries a control block (segment index,
+ * file ID, segment count, last-segment flag) that standard decoders report as
+ * result metadata. The codewords are built here and handed to bwip-js as raw
+ * codewords, since bwip-js has no macro option.
+ *
+ * bwip-js cannot produce QR Code Structured Append, so QR parts carry a short
+ * header instead: "SA/<file id>/<part>/<total>/" followed by the data. The
+ * header only uses QR alphanumeric characters, so alphanumeric payloads stay in
+ * the compact alphanumeric mode.
+ */
+import { qrVersionFor } from './capacity.js';
+import { parseBwipSvg } from './labelSheet.js';
+
+export const LINKED_TYPES = ['qrcode', 'pdf417'];
+
+// Parts are kept to moderate sizes so each one renders and decodes quickly
+const MAX_QR_VERSION = 20;
+const MAX_QR_PART_CHARACTERS = 1852; // Version 20-L, numeric
+const MAX_PDF417_CODEWORDS = 500;
+const MAX_PARTS = 99;
+
+// Layout: gap between symbols and caption height, in symbol pixels / SVG units
+const LAYOUT_GAP = 16;
+const CAPTION_SIZE = 14;
+
+const QR_HEADER = /^SA\/([0-9A-F]{4})\/(\d{2})\/(\d{2})\//;
+const QR_HEADER_LENGTH = 'SA/0000/00/00/'.length;
+
+// PDF417 codewords (ISO 15438)
+const BYTE_LATCH = 901;
+const BYTE_LATCH_6 = 924; // Byte compaction, length a multiple of 6
+const ECI_CHARSET = 927;
+const ECI_UTF8 = 26;
+const MACRO_BEGIN = 928;
+const MACRO_OPTIONAL_FIELD = 923;
+const MACRO_SEGMENT_COUNT = 1;
+const MACRO_TERMINATOR = 922;
+const PAD = 900;
+
+const textEncoder = new TextEncoder();
+
+/**
+ * Random file ID shared by all parts of one payload
+ * @returns {number} 0-65535
+ */
+function newFileId() {
+  return crypto.getRandomValues(new Uint16Array(1))[0];
+}
+
+/**
+ * UTF-8 size of the character at index i
+ * @returns {[number, number]} Bytes, and UTF-16 code units the character spans
+ */
+function charSize(text, i) {
+  const code = text.charCodeAt(i);
+  if (code < 0x80) return [1, 1];
+  if (code < 0x800) return [2, 1];
+  if (code >= 0xd800 && code <= 0xdbff) return [4, 2];
+  return [3, 1];
+}
+
+/**
+ * Move a split point off the second half of a surrogate pair
+ */
+function safeSplit(text, end) {
+  const code = text.charCodeAt(end - 1);
+  return code >= 0xd800 && code <= 0xdbff ? end - 1 : end;
+}
+
+// ---- QR Code ---------------------------------------------------------------
+
+function qrHeader(fileId, part, total) {
+  const pad = (value) => String(value).padStart(2, '0');
+  return `SA/${fileId.toString(16).toUpperCase().padStart(4, '0')}/${pad(part)}/${pad(total)}/`;
+}
+
+/**
+ * Longest prefix of text (from start) that fits the part size limit
+ */
+function qrChunkEnd(text, start, eclevel) {
+  const header = 'SA/0000/00/00/';
+  const fits = (end) => {
+    const version = qrVersionFor(header + text.slice(start, end), eclevel);
+    return version > 0 && version <= MAX_QR_VERSION;
+  };
+
+  let low = start + 1;
+  let high = Math.min(text.length, start + MAX_QR_PART_CHARACTERS);
+  if (fits(high)) return high;
+  while (low < high) {
+    const middle = Math.ceil((low + high) / 2);
+    if (fits(middle)) low = middle;
+    else high = middle - 1;
+  }
+  return safeSplit(text, low);
+}
+
+function splitQr(text, options) {
+  const eclevel = options.eclevel || 'M';
+  const chunks = [];
+  for (let start = 0; start < text.length; ) {
+    const end = qrChunkEnd(text, start, eclevel);
+    chunks.push(text.slice(start, end));
+    start = end;
+  }
+
+  const fileId = newFileId();
+  return chunks.map((chunk, i) => ({
+    type: 'qrcode',
+    text: qrHeader(fileId, i + 1, chunks.length) + chunk,
+    options: { ...options },
+  }));
+}
+
+// ---- PDF417 ----------------------------------------------------------------
+
+/**
+ * Byte compaction: 6 bytes -> 5 base-900 codewords, leftover bytes one codeword each
+ * @param {Uint8Array} bytes
+ * @returns {number[]}
+ */
+function byteCompaction(bytes) {
+  const codewords = [bytes.length % 6 === 0 ? BYTE_LATCH_6 : BYTE_LATCH];
+  let i = 0;
+  for (; i + 6 <= bytes.length; i += 6) {
+    // 48-bit value, exact in a double
+    let value = 0;
+    for (let j = 0; j < 6; j++) {
+      value = value * 256 + bytes[i + j];
+    }
+    const group = [];
+    for (let j = 0; j < 5; j++) {
+      group.unshift(value % 900);
+      value = Math.floor(value / 900);
+    }
+    codewords.push(...group);
+  }
+  for (; i < bytes.length; i++) {
+    codewords.push(bytes[i]);
+  }
+  return codewords;
+}
+
+function byteCompactionLength(byteCount) {
+  return 1 + Math.floor(byteCount / 6) * 5 + (byteCount % 6);
+}
+
+/**
+ * Numeric compaction of a small number, as used by the macro control block
+ * (decimal digits prefixed with 1, converted to base 900)
+ */
+function numericCodewords(digits) {
+  let value = Number('1' + digits);
+  const codewords = [];
+  while (value > 0) {
+    codewords.unshift(value % 900);
+    value = Math.floor(value / 900);
+  }
+  return codewords;
+}
+
+function macroControlBlock(segmentIndex, fileId, segmentCount) {
+  const block = [MACRO_BEGIN, ...numericCodewords(String(segmentIndex).padStart(5, '0'))];
+  block.push(Math.floor(fileId / 900) % 900, fileId % 900);
+  block.push(MACRO_OPTIONAL_FIELD, MACRO_SEGMENT_COUNT, ...numericCodewords(String(segmentCount)));
+  if (segmentIndex === segmentCount - 1) {
+    block.push(MACRO_TERMINATOR);
+  }
+  return block;
+}
+
+/**
+ * Rows and columns for a symbol of `total` codewords (data, length descriptor, ECC),
+ * aiming for a roughly square symbol
+ */
+function pdf417Geometry(total) {
+  let columns = Math.min(30, Math.max(1, Math.round(Math.sqrt(total / 6))));
+  while (Math.ceil(total / columns) > 90) columns++;
+  const rows = Math.max(3, Math.ceil(total / columns));
+  return { columns, rows };
+}
+
+function splitPdf417(text, options) {
+  const securitylevel = Number.isFinite(options.securitylevel) ? options.securitylevel : 2;
+  const ecc = 2 ** (securitylevel + 1);
+  const eci = /[^\x00-\x7f]/.test(text) ? [ECI_CHARSET, ECI_UTF8] : [];
+  // Length descriptor, ECC, ECI and the largest control block (with terminator)
+  const budget = MAX_PDF417_CODEWORDS - 1 - ecc - eci.length - 12;
+
+  const chunks = [];
+  let start = 0;
+  while (start < text.length) {
+    let end = start;
+    let bytes = 0;
+    while (end < text.length) {
+      const [size, units] = charSize(text, end);
+      if (byteCompactionLength(bytes + size) > budget) break;
+      bytes += size;
+      end += units;
+    }
+    if (end === start) {
+      throw new Error('PDF417 security level too high to split this payload');
+    }
+    chunks.push(text.slice(start, end));
+    start = end;
+  }
+
+  const fileId = newFileId();
+  return chunks.map((chunk, index) => {
+    const data = [...eci, ...byteCompaction(textEncoder.encode(chunk))];
+    const control = macroControlBlock(index, fileId, chunks.length);
+    const { columns, rows } = pdf417Geometry(data.length + control.length + 1 + ecc);
+
+    // Pad before the control block so it stays the last data in the symbol
+    const padding = rows * columns - (data.length + control.length + 1 + ecc);
+    const codewords = [...data, ...new Array(padding).fill(PAD), ...control];
+
+    return {
+      type: 'pdf417',
+      text: codewords.map((codeword) => '^' + String(codeword).padStart(3, '0')).join(''),
+      options: {
+        ...options,
+        bwip: { raw: true, columns, rows, eclevel: securitylevel },
+      },
+    };
+  });
+}
+
+// ---- Public API ------------------------------------------------------------
+
+/**
+ * Split a payload into linked symbols
+ * @param {string} type - 'qrcode' or 'pdf417'
+ * @param {string} text
+ * @param {object} options - Rendering options (see barcodeCore DEFAULT_OPTIONS)
+ * @returns {Array<{type: string, text: string, options: object}>} One render request per part
+ */
+export function splitPayload(type, text, options = {}) {
+  if (!LINKED_TYPES.includes(type)) {
+    throw new Error(`Linked symbols are not supported for ${type}`);
+  }
+  const parts = type === 'qrcode' ? splitQr(text, options) : splitPdf417(text, options);
+  if (parts.length > MAX_PARTS) {
+    throw new Error(`Payload needs ${parts.length} linked symbols (max ${MAX_PARTS})`);
+  }
+  return parts;
+}
+
+/**
+ * Grid positions for parts of the given sizes, roughly square overall
+ * @param {Array<{width: number, height: number}>} sizes
+ * @returns {{width: number, height: number, cells: Array<{x: number, y: number, width: number, height: number}>}}
+ */
+function gridLayout(sizes) {
+  const columns = Math.ceil(Math.sqrt(sizes.length));
+  const cellWidth = Math.max(...sizes.map((size) => size.width)) + LAYOUT_GAP;
+  const cellHeight = Math.max(...sizes.map((size) => size.height)) + LAYOUT_GAP + CAPTION_SIZE;
+  const rows = Math.ceil(sizes.length / columns);
+
+  return {
+    width: columns * cellWidth + LAYOUT_GAP,
+    height: rows * cellHeight + LAYOUT_GAP,
+    cells: sizes.map((size, i) => ({
+      x: LAYOUT_GAP + (i % columns) * cellWidth,
+      y: LAYOUT_GAP + Math.floor(i / columns) * cellHeight,
+      width: size.width,
+      height: size.height,
+    })),
+  };
+}
+
+/**
+ * Draw rendered parts side by side, each captioned "part/total", on a white background
+ * @param {ImageBitmap[]} bitmaps - In part order; closed once drawn
+ * @param {HTMLCanvasElement|OffscreenCanvas} canvas
+ * @returns {HTMLCanvasElement|OffscreenCanvas}
+ */
+export function drawLinkedLayout(bitmaps, canvas) {
+  const layout = gridLayout(bitmaps);
+  canvas.width = layout.width;
+  canvas.height = layout.height;
+
+  const ctx = canvas.getContext('2d');
+  ctx.fillStyle = '#fff';
+  ctx.fillRect(0, 0, layout.width, layout.height);
+  ctx.fillStyle = '#000';
+  ctx.font = `${CAPTION_SIZE}px monospace`;
+  ctx.textAlign = 'center';
+  ctx.textBaseline = 'top';
+
+  layout.cells.forEach((cell, i) => {
+    ctx.drawImage(bitmaps[i], cell.x, cell.y);
+    ctx.fillText(`${i + 1}/${bitmaps.length}`, cell.x + cell.width / 2, cell.y + cell.height + 2);
+    bitmaps[i].close();
+  });
+  return canvas;
+}
+
+/**
+ * Combine part SVGs into one document, laid out like drawLinkedLayout
+ * @param {string[]} svgs - bwip-js SVG markup, in part order
+ * @returns {string}
+ */
+export function layoutLinkedSvg(svgs) {
+  const symbols = svgs.map((svg) => {
+    const { viewBox, content } = parseBwipSvg(svg);
+    const [, , width, height] = viewBox.split(/[\s,]+/).map(Number);
+    return { viewBox, content, width, height };
+  });
+  const layout = gridLayout(symbols);
+
+  const parts = layout.cells.map((cell, i) => {
+    const caption = `<text x="${cell.x + cell.width / 2}" y="${cell.y + cell.height + 2 + CAPTION_SIZE}">${i + 1}/${symbols.length}</text>`;
+    return (
+      `<svg x="${cell.x}" y="${cell.y}" width="${cell.width}" height="${cell.height}" viewBox="${symbols[i].viewBox}">` +
+      `${symbols[i].content}</svg>${caption}`
+    );
+  });
+
+  return (
+    `<svg xmlns="http://www.w3.org/2000/svg" width="${layout.width}" height="${layout.height}" viewBox="0 0 ${layout.width} ${layout.height}">` +
+    `<rect width="100%" height="100%" fill="#fff"/>` +
+    `<g font-family="monospace" font-size="${CAPTION_SIZE}" text-anchor="middle">${parts.join('')}</g>` +
+    '</svg>'
+  );
+}
+
+/**
+ * Recognise one part of a linked payload in a scan result
+ * @param {{text: string, macro: object|null}} scan - Normalized scan result; macro is the
+ *   Macro PDF417 control block ({segmentIndex, fileId, segmentCount, lastSegment})
+ * @returns {{id: string, part: number, total: number|null, data: string}|null} part is 1-based;
+ *   total is null when only the last part announces the count
+ */
+export function parseLinkedPart({ text, macro = null }) {
+  if (macro) {
+    const part = macro.segmentIndex + 1;
+    return {
+      id: `pdf417:${macro.fileId}`,
+      part,
+      total: macro.segmentCount > 0 ? macro.segmentCount : macro.lastSegment ? part : null,
+      data: text,
+    };
+  }
+
+  const header = QR_HEADER.exec(text);
+  if (header) {
+    return {
+      id: `qr:${header[1]}`,
+      part: Number(header[2]),
+      total: Number(header[3]),
+      data: text.slice(QR_HEADER_LENGTH),
+    };
+  }
+  return null;
+}
+
+/**
+ * Collects parts of linked payloads, in any order, until each is complete
+ */
+export class LinkedSymbolAssembler {
+  constructor() {
+    this.payloads = new Map(); // id -> { parts: Map(part -> data), total }
+  }
+
+  /**
+   * Add a part
+   * @param {object} part - Return value of parseLinkedPart
+   * @returns {{complete: boolean, received: number, total: number|null, text?: string}}
+   *   text is the reassembled payload once complete
+   */
+  add({ id, part, total, data }) {
+    let payload = this.payloads.get(id);
+    if (!payload) {
+      payload = { parts: new Map(), total: null };
+      this.payloads.set(id, payload);
+    }
+    payload.parts.set(part, data);
+    if (total) payload.total = total;
+
+    const received = payload.parts.size;
+    let text = '';
+    for (let i = 1; i <= (payload.total || 0); i++) {
+      if (!payload.parts.has(i)) {
+        text = null;
+        break;
+      }
+      text += payload.parts.get(i);
+    }
+    if (!payload.total || text === null) {
+      return { complete: false, received, total: payload.total };
+    }
+    this.payloads.delete(id);
+    return { complete: true, received, total: payload.total, text };
+  }
+
+  /**
+   * Forget all partially received payloads
+   */
+  clear() {
+    this.payloads.clear();
+  }
+}
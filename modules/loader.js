@@ -0,0 +1,117 @@
+/**
+ * On-demand loading of the third-party barcode libraries
+ *
+ * The encoder (bwip-js) and decoder (ZXing) are large, and each tab needs only
+ * one of them. Libraries are injected when a tab first needs them; the other
+ * one is prefetched into the HTTP cache during idle time so switching tabs later
+ * does not wait on the network.
+ */
+
+export const LIBRARIES = {
+  bwipjs: {
+    url: 'https://unpkg.com/bwip-js/dist/bwip-js-min.js',
+    global: 'bwipjs',
+  },
+  zxing: {
+    url: 'https://unpkg.com/@zxing/library@latest',
+    global: 'ZXing',
+  },
+  // Optional decoder engine (zxing-cpp in WebAssembly); only loaded when calibrated or chosen
+  zxingWasm: {
+    url: 'https://cdn.jsdelivr.net/npm/zxing-wasm@2/dist/iife/reader/index.js',
+    global: 'ZXingWASM',
+  },
+};
+
+// Library name -> Promise, so concurrent callers share one <script> element
+const loading = {};
+const prefetched = new Set();
+
+/**
+ * Load a library by name, resolving with its global once it has executed
+ * @param {string} name - Key of LIBRARIES ('bwipjs', 'zxing' or 'zxingWasm')
+ * @returns {Promise<any>}
+ */
+export function loadLibrary(name) {
+  const library = LIBRARIES[name];
+  if (!library) {
+    return Promise.reject(new Error(`Unknown library: ${name}`));
+  }
+
+  if (globalThis[library.global]) {
+    return Promise.resolve(globalThis[library.global]);
+  }
+
+  // Workers have no <script>; classic workers load synchronously with importScripts
+  if (typeof document === 'undefined') {
+    if (typeof importScripts !== 'function') {
+      return Promise.reject(new Error(`Load ${library.global} before using it in a module worker`));
+    }
+    try {
+      importScripts(library.url);
+      return Promise.resolve(globalThis[library.global]);
+    } catch (error) {
+      return Promise.reject(new Error(`Failed to load ${library.global} from ${library.url}`));
+    }
+  }
+
+  if (!loading[name]) {
+    loading[name] = new Promise((resolve, reject) => {
+      const script = document.createElement('script');
+      script.src = library.url;
+      script.async = true;
+      script.onload = () => {
+        if (globalThis[library.global]) {
+          resolve(globalThis[library.global]);
+        } else {
+          reject(new Error(`${library.global} is not available after loading ${library.url}`));
+        }
+      };
+      script.onerror = () => {
+        // Allow a later retry (e.g. once the device is back online)
+        delete loading[name];
+        script.remove();
+        reject(new Error(`Failed to load ${library.global} from ${library.url}`));
+      };
+      document.head.appendChild(script);
+    });
+  }
+
+  return loading[name];
+}
+
+/**
+ * Check whether a library has already executed
+ * @param {string} name
+ * @returns {boolean}
+ */
+export function isLibraryLoaded(name) {
+  const library = LIBRARIES[name];
+  return !!library && !!globalThis[library.global];
+}
+
+/**
+ * Download a library into the HTTP cache when the browser is idle, without executing it
+ * @param {string} name
+ */
+export function prefetchLibrary(name) {
+  const library = LIBRARIES[name];
+  if (!library || prefetched.has(name) || isLibraryLoaded(name) || loading[name]) {
+    return;
+  }
+  prefetched.add(name);
+
+  const prefetch = () => {
+    const link = document.createElement('link');
+    link.rel = 'prefetch';
+    link.as = 'script';
+    link.href = library.url;
+    document.head.appendChild(link);
+  };
+
+  if (typeof requestIdleCallback === 'function') {
+    requestIdleCallback(prefetch, { timeout: 5000 });
+  } else {
+    setTimeout(prefetch, 2000);
+  }
+}
@@ -0,0 +1,276 @@
+/**
+ * Barcode localization - finds likely barcode regions before decoding
+ *
+ * ZXing looks for a code across the whole image along horizontal rows, so a
+ * small, off-centre or rotated code can take many frames to read. This pass
+ * runs on a small grayscale copy of the frame and finds regions with the
+ * texture of a barcode using the structure tensor of the image gradient,
+ * accumulated over square cells:
+ *
+ *   - Linear (1D) barcodes have strong gradients that all point the same way,
+ *     so their cells are coherent; the tensor's orientation is the bars' normal.
+ *   - Matrix (2D) codes have strong gradients along two perpendicular
+ *     directions, so their cells are not coherent; the fourfold-symmetric
+ *     orientation (angle doubled twice) gives the module grid's rotation.
+ *
+ * Neighbouring textured cells are grouped into candidates, each with an
+ * oriented box. The decoder then gets each candidate's region from the
+ * full-resolution frame, rotated upright, before it tries the whole frame.
+ * Everything here is plain arithmetic on typed arrays, so it runs in workers.
+ */
+
+const WORK_SIZE = 320; // Longest side of the grayscale copy
+const CELL = 8; // Cell size in work pixels
+const MIN_ENERGY = 300; // Mean squared gradient for a textured cell (gradients scaled to 0-127)
+const RELATIVE_ENERGY = 0.15; // ... and at least this share of the strongest cell's
+const LINEAR_COHERENCE = 0.75; // Cells above this coherence look like bars
+const LINEAR_SHARE = 0.6; // Share of coherent cells that makes a candidate linear
+const MIN_CELLS = 4;
+const MAX_CANDIDATES = 3; // Default number of candidates returned
+const MARGIN = 0.2; // Extra box size for quiet zones and cells cut off at the edges
+const MIN_REGION_SIDE = 160; // Small regions are scaled up to this many pixels on their short side
+const MAX_REGION_SIDE = 1024;
+
+/**
+ * Downscale 8-bit luminance by averaging, for localization
+ * @param {Uint8ClampedArray|Uint8Array} luminance - One byte per pixel, row by row
+ * @param {number} width
+ * @param {number} height
+ * @param {number} maxSide - Longest side of the result
+ * @returns {{pixels: Uint8ClampedArray, width: number, height: number, scale: number}} scale is
+ *   result pixels per source pixel
+ */
+export function downscaleLuminance(luminance, width, height, maxSide = WORK_SIZE) {
+  const scale = Math.min(1, maxSide / Math.max(width, height));
+  const outWidth = Math.max(1, Math.round(width * scale));
+  const outHeight = Math.max(1, Math.round(height * scale));
+  const pixels = new Uint8ClampedArray(outWidth * outHeight);
+  const step = 1 / scale;
+  const stride = Math.max(1, Math.floor(step / 2)); // Sample every other pixel of large blocks
+
+  for (let y = 0; y < outHeight; y++) {
+    const y0 = Math.floor(y * step);
+    const y1 = Math.min(height, Math.max(y0 + 1, Math.floor((y + 1) * step)));
+    for (let x = 0; x < outWidth; x++) {
+      const x0 = Math.floor(x * step);
+      const x1 = Math.min(width, Math.max(x0 + 1, Math.floor((x + 1) * step)));
+      let sum = 0;
+      let count = 0;
+      for (let sy = y0; sy < y1; sy += stride) {
+        const row = sy * width;
+        for (let sx = x0; sx < x1; sx += stride) {
+          sum += luminance[row + sx];
+          count++;
+        }
+      }
+      pixels[y * outWidth + x] = sum / count;
+    }
+  }
+  return { pixels, width: outWidth, height: outHeight, scale };
+}
+
+/**
+ * Structure tensor sums per cell
+ */
+function cellTensors(pixels, width, height) {
+  const cols = Math.floor(width / CELL);
+  const rows = Math.floor(height / CELL);
+  const cells = cols * rows;
+  const jxx = new Float32Array(cells);
+  const jyy = new Float32Array(cells);
+  const jxy = new Float32Array(cells);
+  const q4c = new Float32Array(cells); // Gradient energy times cos(4 * angle)
+  const q4s = new Float32Array(cells); // ... and sin(4 * angle)
+
+  for (let y = 1; y < rows * CELL && y < height - 1; y++) {
+    const rowCell = Math.floor(y / CELL) * cols;
+    for (let x = 1; x < cols * CELL && x < width - 1; x++) {
+      const i = y * width + x;
+      // Sobel, scaled so a full black-to-white edge gives 127
+      const gx =
+        (pixels[i - width + 1] + 2 * pixels[i + 1] + pixels[i + width + 1] -
+          pixels[i - width - 1] - 2 * pixels[i - 1] - pixels[i + width - 1]) / 8;
+      const gy =
+        (pixels[i + width - 1] + 2 * pixels[i + width] + pixels[i + width + 1] -
+          pixels[i - width - 1] - 2 * pixels[i - width] - pixels[i - width + 1]) / 8;
+      const xx = gx * gx;
+      const yy = gy * gy;
+      const xy = gx * gy;
+      const c = rowCell + Math.floor(x / CELL);
+      jxx[c] += xx;
+      jyy[c] += yy;
+      jxy[c] += xy;
+
+      const energy = xx + yy;
+      if (energy > 0) {
+        const d = xx - yy; // energy * cos(2 * angle); 2 * xy is energy * sin(2 * angle)
+        q4c[c] += (d * d - 4 * xy * xy) / energy;
+        q4s[c] += (4 * xy * d) / energy;
+      }
+    }
+  }
+  return { cols, rows, jxx, jyy, jxy, q4c, q4s };
+}
+
+/**
+ * Find regions that look like barcodes
+ * @param {{pixels: Uint8ClampedArray, width: number, height: number}} image - Grayscale image,
+ *   e.g. from downscaleLuminance
+ * @param {number} maxCandidates
+ * @returns {Array<{x: number, y: number, width: number, height: number, angle: number,
+ *   kind: string, cells: number}>} Oriented boxes in image pixels, largest first: (x, y) is
+ *   the centre, angle (radians) the rotation that makes the code upright, kind 'linear' or 'matrix'
+ */
+export function findCandidates({ pixels, width, height }, maxCandidates = MAX_CANDIDATES) {
+  const { cols, rows, jxx, jyy, jxy, q4c, q4s } = cellTensors(pixels, width, height);
+  const cells = cols * rows;
+  const area = CELL * CELL;
+
+  let strongest = 0;
+  const energy = new Float32Array(cells);
+  for (let c = 0; c < cells; c++) {
+    energy[c] = (jxx[c] + jyy[c]) / area;
+    strongest = Math.max(strongest, energy[c]);
+  }
+  const threshold = Math.max(MIN_ENERGY, RELATIVE_ENERGY * strongest);
+
+  // Group textured cells into 4-connected components
+  const seen = new Uint8Array(cells);
+  const candidates = [];
+  for (let start = 0; start < cells; start++) {
+    if (seen[start] || energy[start] < threshold) continue;
+
+    const members = [];
+    const stack = [start];
+    seen[start] = 1;
+    while (stack.length > 0) {
+      const c = stack.pop();
+      members.push(c);
+      const col = c % cols;
+      const neighbours = [
+        col > 0 ? c - 1 : -1,
+        col < cols - 1 ? c + 1 : -1,
+        c >= cols ? c - cols : -1,
+        c + cols < cells ? c + cols : -1,
+      ];
+      for (const n of neighbours) {
+        if (n >= 0 && !seen[n] && energy[n] >= threshold) {
+          seen[n] = 1;
+          stack.push(n);
+        }
+      }
+    }
+    if (members.length < MIN_CELLS) continue;
+
+    // Orientation of the coherent cells only: cells on a code's edge mix in the edge's own gradient
+    let sxx = 0;
+    let syy = 0;
+    let sxy = 0;
+    let s4c = 0;
+    let s4s = 0;
+    let coherent = 0;
+    for (const c of members) {
+      s4c += q4c[c];
+      s4s += q4s[c];
+      const coherence = Math.sqrt((jxx[c] - jyy[c]) ** 2 + 4 * jxy[c] ** 2) / (jxx[c] + jyy[c]);
+      if (coherence > LINEAR_COHERENCE) {
+        coherent++;
+        sxx += jxx[c];
+        syy += jyy[c];
+        sxy += jxy[c];
+      }
+    }
+
+    const linear = coherent / members.length >= LINEAR_SHARE;
+    // Linear: the bars' normal, so bars end up vertical. Matrix: the grid's rotation within +-45 degrees
+    const angle = linear ? 0.5 * Math.atan2(2 * sxy, sxx - syy) : 0.25 * Math.atan2(s4s, s4c);
+
+    candidates.push({ ...orientedBox(members, cols, angle, linear), angle, kind: linear ? 'linear' : 'matrix', cells: members.length });
+  }
+
+  return candidates.sort((a, b) => b.cells - a.cells).slice(0, maxCandidates);
+}
+
+/**
+ * Box around cells along the axes of a rotation, with a margin
+ */
+function orientedBox(members, cols, angle, linear) {
+  const cos = Math.cos(angle);
+  const sin = Math.sin(angle);
+  let minU = Infinity;
+  let maxU = -Infinity;
+  let minV = Infinity;
+  let maxV = -Infinity;
+  for (const c of members) {
+    const cx = (c % cols + 0.5) * CELL;
+    const cy = (Math.floor(c / cols) + 0.5) * CELL;
+    const u = cx * cos + cy * sin;
+    const v = -cx * sin + cy * cos;
+    minU = Math.min(minU, u);
+    maxU = Math.max(maxU, u);
+    minV = Math.min(minV, v);
+    maxV = Math.max(maxV, v);
+  }
+
+  let width = maxU - minU + CELL;
+  let height = maxV - minV + CELL;
+  width += width * MARGIN + (linear ? 2 * CELL : 0); // Quiet zones left and right of the bars
+  height += height * MARGIN;
+
+  const u = (minU + maxU) / 2;
+  const v = (minV + maxV) / 2;
+  return { x: u * cos - v * sin, y: u * sin + v * cos, width, height };
+}
+
+/**
+ * Geometry of a candidate's upright region in the full-resolution frame
+ * @param {object} candidate - From findCandidates
+ * @param {number} scale - Work pixels per frame pixel (downscaleLuminance's scale)
+ * @returns {{width: number, height: number, centerX: number, centerY: number, angle: number,
+ *   pixelSize: number}} Region size in output pixels; pixelSize is frame pixels per output pixel
+ */
+export function regionFor(candidate, scale) {
+  const frameWidth = candidate.width / scale;
+  const frameHeight = candidate.height / scale;
+  const shortSide = Math.min(frameWidth, frameHeight);
+  const longSide = Math.max(frameWidth, frameHeight);
+  const zoom = Math.min(Math.max(1, MIN_REGION_SIDE / shortSide), MAX_REGION_SIDE / longSide);
+
+  return {
+    width: Math.max(1, Math.round(frameWidth * zoom)),
+    height: Math.max(1, Math.round(frameHeight * zoom)),
+    centerX: candidate.x / scale,
+    centerY: candidate.y / scale,
+    angle: candidate.angle,
+    pixelSize: 1 / zoom,
+  };
+}
+
+/**
+ * Draw a region of the frame upright onto a context sized to the region
+ * @param {CanvasRenderingContext2D|OffscreenCanvasRenderingContext2D} ctx
+ * @param {CanvasImageSource} frame - Full-resolution frame
+ * @param {object} region - From regionFor
+ */
+export function drawRegion(ctx, frame, region) {
+  ctx.setTransform(1, 0, 0, 1, 0, 0);
+  ctx.fillStyle = '#fff';
+  ctx.fillRect(0, 0, region.width, region.height);
+  ctx.translate(region.width / 2, region.height / 2);
+  ctx.scale(1 / region.pixelSize, 1 / region.pixelSize);
+  ctx.rotate(-region.angle);
+  ctx.translate(-region.centerX, -region.centerY);
+  ctx.drawImage(frame, 0, 0);
+  ctx.setTransform(1, 0, 0, 1, 0, 0);
+}
+
+/**
+ * Map a point in a region drawn by drawRegion back to frame coordinates
+ */
+export function regionToFrame({ x, y }, region) {
+  const u = (x - region.width / 2) * region.pixelSize;
+  const v = (y - region.height / 2) * region.pixelSize;
+  const cos = Math.cos(region.angle);
+  const sin = Math.sin(region.angle);
+  return { x: region.centerX + u * cos - v * sin, y: region.centerY + u * sin + v * cos };
+}
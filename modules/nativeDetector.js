@@ -0,0 +1,79 @@
+/**
+ * Native barcode detection
+ *
+ * Chromium-based browsers ship a BarcodeDetector (Shape Detection API) backed by
+ * the platform's barcode library, which is far faster than ZXing-js. It only
+ * reports text, format and corner points, so results are converted to the same
+ * shape the decode worker posts back and the rest of the scanner does not care
+ * which engine read the code.
+ */
+
+// ZXing.BarcodeFormat names -> BarcodeDetector format names
+export const NATIVE_FORMATS = {
+  AZTEC: 'aztec',
+  CODABAR: 'codabar',
+  CODE_39: 'code_39',
+  CODE_93: 'code_93',
+  CODE_128: 'code_128',
+  DATA_MATRIX: 'data_matrix',
+  EAN_8: 'ean_8',
+  EAN_13: 'ean_13',
+  ITF: 'itf',
+  PDF_417: 'pdf417',
+  QR_CODE: 'qr_code',
+  UPC_A: 'upc_a',
+  UPC_E: 'upc_e',
+};
+
+let supportedFormats = null;
+
+/**
+ * Formats the native detector supports on this device
+ * @returns {Promise<string[]>} BarcodeDetector format names; empty when there is no native detector
+ */
+export function nativeSupport() {
+  if (!supportedFormats) {
+    supportedFormats =
+      typeof BarcodeDetector === 'undefined'
+        ? Promise.resolve([])
+        : BarcodeDetector.getSupportedFormats().catch(() => []);
+  }
+  return supportedFormats;
+}
+
+/**
+ * Create a native detector for the formats it supports out of those requested
+ * @param {number[]} formats - ZXing.BarcodeFormat values
+ * @returns {Promise<{detector: BarcodeDetector, formats: number[], complete: boolean}|null>}
+ *   complete is false when some requested formats can only be read by ZXing; null when none are supported
+ */
+export async function createNativeDetector(formats) {
+  const supported = await nativeSupport();
+  const native = formats.filter((format) => supported.includes(NATIVE_FORMATS[ZXing.BarcodeFormat[format]]));
+  if (native.length === 0) {
+    return null;
+  }
+
+  const detector = new BarcodeDetector({
+    formats: native.map((format) => NATIVE_FORMATS[ZXing.BarcodeFormat[format]]),
+  });
+  return { detector, formats: native, complete: native.length === formats.length };
+}
+
+/**
+ * Detect barcodes with the native detector
+ * @param {{detector: BarcodeDetector}} native - Return value of createNativeDetector
+ * @param {ImageBitmapSource} source - Video frame, image or bitmap
+ * @returns {Promise<Array<{text: string, format: number, points: Array<{x: number, y: number}>, macro: null}>>}
+ */
+export async function detectNative(native, source) {
+  const barcodes = await native.detector.detect(source);
+  const zxingNames = Object.fromEntries(Object.entries(NATIVE_FORMATS).map(([zxing, name]) => [name, zxing]));
+
+  return barcodes.map((barcode) => ({
+    text: barcode.rawValue,
+    format: ZXing.BarcodeFormat[zxingNames[barcode.format]],
+    points: barcode.cornerPoints.map(({ x, y }) => ({ x, y })),
+    macro: null, // The native detector does not report Macro PDF417 control blocks
+  }));
+}
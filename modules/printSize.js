@@ -0,0 +1,88 @@
+/**
+ * Print-accurate sizing - Maps printer resolution and X-dimension to whole pixels
+ *
+ * A printer can only place whole dots, so a module must be an integer number of
+ * printer dots wide. Rendering at exactly that many pixels per module and
+ * tagging the PNG with the printer resolution lets the driver print the image
+ * 1:1, without the resampling that blurs bar edges on thermal printers.
+ */
+import { crc32 } from './utils.js';
+
+const MM_PER_INCH = 25.4;
+const MILS_PER_INCH = 1000;
+
+/**
+ * Common printer resolutions (dots per inch)
+ */
+export const PRINTER_DPI = [203, 300, 600];
+
+/**
+ * Compute the integer pixels-per-module closest to a requested X-dimension
+ * @param {number} dpi - Printer resolution
+ * @param {number} xDimension - Narrow bar / module width
+ * @param {'mil'|'mm'} unit
+ * @returns {{pixels: number, actualMils: number, actualMm: number, deviation: number}}
+ *   deviation is the relative difference between achieved and requested size
+ */
+export function pixelsPerModule(dpi, xDimension, unit = 'mil') {
+  if (!(dpi > 0) || !(xDimension > 0)) {
+    throw new Error('Printer DPI and X-dimension must be positive numbers');
+  }
+
+  const inches = unit === 'mm' ? xDimension / MM_PER_INCH : xDimension / MILS_PER_INCH;
+  const pixels = Math.max(1, Math.round(inches * dpi));
+  const actualInches = pixels / dpi;
+
+  return {
+    pixels,
+    actualMils: actualInches * MILS_PER_INCH,
+    actualMm: actualInches * MM_PER_INCH,
+    deviation: (actualInches - inches) / inches,
+  };
+}
+
+/**
+ * Convert a pixel length at a given resolution to millimetres
+ */
+export function pixelsToMm(pixels, dpi) {
+  return (pixels / dpi) * MM_PER_INCH;
+}
+
+/**
+ * Give an SVG document physical width/height so it prints at the intended size
+ * @param {string} svg - Root element must carry width and height in pixels
+ * @param {number} dpi - Resolution the pixel dimensions were computed for
+ * @returns {string}
+ */
+export function setSvgPhysicalSize(svg, dpi) {
+  const rootEnd = svg.indexOf('>', svg.indexOf('<svg'));
+  const root = svg.slice(0, rootEnd).replace(/\s(width|height)="([0-9.]+)"/g, (match, attribute, value) => {
+    const mm = Math.round(pixelsToMm(Number(value), dpi) * 1000) / 1000;
+    return ` ${attribute}="${mm}mm"`;
+  });
+  return root + svg.slice(rootEnd);
+}
+
+/**
+ * Tag a PNG with its print resolution by inserting a pHYs chunk after IHDR
+ * @param {Blob} blob - PNG image
+ * @param {number} dpi
+ * @returns {Promise<Blob>}
+ */
+export async function setPngResolution(blob, dpi) {
+  const bytes = new Uint8Array(await blob.arrayBuffer());
+  const ihdrEnd = 8 + 8 + 13 + 4; // Signature, IHDR length/type, IHDR data, CRC
+
+  // pHYs: pixels per unit X, pixels per unit Y, unit specifier (1 = metre)
+  const chunk = new Uint8Array(4 + 4 + 9 + 4);
+  const view = new DataView(chunk.buffer);
+  const pixelsPerMetre = Math.round((dpi / MM_PER_INCH) * 1000);
+  view.setUint32(0, 9);
+  chunk.set([0x70, 0x48, 0x59, 0x73], 4); // "pHYs"
+  view.setUint32(8, pixelsPerMetre);
+  view.setUint32(12, pixelsPerMetre);
+  chunk[16] = 1;
+  view.setUint32(17, crc32(chunk.subarray(4, 17)));
+
+  return new Blob([bytes.subarray(0, ihdrEnd), chunk, bytes.subarray(ihdrEnd)], { type: 'image/png' });
+}
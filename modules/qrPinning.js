@@ -0,0 +1,133 @@
+/**
+ * QR version and mask pinning
+ *
+ * Unless a mask is given, bwip-js builds the symbol with all eight mask
+ * patterns and scores each one to pick the best. Any mask scans; the scoring
+ * only avoids patterns that are harder to read. In auto-pin mode the best mask
+ * is measured once per length class (error correction level + version): the
+ * first payload of a class is rendered unpinned, the mask bwip-js chose is
+ * read back from the symbol's format information, and every later payload of
+ * that class reuses it. The version comes from the capacity model, so a given
+ * payload always renders the same way for the same sequence of inputs. Only
+ * payloads whose version the model knows exactly are pinned: when mixing
+ * modes could fit a smaller version, bwip-js picks the version and mask.
+ */
+import { qrVersionFor, qrMinVersionFor } from './capacity.js';
+
+export const QR_MASKS = [1, 2, 3, 4, 5, 6, 7, 8]; // bwip-js numbering (ISO 18004 masks 000-111)
+
+// Length class "eclevel/version" -> bwip-js mask
+const pinnedMasks = new Map();
+
+// Error correction level bits in the format information
+const EC_BITS = { L: 1, M: 0, Q: 3, H: 2 };
+
+/**
+ * The 15-bit format information for a level and ISO mask (BCH(15,5), XOR 0x5412)
+ */
+function formatBits(eclevel, isoMask) {
+  const data = (EC_BITS[eclevel] << 3) | isoMask;
+  let remainder = data << 10;
+  for (let bit = 14; bit >= 10; bit--) {
+    if (remainder & (1 << bit)) remainder ^= 0x537 << (bit - 10);
+  }
+  return ((data << 10) | remainder) ^ 0x5412;
+}
+
+/**
+ * Read the mask pattern from a rendered symbol's format information
+ * @param {HTMLCanvasElement|OffscreenCanvas} canvas - Rendered QR Code, dark modules on a light
+ *   or transparent background
+ * @param {number} version
+ * @param {string} eclevel
+ * @returns {number|null} bwip-js mask (1-8), or null when the symbol could not be read
+ */
+export function readQrMask(canvas, version, eclevel) {
+  const { width, height } = canvas;
+  const pixels = canvas.getContext('2d').getImageData(0, 0, width, height).data;
+  const dark = (x, y) => {
+    const i = (y * width + x) * 4;
+    return pixels[i + 3] > 127 && pixels[i] + pixels[i + 1] + pixels[i + 2] < 384;
+  };
+
+  // The top-left finder's corner is the first dark pixel; its row runs to the top-right finder
+  let top = -1;
+  let left = -1;
+  for (let y = 0; y < height && top < 0; y++) {
+    for (let x = 0; x < width; x++) {
+      if (dark(x, y)) {
+        [top, left] = [y, x];
+        break;
+      }
+    }
+  }
+  if (top < 0) return null;
+  let right = width - 1;
+  while (right > left && !dark(right, top)) right--;
+
+  const size = 17 + 4 * version;
+  const moduleSize = (right - left + 1) / size;
+  const module = (column, row) =>
+    dark(Math.floor(left + (column + 0.5) * moduleSize), Math.floor(top + (row + 0.5) * moduleSize));
+
+  // Format information around the top-left finder, most significant bit first
+  const positions = [[0, 8], [1, 8], [2, 8], [3, 8], [4, 8], [5, 8], [7, 8], [8, 8], [8, 7], [8, 5], [8, 4], [8, 3], [8, 2], [8, 1], [8, 0]];
+  let bits = 0;
+  for (const [column, row] of positions) {
+    bits = (bits << 1) | (module(column, row) ? 1 : 0);
+  }
+
+  for (let isoMask = 0; isoMask < 8; isoMask++) {
+    if (formatBits(eclevel, isoMask) === bits) {
+      return isoMask + 1;
+    }
+  }
+  return null;
+}
+
+/**
+ * Length class of a payload: its error correction level and the version it needs
+ */
+export function lengthClass(text, eclevel, version = null) {
+  return `${eclevel}/${version || qrVersionFor(text, eclevel)}`;
+}
+
+/**
+ * Version and mask to render with in auto-pin mode, measuring the mask on first use of a class
+ * @param {string} text
+ * @param {string} eclevel
+ * @param {number|null} version - Explicit version, or null to use the capacity model's
+ * @param {() => HTMLCanvasElement|OffscreenCanvas} createCanvas - Canvas for the measuring render
+ * @returns {{version: number|null, mask: number|null}} mask is null if it could not be measured;
+ *   both are null when the version is not known exactly
+ */
+export function autoPin(text, eclevel, version, createCanvas) {
+  const single = qrVersionFor(text, eclevel);
+  const pinnedVersion = version || (single && single === qrMinVersionFor(text, eclevel) ? single : null);
+  if (!pinnedVersion) {
+    return { version: null, mask: null };
+  }
+  const key = lengthClass(text, eclevel, pinnedVersion);
+
+  if (!pinnedMasks.has(key)) {
+    const canvas = createCanvas();
+    bwipjs.toCanvas(canvas, { bcid: 'qrcode', text, eclevel, version: String(pinnedVersion), scale: 2, padding: 0 });
+    pinnedMasks.set(key, readQrMask(canvas, pinnedVersion, eclevel));
+  }
+  return { version: pinnedVersion, mask: pinnedMasks.get(key) };
+}
+
+/**
+ * Forget measured masks, e.g. so a batch does not depend on what was rendered before it
+ */
+export function clearQrPins() {
+  pinnedMasks.clear();
+}
+
+/**
+ * Measured masks by length class, for display and tests
+ * @returns {Object<string, number|null>}
+ */
+export function qrPins() {
+  return Object.fromEntries(pinnedMasks);
+}
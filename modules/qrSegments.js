@@ -0,0 +1,55 @@
+/**
+ * QR Code mode segmentation - the fewest data bits any encoder can use
+ *
+ * A QR encoder may switch between numeric, alphanumeric and byte mode within
+ * a payload, so "ABC...abc" costs far less than encoding everything as bytes.
+ * This finds the cheapest segmentation with the usual dynamic programme over
+ * characters. Segment lengths are not rounded, so the result is a lower bound:
+ * a payload over it cannot be encoded by anyone, one under it usually can.
+ * Kept apart from capacity.js so validation.js can use it too.
+ */
+
+const ALPHANUMERIC = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:';
+const MODES = ['numeric', 'alphanumeric', 'byte'];
+
+// Character count bits per mode, for versions 1-9, 10-26 and 27-40
+const COUNT_BITS = { numeric: [10, 12, 14], alphanumeric: [9, 11, 13], byte: [8, 16, 16] };
+
+// Cost per character in sixths of a bit: numeric 10 bits per 3, alphanumeric 11 per 2, byte 8 per byte
+const SIXTHS = { numeric: 20, alphanumeric: 33, byte: 48 };
+
+/**
+ * Size class of a version: index into COUNT_BITS
+ */
+export function qrSizeClass(version) {
+  return version <= 9 ? 0 : version <= 26 ? 1 : 2;
+}
+
+/**
+ * Data bits of the cheapest mode segmentation of text at a version
+ * @param {string} text
+ * @param {number} version - 1-40; only its size class matters
+ * @returns {number}
+ */
+export function qrSegmentBits(text, version) {
+  const sizeClass = qrSizeClass(version);
+  const header = (mode) => (4 + COUNT_BITS[mode][sizeClass]) * 6;
+
+  // Cheapest cost so far of a segmentation whose last segment is in each mode
+  let cost = { numeric: Infinity, alphanumeric: Infinity, byte: Infinity };
+  let best = 0;
+  for (const char of text) {
+    const code = char.codePointAt(0);
+    const bytes = code < 0x80 ? 1 : code < 0x800 ? 2 : code < 0x10000 ? 3 : 4;
+    const next = {};
+    for (const mode of MODES) {
+      const allowed =
+        mode === 'byte' || (mode === 'numeric' ? code >= 48 && code <= 57 : ALPHANUMERIC.includes(char));
+      const charCost = mode === 'byte' ? SIXTHS.byte * bytes : SIXTHS[mode];
+      next[mode] = allowed ? Math.min(cost[mode], best + header(mode)) + charCost : Infinity;
+    }
+    cost = next;
+    best = Math.min(cost.numeric, cost.alphanumeric, cost.byte);
+  }
+  return text.length === 0 ? 4 + COUNT_BITS.numeric[sizeClass] : Math.ceil(best / 6);
+}
@@ -0,0 +1,42 @@
+/**
+ * Render worker - Renders symbols off the main thread
+ *
+ * A classic worker, so barcodeCore can pull bwip-js in with importScripts; the
+ * core itself is loaded with a dynamic import on first use. Speaks the same
+ * protocol as decodeWorker.js, so it runs in a DecodePool: requests carry an id
+ * and get exactly one reply, { id, result } or { id, error }.
+ */
+
+let core = null;
+
+/**
+ * Render one symbol to an ImageBitmap
+ * @param {object} message - { request: { type, text, options } }; see barcodeCore.generate
+ * @returns {Promise<{result: ImageBitmap, transfer: Transferable[]}>}
+ */
+async function render({ request }) {
+  core = core || (await import('./barcodeCore.js'));
+  const bitmap = await core.generate({ ...request, format: 'bitmap' });
+  return { result: bitmap, transfer: [bitmap] };
+}
+
+const handlers = { render };
+
+self.onmessage = async (event) => {
+  const { id, type } = event.data;
+
+  if (type === 'init') {
+    return; // Libraries are resolved by loader.js
+  }
+
+  try {
+    const handler = handlers[type];
+    if (!handler) {
+      throw new Error(`Unknown request: ${type}`);
+    }
+    const { result, transfer } = await handler(event.data);
+    self.postMessage({ id, result }, transfer);
+  } catch (error) {
+    self.postMessage({ id, error: error.message || String(error) });
+  }
+};
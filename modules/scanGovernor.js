@@ -0,0 +1,152 @@
+/**
+ * ScanGovernor - Adapts camera resolution and decode rate while scanning
+ *
+ * Decoding every frame at full resolution drains handheld batteries and heats
+ * the device even when nothing is in view. The governor runs the camera at a
+ * low resolution and decodes a few frames a second while idle, and ramps up to
+ * full rate and higher resolution as soon as a code (or a code-like region
+ * found by the localizer) was seen recently. While active it steps the
+ * resolution down again when decodes get slow or the device starts dropping
+ * frames, which is how thermal throttling shows up in the browser.
+ */
+
+export const RESOLUTIONS = [
+  { width: 640, height: 480 },
+  { width: 1280, height: 720 },
+  { width: 1920, height: 1080 },
+];
+
+const ACTIVE_MS = 3000; // A code or candidate seen this recently keeps the governor active
+const IDLE_DECODE_INTERVAL = 250; // Milliseconds between decodes while idle
+const DECODE_BUDGET = 120; // Decode time (EMA, ms) above which resolution steps down
+const DROPPED_LIMIT = 0.1; // Share of dropped frames above which resolution steps down
+const EVALUATE_INTERVAL = 1000; // Milliseconds between decisions
+const RESOLUTION_HOLD = 2000; // Minimum milliseconds between resolution changes
+const EMA_WEIGHT = 0.2;
+
+export class ScanGovernor {
+  /**
+   * @param {number} now - Start time (performance.now()); the scan starts active, since the user is
+   *   usually already pointing at a code
+   */
+  constructor(now = performance.now()) {
+    this.level = 1; // Index into RESOLUTIONS
+    this.activeLevel = 1; // Level to return to when a code comes into view
+    this.idle = false;
+    this.decodeInterval = 0; // Milliseconds between decode starts; 0 decodes whenever the decoder is free
+    this.decodeMs = null; // Exponential moving average of decode time
+    this.lastCandidateAt = now;
+    this.lastDecodeAt = -Infinity;
+    this.lastEvaluatedAt = now;
+    this.lastResolutionChangeAt = now;
+    this.frames = 0; // Frames and dropped frames since the last decision
+    this.dropped = 0;
+    this.lastPresented = null;
+  }
+
+  /**
+   * Initial camera constraints
+   */
+  constraints() {
+    const { width, height } = RESOLUTIONS[this.level];
+    return { width: { ideal: width }, height: { ideal: height } };
+  }
+
+  /**
+   * Count a camera frame
+   * @param {number|null} presentedFrames - requestVideoFrameCallback's running frame count, or a
+   *   running count of dropped frames when only getVideoPlaybackQuality is available
+   * @param {boolean} droppedCount - Whether presentedFrames is a dropped-frame count
+   */
+  recordFrame(presentedFrames, droppedCount = false) {
+    this.frames++;
+    if (presentedFrames === null || presentedFrames === undefined) return;
+    if (this.lastPresented !== null) {
+      const gap = presentedFrames - this.lastPresented;
+      this.dropped += droppedCount ? gap : Math.max(0, gap - 1);
+    }
+    this.lastPresented = presentedFrames;
+  }
+
+  /**
+   * Whether a frame arriving now should be decoded
+   */
+  shouldDecode(now) {
+    if (now - this.lastDecodeAt < this.decodeInterval) {
+      return false;
+    }
+    this.lastDecodeAt = now;
+    return true;
+  }
+
+  /**
+   * Record a finished decode
+   * @param {number} decodeMs
+   * @param {boolean} candidate - A code was read, or the engine saw something code-like
+   */
+  recordDecode(decodeMs, candidate, now = performance.now()) {
+    this.decodeMs = this.decodeMs === null ? decodeMs : this.decodeMs + EMA_WEIGHT * (decodeMs - this.decodeMs);
+    if (candidate) {
+      this.lastCandidateAt = now;
+      if (this.idle) {
+        this.lastEvaluatedAt = -Infinity; // Ramp up on the next frame rather than within a second
+      }
+    }
+  }
+
+  /**
+   * Decide on the decode rate and resolution, at most once per EVALUATE_INTERVAL
+   * @returns {{width: number, height: number}|null} Resolution to switch the camera to, or null
+   */
+  evaluate(now = performance.now()) {
+    if (now - this.lastEvaluatedAt < EVALUATE_INTERVAL) {
+      return null;
+    }
+    this.lastEvaluatedAt = now;
+
+    const droppedShare = this.frames > 0 ? this.dropped / (this.frames + this.dropped) : 0;
+    this.frames = 0;
+    this.dropped = 0;
+
+    const idle = now - this.lastCandidateAt >= ACTIVE_MS;
+    const switching = idle !== this.idle; // Going idle or waking up is never held back
+    let level;
+    if (idle) {
+      // Cheapest resolution, a few decodes a second
+      if (!this.idle) {
+        this.activeLevel = this.level;
+      }
+      this.decodeInterval = IDLE_DECODE_INTERVAL;
+      level = 0;
+    } else {
+      // Full decode rate; resolution follows decode time and dropped frames
+      this.decodeInterval = 0;
+      level = this.idle ? this.activeLevel : this.level;
+      if (this.decodeMs > DECODE_BUDGET || droppedShare > DROPPED_LIMIT) {
+        level = Math.max(0, level - 1);
+      } else if (this.decodeMs !== null && this.decodeMs < DECODE_BUDGET / 2 && droppedShare === 0) {
+        level = Math.min(RESOLUTIONS.length - 1, level + 1);
+      }
+    }
+    this.idle = idle;
+
+    if (level === this.level || (!switching && now - this.lastResolutionChangeAt < RESOLUTION_HOLD)) {
+      return null;
+    }
+    this.level = level;
+    this.lastResolutionChangeAt = now;
+    return RESOLUTIONS[level];
+  }
+
+  /**
+   * Current settings, for display and tests
+   */
+  describe() {
+    return {
+      resolution: RESOLUTIONS[this.level],
+      decodeInterval: this.decodeInterval,
+      decodeMs: this.decodeMs,
+      idle: this.idle,
+    };
+  }
+}
@@ -0,0 +1,102 @@
+/**
+ * Scan window - the part of the camera frame that is decoded
+ *
+ * Users aim the code at the centre of the picture, so most frames only need
+ * the centre decoded. The window's shape follows the selected formats: wide
+ * for linear (1D) barcodes, square for matrix (2D) ones, and wide enough for
+ * both when both are selected. The crop is downscaled to a target resolution
+ * before decoding; linear barcodes keep more horizontal resolution because
+ * their bars are only measured along one axis.
+ */
+
+export const LINEAR_FORMATS = ['UPC_A', 'UPC_E', 'EAN_8', 'EAN_13', 'CODE_39', 'CODE_93', 'CODE_128', 'CODABAR', 'ITF'];
+
+const MATRIX_TARGET = 480; // Longest side of a 2D crop after downscaling, in pixels
+const LINEAR_TARGET = 800; // Width of a 1D crop after downscaling, in pixels
+const LINEAR_ASPECT = 3; // Width to height of a 1D window
+
+/**
+ * The scan window for a frame
+ * @param {number[]} formats - ZXing.BarcodeFormat values being decoded
+ * @param {number} frameWidth
+ * @param {number} frameHeight
+ * @param {number} size - Window size as a share of the frame (0-1); 0 scans the full frame
+ * @returns {{x: number, y: number, width: number, height: number, targetWidth: number,
+ *   targetHeight: number}|null} Window in frame pixels and the size to decode it at; null for the full frame
+ */
+export function scanWindowFor(formats, frameWidth, frameHeight, size) {
+  if (!size || size >= 1 || !frameWidth || !frameHeight) {
+    return null;
+  }
+
+  const names = formats.map((format) => ZXing.BarcodeFormat[format]);
+  const linear = names.some((name) => LINEAR_FORMATS.includes(name));
+  const matrix = names.some((name) => !LINEAR_FORMATS.includes(name));
+
+  let width = 0;
+  let height = 0;
+  if (matrix) {
+    width = height = size * Math.min(frameWidth, frameHeight);
+  }
+  if (linear) {
+    width = Math.max(width, size * frameWidth);
+    height = Math.max(height, (size * frameWidth) / LINEAR_ASPECT);
+  }
+  width = Math.round(Math.min(width, frameWidth));
+  height = Math.round(Math.min(height, frameHeight));
+
+  const target = linear ? LINEAR_TARGET : MATRIX_TARGET;
+  const scale = Math.min(1, target / Math.max(width, height));
+  return {
+    x: Math.round((frameWidth - width) / 2),
+    y: Math.round((frameHeight - height) / 2),
+    width,
+    height,
+    targetWidth: Math.round(width * scale),
+    targetHeight: Math.round(height * scale),
+  };
+}
+
+/**
+ * Capture the window of a video frame, downscaled to its target size
+ * @returns {Promise<ImageBitmap>}
+ */
+export function captureWindow(source, scanWindow) {
+  const { x, y, width, height, targetWidth, targetHeight } = scanWindow;
+  return createImageBitmap(source, x, y, width, height, {
+    resizeWidth: targetWidth,
+    resizeHeight: targetHeight,
+    resizeQuality: 'medium',
+  });
+}
+
+/**
+ * Map a result decoded from a window capture back to frame coordinates
+ */
+export function toFrameCoordinates(scan, scanWindow) {
+  const scaleX = scanWindow.width / scanWindow.targetWidth;
+  const scaleY = scanWindow.height / scanWindow.targetHeight;
+  return {
+    ...scan,
+    points: scan.points.map(({ x, y }) => ({ x: scanWindow.x + x * scaleX, y: scanWindow.y + y * scaleY })),
+  };
+}
+
+/**
+ * Shade the frame outside the window and outline it
+ * @param {CanvasRenderingContext2D} ctx - Context of the canvas showing the frame
+ */
+export function drawScanWindow(ctx, scanWindow) {
+  const { x, y, width, height } = scanWindow;
+  const { width: frameWidth, height: frameHeight } = ctx.canvas;
+
+  ctx.fillStyle = 'rgba(0, 0, 0, 0.35)';
+  ctx.fillRect(0, 0, frameWidth, y);
+  ctx.fillRect(0, y + height, frameWidth, frameHeight - y - height);
+  ctx.fillRect(0, y, x, height);
+  ctx.fillRect(x + width, y, frameWidth - x - width, height);
+
+  ctx.strokeStyle = 'rgba(255, 255, 255, 0.9)';
+  ctx.lineWidth = 2;
+  ctx.strokeRect(x, y, width, height);
+}
@@ -0,0 +1,141 @@
+/**
+ * Serial number sequences for GS1 symbologies (EAN-13, EAN-8, UPC-A, ITF-14)
+ *
+ * Check digits for a whole range are computed in one column-wise pass over
+ * typed arrays: each serial digit position is peeled off every value in turn
+ * and its weighted contribution added to a running sum per value. Strings are
+ * only built when a code is actually read, so a range of a million GTINs
+ * costs a few typed arrays rather than a million strings.
+ */
+
+/**
+ * Supported symbologies and their full length including the check digit
+ */
+export const SEQUENCE_TYPES = {
+  ean13: { name: 'EAN-13', length: 13 },
+  ean8: { name: 'EAN-8', length: 8 },
+  upca: { name: 'UPC-A', length: 12 },
+  interleaved2of5: { name: 'ITF-14', length: 14 },
+};
+
+/**
+ * Compute the GS1 mod-10 check digit for a string of digits
+ * @param {string} digits - Data digits without the check digit
+ * @returns {number}
+ */
+export function gs1CheckDigit(digits) {
+  let sum = 0;
+  for (let i = 0; i < digits.length; i++) {
+    // Weights alternate 3, 1, 3, ... starting next to the check digit
+    const weight = (digits.length - i) % 2 === 1 ? 3 : 1;
+    sum += (digits.charCodeAt(i) - 48) * weight;
+  }
+  return (10 - (sum % 10)) % 10;
+}
+
+/**
+ * A range of codes with precomputed check digits
+ */
+export class SerialSequence {
+  constructor(prefix, width, values, checkDigits) {
+    this.prefix = prefix;
+    this.width = width;
+    this.values = values;
+    this.checkDigits = checkDigits;
+    this.length = values.length;
+  }
+
+  /**
+   * Get the full code (prefix + serial + check digit) at an index
+   * @param {number} index
+   * @returns {string}
+   */
+  get(index) {
+    return this.prefix + String(this.values[index]).padStart(this.width, '0') + this.checkDigits[index];
+  }
+
+  *[Symbol.iterator]() {
+    for (let i = 0; i < this.length; i++) {
+      yield this.get(i);
+    }
+  }
+}
+
+/**
+ * Generate a numbered range of codes with valid check digits
+ * @param {object} params
+ * @param {string} params.type - Key of SEQUENCE_TYPES
+ * @param {string} params.prefix - Leading digits shared by every code (e.g. GS1 company prefix)
+ * @param {number} params.start - First serial number
+ * @param {number} params.count - Number of codes
+ * @param {number} params.step - Increment between serial numbers, at least 1
+ * @returns {SerialSequence}
+ */
+export function generateSequence({ type, prefix = '', start = 0, count = 1, step = 1 }) {
+  const sequenceType = SEQUENCE_TYPES[type];
+  if (!sequenceType) {
+    throw new Error(`Sequences are not supported for ${type}`);
+  }
+  if (!/^[0-9]*$/.test(prefix)) {
+    throw new Error('Sequence prefix must contain only digits');
+  }
+  if (!Number.isInteger(start) || !Number.isInteger(count) || start < 0 || count < 1) {
+    throw new Error('Sequence start and count must be whole numbers (count at least 1)');
+  }
+  if (!Number.isInteger(step) || step < 1) {
+    throw new Error('Sequence step must be a whole number of at least 1');
+  }
+
+  const bodyLength = sequenceType.length - 1;
+  const width = bodyLength - prefix.length;
+  if (width < 1) {
+    throw new Error(`${sequenceType.name} prefix must be shorter than ${bodyLength} digits`);
+  }
+
+  const last = start + (count - 1) * step;
+  if (last < 0 || last >= 10 ** width || !Number.isSafeInteger(last)) {
+    throw new Error(`${sequenceType.name} range does not fit in ${width} serial digits after the prefix`);
+  }
+
+  // Serial values (Float64 holds every integer up to 13 digits exactly)
+  const values = new Float64Array(count);
+  for (let i = 0; i < count; i++) {
+    values[i] = start + i * step;
+  }
+
+  // The prefix contributes the same weighted sum to every code
+  let prefixSum = 0;
+  for (let i = 0; i < prefix.length; i++) {
+    const weight = (bodyLength - i) % 2 === 1 ? 3 : 1;
+    prefixSum += (prefix.charCodeAt(i) - 48) * weight;
+  }
+
+  // Split serials into 32-bit halves of nine digits so the digit loop stays in integer math
+  const low = new Uint32Array(count);
+  const high = new Uint32Array(count);
+  for (let i = 0; i < count; i++) {
+    const value = values[i];
+    high[i] = Math.floor(value / 1e9);
+    low[i] = value - high[i] * 1e9;
+  }
+
+  // Peel serial digits right to left across all values at once
+  const sums = new Uint16Array(count).fill(prefixSum);
+  for (let position = 0; position < width; position++) {
+    const weight = position % 2 === 0 ? 3 : 1;
+    const digits = position < 9 ? low : high;
+    for (let i = 0; i < count; i++) {
+      const value = digits[i];
+      const quotient = (value / 10) | 0;
+      sums[i] += (value - quotient * 10) * weight;
+      digits[i] = quotient;
+    }
+  }
+
+  const checkDigits = new Uint8Array(count);
+  for (let i = 0; i < count; i++) {
+    checkDigits[i] = (10 - (sums[i] % 10)) % 10;
+  }
+
+  return new SerialSequence(prefix, width, values, checkDigits);
+}
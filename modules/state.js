@@ -11,15 +11,15 @@ export const appState = {
   generator: {
     selectedLogo: null,
     inputValues: {},
+    previewTimeout: null,
   },
 
   // Scanner state
   scanner: {
     isScanning: false,
     scanningTimeout: null,
-    codeReader: null,
-    drawingInterval: null,
     scanHistory: [],
+    sweepCodes: [], // Every code of the last continuous scan, uncapped unlike scanHistory
     resetInProgress: false,
     selectedDeviceId: null,
   },
@@ -105,8 +105,6 @@ export const stateManager = {
   resetScannerState() {
     this.set('scanner.isScanning', false);
     this.set('scanner.scanningTimeout', null);
-    this.set('scanner.codeReader', null);
-    this.set('scanner.drawingInterval', null);
     this.set('scanner.resetInProgress', false);
   },
 
@@ -114,8 +112,10 @@ export const stateManager = {
    * Reset generator state
    */
   resetGeneratorState() {
+    this.get('generator.selectedLogo')?.close();
     this.set('generator.selectedLogo', null);
     this.set('generator.inputValues', {});
+    this.set('generator.previewTimeout', null);
   },
 
   /**
@@ -0,0 +1,418 @@
+/**
+ * SVG optimizer for bwip-js output
+ *
+ * bwip-js emits bars as stroked line segments and 2D modules as one small
+ * polygon each. This pass converts axis-aligned bars and modules into
+ * rectangles, merges touching rectangles into runs (horizontally, then
+ * vertically), and writes a single path per colour with quantized
+ * coordinates. Shapes it does not recognize (text glyphs, curves, elements
+ * with transforms) are kept as they are. It works on strings only, so it
+ * can run in a worker as well as on the main thread.
+ */
+
+const SVG_NAMESPACE = 'http://www.w3.org/2000/svg';
+
+// Attributes the optimizer knows how to fold into a merged path
+const MERGEABLE_PATH_ATTRIBUTES = new Set(['d', 'fill', 'stroke', 'stroke-width', 'text']);
+const MERGEABLE_RECT_ATTRIBUTES = new Set(['x', 'y', 'width', 'height', 'fill']);
+
+/**
+ * Optimize an SVG document produced by bwipjs.toSVG
+ * @param {string} svg - Source SVG markup
+ * @param {object} options
+ * @param {number} options.precision - Decimal places kept in coordinates
+ * @returns {string} Optimized SVG markup
+ */
+export function optimizeSvg(svg, { precision = 2 } = {}) {
+  const openMatch = svg.match(/<svg\b([^>]*)>/);
+  const closeIndex = svg.lastIndexOf('</svg>');
+  if (!openMatch || closeIndex < 0) {
+    return svg;
+  }
+
+  const rootAttributes = parseAttributes(openMatch[1]);
+  const body = svg.slice(openMatch.index + openMatch[0].length, closeIndex);
+  const viewBox = (rootAttributes.viewBox || '').split(/[\s,]+/).map(Number);
+  const quantize = createQuantizer(precision);
+
+  // colour -> { rects: [], paths: [] }, in order of first appearance
+  const layers = new Map();
+  const layerFor = (colour) => {
+    const key = normalizeColour(colour);
+    if (!layers.has(key)) {
+      layers.set(key, { rects: [], paths: [] });
+    }
+    return layers.get(key);
+  };
+
+  const before = []; // Untouched elements painted below the merged layers
+  const after = []; // Untouched elements painted above them
+
+  const elementPattern = /<([a-zA-Z]+)\b([^>]*?)\s*\/>|<([a-zA-Z]+)\b[^>]*>[\s\S]*?<\/\3>/g;
+  let match;
+  while ((match = elementPattern.exec(body)) !== null) {
+    const tag = match[1];
+    const attributes = tag ? parseAttributes(match[2]) : null;
+    const passthrough = layers.size === 0 ? before : after;
+
+    if (tag === 'path' && Object.keys(attributes).every((name) => MERGEABLE_PATH_ATTRIBUTES.has(name))) {
+      if (!mergePath(attributes, layerFor, quantize)) {
+        passthrough.push(match[0]);
+      }
+    } else if (
+      tag === 'rect' &&
+      Object.keys(attributes).every((name) => MERGEABLE_RECT_ATTRIBUTES.has(name)) &&
+      !isBackground(attributes, viewBox)
+    ) {
+      const x = Number(attributes.x || 0);
+      const y = Number(attributes.y || 0);
+      layerFor(attributes.fill).rects.push(
+        quantizeRect({ x0: x, y0: y, x1: x + Number(attributes.width), y1: y + Number(attributes.height) }, quantize)
+      );
+    } else {
+      passthrough.push(match[0]);
+    }
+  }
+
+  const paths = [];
+  layers.forEach((layer, colour) => {
+    const runs = mergeRects(layer.rects);
+    const d =
+      runs
+        .map(
+          (r) =>
+            `M${formatNumber(r.x0)} ${formatNumber(r.y0)}h${formatNumber(quantize(r.x1 - r.x0))}v${formatNumber(
+              quantize(r.y1 - r.y0)
+            )}h${formatNumber(quantize(r.x0 - r.x1))}z`
+        )
+        .join('') + layer.paths.join('');
+
+    if (d) {
+      // Black is the SVG default fill, so it needs no attribute at all
+      const fill = colour === '#000' ? '' : ` fill="${colour}"`;
+      paths.push(`<path${fill} d="${d}"/>`);
+    }
+  });
+
+  const root = ['xmlns', 'width', 'height', 'viewBox']
+    .filter((name) => rootAttributes[name] !== undefined)
+    .map((name) => `${name}="${rootAttributes[name]}"`);
+  if (!rootAttributes.xmlns) {
+    root.unshift(`xmlns="${SVG_NAMESPACE}"`);
+  }
+
+  return `<svg ${root.join(' ')}>${before.join('')}${paths.join('')}${after.join('')}</svg>`;
+}
+
+/**
+ * Fold one bwip path into the colour layers
+ * @returns {boolean} false if the path has to be kept as-is
+ */
+function mergePath(attributes, layerFor, quantize) {
+  const subpaths = parsePathData(attributes.d || '');
+  if (!subpaths) {
+    return false;
+  }
+
+  if (attributes.stroke && (!attributes.fill || attributes.fill === 'none')) {
+    // Stroked bars: straight axis-aligned segments become rectangles of the stroke width
+    const width = Number(attributes['stroke-width'] || 1);
+    const rects = [];
+    for (const subpath of subpaths) {
+      if (subpath.complex || subpath.points.length !== 2 || subpath.closed) {
+        return false;
+      }
+      const [a, b] = subpath.points;
+      if (a.x === b.x) {
+        rects.push({ x0: a.x - width / 2, x1: a.x + width / 2, y0: Math.min(a.y, b.y), y1: Math.max(a.y, b.y) });
+      } else if (a.y === b.y) {
+        rects.push({ x0: Math.min(a.x, b.x), x1: Math.max(a.x, b.x), y0: a.y - width / 2, y1: a.y + width / 2 });
+      } else {
+        return false;
+      }
+    }
+    const layer = layerFor(attributes.stroke);
+    rects.forEach((rect) => layer.rects.push(quantizeRect(rect, quantize)));
+    return true;
+  }
+
+  if (attributes.stroke) {
+    return false; // Filled and stroked at once - leave it alone
+  }
+
+  const layer = layerFor(attributes.fill || '#000000');
+  for (const subpath of subpaths) {
+    const rect = !subpath.complex && rectangleFromPoints(subpath.points);
+    if (rect) {
+      layer.rects.push(quantizeRect(rect, quantize));
+    } else {
+      layer.paths.push(quantizePathData(subpath.source, quantize));
+    }
+  }
+  return true;
+}
+
+/**
+ * Split path data into absolute subpaths
+ * @returns {Array<{points: Array<{x: number, y: number}>, closed: boolean, complex: boolean, source: string}>|null}
+ */
+function parsePathData(d) {
+  const tokens = d.match(/[MmLlHhVvZzCcSsQqTtAa]|-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?/g);
+  if (!tokens || !/^[Mm]$/.test(tokens[0])) {
+    return null;
+  }
+
+  const subpaths = [];
+  let current = null;
+  let command = null;
+  let x = 0;
+  let y = 0;
+  let startX = 0;
+  let startY = 0;
+  let i = 0;
+
+  const next = () => Number(tokens[i++]);
+  const parameterCounts = { c: 6, s: 4, q: 4, t: 2, a: 7 };
+
+  while (i < tokens.length) {
+    if (/^[A-Za-z]$/.test(tokens[i])) {
+      command = tokens[i++];
+    } else if (!command) {
+      return null;
+    }
+
+    const lower = command.toLowerCase();
+    const relative = command !== command.toUpperCase();
+
+    if (lower === 'z') {
+      if (current) {
+        current.closed = true;
+        current.end = i;
+      }
+      x = startX;
+      y = startY;
+      command = null; // "z" takes no parameters, so a number may not follow it
+      continue;
+    }
+
+    if (lower === 'm') {
+      const mx = next();
+      const my = next();
+      // A leading "m" is absolute; later ones are relative to the current point
+      x = relative && subpaths.length > 0 ? x + mx : mx;
+      y = relative && subpaths.length > 0 ? y + my : my;
+      startX = x;
+      startY = y;
+      current = { points: [{ x, y }], closed: false, complex: false, start: i - 3, end: i };
+      subpaths.push(current);
+      command = relative ? 'l' : 'L'; // Extra coordinate pairs are implicit lineto
+      continue;
+    }
+
+    if (!current) {
+      return null;
+    }
+
+    if (lower === 'l') {
+      const lx = next();
+      const ly = next();
+      x = relative ? x + lx : lx;
+      y = relative ? y + ly : ly;
+      current.points.push({ x, y });
+    } else if (lower === 'h') {
+      const hx = next();
+      x = relative ? x + hx : hx;
+      current.points.push({ x, y });
+    } else if (lower === 'v') {
+      const vy = next();
+      y = relative ? y + vy : vy;
+      current.points.push({ x, y });
+    } else if (parameterCounts[lower]) {
+      const values = [];
+      for (let k = 0; k < parameterCounts[lower]; k++) values.push(next());
+      x = relative ? x + values[values.length - 2] : values[values.length - 2];
+      y = relative ? y + values[values.length - 1] : values[values.length - 1];
+      current.complex = true;
+    } else {
+      return null;
+    }
+
+    if (Number.isNaN(x) || Number.isNaN(y)) {
+      return null;
+    }
+    current.end = i;
+  }
+
+  // Subpaths that cannot become rectangles are kept, so each needs standalone path
+  // data: polylines are rebuilt from their absolute points, and curves are copied
+  // verbatim, which is only safe when the path uses absolute commands throughout
+  const hasRelative = tokens.some((token, k) => k > 0 && /^[a-y]$/.test(token));
+  for (const subpath of subpaths) {
+    if (!subpath.complex) {
+      const polyline = ['M'];
+      subpath.points.forEach((point, k) => {
+        if (k === 1) polyline.push('L');
+        polyline.push(point.x, point.y);
+      });
+      if (subpath.closed) polyline.push('Z');
+      subpath.source = joinTokens(polyline);
+    } else if (hasRelative) {
+      return null;
+    } else {
+      const source = tokens.slice(subpath.start, subpath.end);
+      source[0] = 'M';
+      subpath.source = joinTokens(source);
+    }
+  }
+
+  return subpaths;
+}
+
+/**
+ * Return the bounding rectangle if a closed polyline is an axis-aligned rectangle
+ */
+function rectangleFromPoints(points) {
+  const pts = points.slice();
+  if (pts.length === 5 && pts[0].x === pts[4].x && pts[0].y === pts[4].y) {
+    pts.pop();
+  }
+  if (pts.length !== 4) {
+    return null;
+  }
+
+  for (let k = 0; k < 4; k++) {
+    const a = pts[k];
+    const b = pts[(k + 1) % 4];
+    if (a.x !== b.x && a.y !== b.y) {
+      return null; // Diagonal edge
+    }
+  }
+
+  const xs = pts.map((p) => p.x);
+  const ys = pts.map((p) => p.y);
+  const rect = { x0: Math.min(...xs), x1: Math.max(...xs), y0: Math.min(...ys), y1: Math.max(...ys) };
+  return rect.x1 > rect.x0 && rect.y1 > rect.y0 ? rect : null;
+}
+
+/**
+ * Merge touching rectangles into horizontal runs, then stack identical runs vertically
+ */
+function mergeRects(rects) {
+  const mergeAlong = (items, bandKey, start, end) => {
+    const bands = new Map();
+    items.forEach((rect) => {
+      const key = bandKey(rect);
+      if (!bands.has(key)) bands.set(key, []);
+      bands.get(key).push(rect);
+    });
+
+    const merged = [];
+    bands.forEach((band) => {
+      band.sort((a, b) => a[start] - b[start]);
+      let run = { ...band[0] };
+      for (let k = 1; k < band.length; k++) {
+        if (band[k][start] <= run[end]) {
+          run[end] = Math.max(run[end], band[k][end]);
+        } else {
+          merged.push(run);
+          run = { ...band[k] };
+        }
+      }
+      merged.push(run);
+    });
+    return merged;
+  };
+
+  const rows = mergeAlong(rects, (r) => `${r.y0},${r.y1}`, 'x0', 'x1');
+  const runs = mergeAlong(rows, (r) => `${r.x0},${r.x1}`, 'y0', 'y1');
+  return runs.sort((a, b) => a.y0 - b.y0 || a.x0 - b.x0);
+}
+
+/**
+ * Check whether a rect is a full-size background
+ *
+ * bwip-js draws backgroundcolor as width="100%" height="100%"; any size that
+ * is not a plain number counts as background, so it is kept as it is instead
+ * of being merged into a path.
+ */
+function isBackground(attributes, viewBox) {
+  const sizes = [attributes.x || 0, attributes.y || 0, attributes.width, attributes.height];
+  if (!sizes.every((value) => Number.isFinite(Number(value)))) {
+    return true;
+  }
+  if (viewBox.length !== 4) {
+    return false;
+  }
+  return (
+    Number(attributes.x || 0) <= viewBox[0] &&
+    Number(attributes.y || 0) <= viewBox[1] &&
+    Number(attributes.width) >= viewBox[2] &&
+    Number(attributes.height) >= viewBox[3]
+  );
+}
+
+/**
+ * Parse an attribute string into an object
+ */
+function parseAttributes(source) {
+  const attributes = {};
+  const pattern = /([\w:-]+)\s*=\s*"([^"]*)"/g;
+  let match;
+  while ((match = pattern.exec(source)) !== null) {
+    attributes[match[1]] = match[2];
+  }
+  return attributes;
+}
+
+/**
+ * Create a rounding function for the given number of decimals
+ */
+function createQuantizer(precision) {
+  const factor = 10 ** precision;
+  return (value) => Math.round(value * factor) / factor;
+}
+
+function quantizeRect(rect, quantize) {
+  return { x0: quantize(rect.x0), y0: quantize(rect.y0), x1: quantize(rect.x1), y1: quantize(rect.y1) };
+}
+
+function quantizePathData(d, quantize) {
+  return d.replace(/-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?/g, (number) => formatNumber(quantize(Number(number))));
+}
+
+/**
+ * Shortest decimal form of a number (drops leading zeros: 0.5 -> .5)
+ */
+function formatNumber(value) {
+  return String(value).replace(/^(-?)0\./, '$1.');
+}
+
+/**
+ * Join path tokens, adding separators only between adjacent numbers
+ */
+function joinTokens(tokens) {
+  let d = '';
+  tokens.forEach((token) => {
+    const text = typeof token === 'number' ? formatNumber(token) : token;
+    if (d && /[\d.]$/.test(d) && /^[\d.]/.test(text)) {
+      d += ' ';
+    }
+    d += text;
+  });
+  return d;
+}
+
+/**
+ * Normalize colours so equal colours share a layer (#000000 -> #000)
+ */
+function normalizeColour(colour) {
+  let value = (colour || '#000000').trim().toLowerCase();
+  if (/^[0-9a-f]{6}$/.test(value)) {
+    value = '#' + value;
+  }
+  const long = value.match(/^#([0-9a-f])\1([0-9a-f])\2([0-9a-f])\3$/);
+  if (long) {
+    value = `#${long[1]}${long[2]}${long[3]}`;
+  }
+  return value === 'black' ? '#000' : value;
+}
@@ -204,3 +204,33 @@ export function getBarcodeFormatName(formatNumber) {
 
   return formatNames[formatNumber] || `Unknown (${formatNumber})`;
 }
+
+/**
+ * Lookup table for the CRC-32 (IEEE 802.3) polynomial used by ZIP and PNG.
+ */
+const CRC32_TABLE = (() => {
+  const table = new Uint32Array(256);
+  for (let n = 0; n < 256; n++) {
+    let c = n;
+    for (let k = 0; k < 8; k++) {
+      c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+    }
+    table[n] = c >>> 0;
+  }
+  return table;
+})();
+
+/**
+ * Computes a CRC-32 checksum, optionally continuing from a previous value
+ * so that data can be checksummed chunk by chunk.
+ * @param {Uint8Array} bytes
+ * @param {number} crc - CRC of the preceding chunks (0 to start)
+ * @return {number}
+ */
+export function crc32(bytes, crc = 0) {
+  let c = (crc ^ 0xffffffff) >>> 0;
+  for (let i = 0; i < bytes.length; i++) {
+    c = CRC32_TABLE[(c ^ bytes[i]) & 0xff] ^ (c >>> 8);
+  }
+  return (c ^ 0xffffffff) >>> 0;
+}
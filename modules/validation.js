@@ -0,0 +1,294 @@
+/**
+ * Input validation - Table-driven rules for every supported symbology
+ *
+ * Each rule is compiled once into lookup tables (allowed character codes,
+ * allowed lengths), so validating a row is a single pass over its characters
+ * with no regex backtracking and no DOM access. All problems with a value are
+ * reported, not just the first.
+ */
+import { gs1CheckDigit } from './sequence.js';
+import { qrSegmentBits } from './qrSegments.js';
+
+const DIGITS = '0123456789';
+const UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ';
+const QR_ALPHANUMERIC = DIGITS + UPPER + ' $%*+-./:';
+
+/**
+ * Build a lookup table of allowed ASCII character codes
+ * @param {string} characters
+ * @returns {Uint8Array}
+ */
+function charset(characters) {
+  const table = new Uint8Array(128);
+  for (let i = 0; i < characters.length; i++) {
+    table[characters.charCodeAt(i)] = 1;
+  }
+  return table;
+}
+
+const ASCII = new Uint8Array(128).fill(1);
+const DIGIT_TABLE = charset(DIGITS);
+const QR_ALPHANUMERIC_TABLE = charset(QR_ALPHANUMERIC);
+
+/**
+ * Validation rules per barcode type (keys match the generator's type select)
+ *
+ * charset      - Allowed ASCII characters; null allows any text (encoded as bytes)
+ * lengths      - Allowed exact lengths
+ * evenLength   - Length must be even
+ * checkDigit   - Length at which the last digit is a GS1 mod-10 check digit
+ * guards       - Allowed first/last characters (Codabar start/stop)
+ * capacity     - Maximum characters in the largest symbol, by content class; with segmentBits,
+ *                content over its class limit is still accepted when a mix of QR modes fits
+ */
+export const VALIDATION_RULES = {
+  qrcode: {
+    name: 'QR Code',
+    charset: null,
+    capacity: { numeric: 7089, alphanumeric: 4296, bytes: 2953, segmentBits: 23648 }, // Version 40-L
+  },
+  datamatrix: {
+    name: 'Data Matrix',
+    charset: null,
+    capacity: { numeric: 3116, text: 2335, bytes: 1556 }, // 144x144
+  },
+  pdf417: {
+    name: 'PDF417',
+    charset: null,
+    capacity: { numeric: 2710, text: 1850, bytes: 1108 }, // Security level 0
+  },
+  azteccode: {
+    name: 'Aztec Code',
+    charset: null,
+    capacity: { numeric: 3832, text: 3067, bytes: 1914 }, // 32 layers
+  },
+  ean13: {
+    name: 'EAN-13',
+    charset: DIGIT_TABLE,
+    lengths: [12, 13],
+    checkDigit: 13,
+    lengthMessage: 'EAN-13 requires 12 digits (or 13 including the check digit)',
+  },
+  ean8: {
+    name: 'EAN-8',
+    charset: DIGIT_TABLE,
+    lengths: [7, 8],
+    checkDigit: 8,
+    lengthMessage: 'EAN-8 requires 7 digits (or 8 including the check digit)',
+  },
+  upca: {
+    name: 'UPC-A',
+    charset: DIGIT_TABLE,
+    lengths: [11, 12],
+    checkDigit: 12,
+    lengthMessage: 'UPC-A requires 11 digits (or 12 including the check digit)',
+  },
+  upce: {
+    name: 'UPC-E',
+    charset: DIGIT_TABLE,
+    lengths: [6],
+    lengthMessage: 'UPC-E requires exactly 6 digits',
+  },
+  code39: {
+    name: 'CODE 39',
+    charset: charset(DIGITS + UPPER + ' -.$/+%'),
+    charsetMessage: 'CODE 39 allows only A-Z, 0-9, space and - . $ / + %',
+  },
+  code128: {
+    name: 'CODE 128',
+    charset: ASCII,
+    charsetMessage: 'CODE 128 allows only ASCII characters',
+  },
+  interleaved2of5: {
+    name: 'ITF',
+    charset: DIGIT_TABLE,
+    evenLength: true,
+    lengthMessage: 'ITF requires an even number of digits',
+  },
+  codabar: {
+    name: 'CODABAR',
+    charset: charset(DIGITS + 'ABCD-$:/.+'),
+    guards: charset('ABCD'),
+    charsetMessage: 'CODABAR must start and end with A, B, C, or D and contain only valid characters',
+  },
+};
+
+const NO_ERRORS = Object.freeze([]);
+
+/**
+ * Count UTF-8 bytes without allocating an encoded copy
+ */
+function utf8Length(text) {
+  let bytes = 0;
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    if (code < 0x80) bytes += 1;
+    else if (code < 0x800) bytes += 2;
+    else if (code >= 0xd800 && code <= 0xdbff) {
+      bytes += 4;
+      i++; // Surrogate pair
+    } else bytes += 3;
+  }
+  return bytes;
+}
+
+/**
+ * Check one value against a rule
+ * @param {string} type - Key of VALIDATION_RULES
+ * @param {string} text
+ * @returns {Array<{code: string, message: string}>} Empty when the value is valid
+ */
+export function validateValue(type, text) {
+  const rule = VALIDATION_RULES[type];
+  if (!rule) {
+    return [{ code: 'type', message: `Unsupported barcode type: ${type}` }];
+  }
+  if (!text) {
+    return [{ code: 'empty', message: 'Value is empty' }];
+  }
+
+  let errors = NO_ERRORS;
+  const fail = (code, message) => {
+    if (errors === NO_ERRORS) errors = [];
+    errors.push({ code, message });
+  };
+
+  // One pass classifies the content and checks the charset
+  const table = rule.charset;
+  let allDigits = true;
+  let allQrAlphanumeric = true;
+  let allAscii = true;
+  let badCharacter = false;
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    if (code >= 128) {
+      allDigits = allQrAlphanumeric = allAscii = false;
+      if (table) badCharacter = true;
+      continue;
+    }
+    if (!DIGIT_TABLE[code]) allDigits = false;
+    if (!QR_ALPHANUMERIC_TABLE[code]) allQrAlphanumeric = false;
+    if (table && !table[code]) badCharacter = true;
+  }
+
+  if (badCharacter) {
+    fail('charset', rule.charsetMessage || `${rule.name} allows only digits`);
+  }
+
+  const length = text.length;
+  if (rule.lengths && !rule.lengths.includes(length)) {
+    fail('length', rule.lengthMessage);
+  }
+  if (rule.evenLength && length % 2 !== 0) {
+    fail('length', rule.lengthMessage);
+  }
+
+  if (rule.guards) {
+    const first = text.charCodeAt(0);
+    const last = text.charCodeAt(length - 1);
+    let innerGuard = false;
+    for (let i = 1; i < length - 1; i++) {
+      if (rule.guards[text.charCodeAt(i)]) innerGuard = true;
+    }
+    if (length < 2 || !rule.guards[first] || !rule.guards[last] || innerGuard) {
+      fail('guards', rule.charsetMessage);
+    }
+  }
+
+  if (rule.checkDigit === length && allDigits) {
+    if (gs1CheckDigit(text.slice(0, -1)) !== text.charCodeAt(length - 1) - 48) {
+      fail('checkDigit', `${rule.name} check digit is incorrect`);
+    }
+  }
+
+  if (rule.capacity) {
+    const { capacity } = rule;
+    let limit, size, unit;
+    if (allDigits) {
+      [limit, size, unit] = [capacity.numeric, length, 'digits'];
+    } else if (capacity.alphanumeric && allQrAlphanumeric) {
+      [limit, size, unit] = [capacity.alphanumeric, length, 'characters'];
+    } else if (capacity.text && allAscii) {
+      [limit, size, unit] = [capacity.text, length, 'characters'];
+    } else {
+      [limit, size, unit] = [capacity.bytes, utf8Length(text), 'bytes'];
+    }
+    if (size > limit) {
+      // e.g. "ABC...abc" is over the byte limit but fits as an alphanumeric and a byte segment
+      const bits = capacity.segmentBits ? qrSegmentBits(text, 40) : Infinity;
+      if (bits > capacity.segmentBits) {
+        fail('capacity', `${rule.name} holds at most ${limit} ${unit}; this value has ${size}`);
+      }
+    }
+  }
+
+  return errors;
+}
+
+/**
+ * Validate many values in one pass
+ * @param {string} type - Key of VALIDATION_RULES
+ * @param {Iterable<string>} rows
+ * @returns {{results: Array<{row: number, ok: boolean, errors: Array<{code: string, message: string}>}>,
+ *   validCount: number, invalidCount: number}} Rows are numbered from 1
+ */
+export function validateRows(type, rows) {
+  const results = [];
+  let validCount = 0;
+  let row = 0;
+
+  for (const value of rows) {
+    row++;
+    const errors = validateValue(type, value == null ? '' : String(value).trim());
+    const ok = errors.length === 0;
+    if (ok) validCount++;
+    results.push({ row, ok, errors });
+  }
+
+  return { results, validCount, invalidCount: row - validCount };
+}
+
+/**
+ * Extract one column from CSV text (RFC 4180 quoting)
+ * @param {string} csv
+ * @param {number} column - Zero-based column index
+ * @returns {string[]}
+ */
+export function csvColumn(csv, column = 0) {
+  const values = [];
+  let field = 0;
+  let value = '';
+  let quoted = false;
+
+  for (let i = 0; i < csv.length; i++) {
+    const char = csv[i];
+    if (quoted) {
+      if (char === '"') {
+        if (csv[i + 1] === '"') {
+          if (field === column) value += '"';
+          i++;
+        } else {
+          quoted = false;
+        }
+      } else if (field === column) {
+        value += char;
+      }
+    } else if (char === '"') {
+      quoted = true;
+    } else if (char === ',') {
+      field++;
+    } else if (char === '\n' || char === '\r') {
+      if (char === '\r' && csv[i + 1] === '\n') i++;
+      values.push(value);
+      value = '';
+      field = 0;
+    } else if (field === column) {
+      value += char;
+    }
+  }
+
+  if (value !== '' || field > 0) {
+    values.push(value);
+  }
+  return values;
+}
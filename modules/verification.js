@@ -0,0 +1,111 @@
+/**
+ * Scannability verification - Decodes a rendered symbol and degraded copies of it
+ *
+ * A symbol passes when the decoder reads back the encoded text. The margin is
+ * the share of degraded variants (downscaled, blurred) that still read back,
+ * which separates codes that scan comfortably from codes that only scan under
+ * ideal conditions.
+ */
+
+/**
+ * Generator barcode types -> ZXing.BarcodeFormat names
+ */
+export const ZXING_FORMATS = {
+  qrcode: 'QR_CODE',
+  datamatrix: 'DATA_MATRIX',
+  pdf417: 'PDF_417',
+  azteccode: 'AZTEC',
+  ean13: 'EAN_13',
+  ean8: 'EAN_8',
+  upca: 'UPC_A',
+  upce: 'UPC_E',
+  code39: 'CODE_39',
+  code128: 'CODE_128',
+  interleaved2of5: 'ITF',
+  codabar: 'CODABAR',
+};
+
+/**
+ * Degraded copies each symbol is checked against, mildest first
+ */
+export const VERIFY_VARIANTS = [
+  { name: '50% size', scale: 0.5 },
+  { name: '33% size', scale: 1 / 3 },
+  { name: '1px blur', blur: 1 },
+  { name: '2px blur', blur: 2 },
+  { name: '50% size + 1px blur', scale: 0.5, blur: 1 },
+];
+
+// Types whose decoded text carries digits the input leaves out (check digits, UPC-E number system)
+const DIGIT_EXTENDED_TYPES = ['ean13', 'ean8', 'upca', 'upce', 'interleaved2of5'];
+
+/**
+ * Check decoded text against the text that was encoded
+ * @param {string} barcodeType
+ * @param {string} expected - Generator input
+ * @param {string|null} decoded
+ * @returns {boolean}
+ */
+export function matchesExpected(barcodeType, expected, decoded) {
+  if (decoded === null) return false;
+  if (decoded === expected) return true;
+  if (DIGIT_EXTENDED_TYPES.includes(barcodeType)) {
+    return decoded.includes(expected);
+  }
+  if (barcodeType === 'codabar') {
+    // Start/stop characters may or may not be reported
+    return decoded === expected.slice(1, -1);
+  }
+  return false;
+}
+
+/**
+ * Verify a rendered symbol in a decode worker
+ * @param {DecodePool} pool
+ * @param {ImageBitmap} bitmap - Transferred to the worker
+ * @param {string} barcodeType
+ * @param {string} text
+ * @returns {Promise<{pass: boolean, decoded: string|null, decodeMs: number, margin: number, variants: Array<{name: string, ok: boolean}>}>}
+ */
+export async function verifySymbol(pool, bitmap, barcodeType, text) {
+  const reply = await pool.run(
+    {
+      type: 'verify',
+      bitmap,
+      formats: ZXING_FORMATS[barcodeType] ? [ZXING_FORMATS[barcodeType]] : [],
+      variants: VERIFY_VARIANTS,
+    },
+    [bitmap]
+  );
+
+  const pass = matchesExpected(barcodeType, text, reply.text);
+  const passedVariants = pass ? reply.variants.filter((variant) => variant.ok).length : 0;
+
+  return {
+    pass,
+    decoded: reply.text,
+    decodeMs: reply.decodeMs,
+    margin: reply.variants.length ? passedVariants / reply.variants.length : 0,
+    variants: reply.variants,
+  };
+}
+
+/**
+ * One-line summary of a verification result for the UI
+ * @param {object} result - Return value of verifySymbol
+ * @returns {string}
+ */
+export function describeVerification(result) {
+  const time = `${result.decodeMs.toFixed(0)} ms`;
+  if (!result.pass) {
+    return result.decoded === null
+      ? `❌ Did not scan (${time}). Try a higher error correction level, a smaller logo or more padding.`
+      : `❌ Scanned as different text (${time}): ${result.decoded}`;
+  }
+
+  const failed = result.variants.filter((variant) => !variant.ok).map((variant) => variant.name);
+  const margin = `${Math.round(result.margin * 100)}% margin`;
+  return failed.length === 0
+    ? `✅ Scans (${time}, ${margin}: survives every degraded copy)`
+    : `⚠️ Scans (${time}, ${margin}: fails at ${failed.join(', ')})`;
+}
@@ -1,5 +1,5 @@
 // Cache names
-const CACHE_NAME = 'barcode-tool-cache-v10';
+const CACHE_NAME = 'barcode-tool-cache-v33';
 const ASSETS = [
   '/',
   '',
@@ -12,8 +12,35 @@ const ASSETS = [
   'modules/state.js',
   'modules/ui.js',
   'modules/utils.js',
+  'modules/loader.js',
+  'modules/ZipWriter.js',
+  'modules/labelSheet.js',
+  'modules/svgOptimizer.js',
+  'modules/sequence.js',
+  'modules/LogoCache.js',
+  'modules/DecodePool.js',
+  'modules/decodeWorker.js',
+  'modules/verification.js',
+  'modules/printSize.js',
+  'modules/barcodeCore.js',
+  'modules/validation.js',
+  'modules/capacity.js',
+  'modules/qrSegments.js',
+  'modules/linkedSymbols.js',
+  'modules/renderWorker.js',
+  'modules/fountain.js',
+  'modules/qrPinning.js',
+  'modules/nativeDetector.js',
+  'modules/engines.js',
+  'modules/scanWindow.js',
+  'modules/localizer.js',
+  'modules/scanGovernor.js',
+  'modules/formatProfile.js',
   'manifest.json',
   'icons/favicon.png',
+  'calibration/qrcode.png',
+  'calibration/code128.png',
+  'calibration/ean13.png',
   'https://unpkg.com/bwip-js/dist/bwip-js-min.js',
   'https://unpkg.com/@zxing/library@latest',
 ];
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test streamed batch ZIP export: PNG entries stored, SVG entries deflated
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+import zipfile
+from playwright.async_api import async_playwright
+
+async def export_batch(page, output_format, payloads):
+    """Run a batch export through the UI and return the downloaded archive path"""
+    await page.select_option('#outputFormat', output_format)
+    await page.fill('#batchInput', '\n'.join(payloads))
+
+    async with page.expect_download() as download_info:
+        await page.click('#batchExportBtn')
+
+    download = await download_info.value
+    path = f'screenshots/{download.suggested_filename}'
+    await download.save_as(path)
+    return path
+
+async def test_batch_zip_export():
+    """Test that batch export produces a valid ZIP with one entry per valid row"""
+
+    # Start server
+    PORT = 38461
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(accept_downloads=True)
+            page = await context.new_page()
+
+            # Capture console errors
+            console_errors = []
+            page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            # Force the download fallback instead of the native save dialog
+            await page.evaluate("() => { delete window.showSaveFilePicker; }")
+
+            print("✓ App loaded")
+
+            # EAN-13 batch with one invalid row
+            await page.select_option('#barcodeType', 'ean13')
+            payloads = [f'590123412{i:03d}' for i in range(40)] + ['not-a-number']
+            path = await export_batch(page, 'canvas', payloads)
+
+            with zipfile.ZipFile(path) as archive:
+                bad_entry = archive.testzip()
+                infos = archive.infolist()
+                print(f"PNG archive: {len(infos)} entries, first: {infos[0].filename}")
+
+                if bad_entry is None and len(infos) == 40:
+                    print("✅ PNG archive is valid and skipped the invalid row")
+                else:
+                    print(f"❌ Unexpected PNG archive contents (bad entry: {bad_entry})")
+
+                if all(info.compress_type == zipfile.ZIP_STORED for info in infos):
+                    print("✅ PNG entries are stored uncompressed")
+                else:
+                    print("❌ PNG entries were recompressed")
+
+                if archive.read(infos[0].filename)[:8] == b'\x89PNG\r\n\x1a\n':
+                    print("✅ Entries contain PNG data")
+
+            # QR batch as SVG
+            await page.select_option('#barcodeType', 'qrcode')
+            path = await export_batch(page, 'svg', [f'https://example.com/item/{i}' for i in range(10)])
+
+            with zipfile.ZipFile(path) as archive:
+                infos = archive.infolist()
+                print(f"SVG archive: {len(infos)} entries")
+                if archive.testzip() is None and all(info.compress_type == zipfile.ZIP_DEFLATED for info in infos):
+                    print("✅ SVG entries are deflated")
+                else:
+                    print("❌ SVG entries are not deflated")
+
+                if b'<svg' in archive.read(infos[0].filename):
+                    print("✅ Entries contain SVG markup")
+
+            if console_errors:
+                print("❌ Console errors:")
+                for error in console_errors:
+                    print(f"  - {error}")
+            else:
+                print("✅ No console errors")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_batch_zip_export())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test the capacity model: predicted symbol sizes, logo ECC raise and fail-fast rejection
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_capacity_estimator():
+    """Test capacity predictions against known symbol limits and the generator integration"""
+
+    # Start server
+    PORT = 38470
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            result = await page.evaluate("""async () => {
+                const { qrVersionFor, planSymbol } = await import('./modules/capacity.js');
+                const { validateValue } = await import('./modules/validation.js');
+
+                // Published QR Code capacities (ISO 18004 table 7)
+                const versions = [
+                    [qrVersionFor('1'.repeat(41), 'L'), 1],
+                    [qrVersionFor('1'.repeat(42), 'L'), 2],
+                    [qrVersionFor('A'.repeat(25), 'L'), 1],
+                    [qrVersionFor('a'.repeat(14), 'H'), 2],
+                    [qrVersionFor('a'.repeat(2953), 'L'), 40],
+                    [qrVersionFor('a'.repeat(2954), 'L'), 0],
+                ];
+
+                const logo = planSymbol('qrcode', 'https://example.com', { eclevel: 'L', logo: {} });
+                const tooLong = planSymbol('qrcode', 'x'.repeat(2000), { eclevel: 'H' });
+                const matrix = planSymbol('datamatrix', '1234567890', {});
+                const linear = planSymbol('ean13', '590123412345', {});
+
+                // Rendering refuses an oversized payload before bwip-js runs
+                let rejected = null;
+                const start = performance.now();
+                try {
+                    await window.appModules.generator.generate({ type: 'qrcode', text: 'x'.repeat(2000),
+                        options: { eclevel: 'H' }, format: 'png' });
+                } catch (error) {
+                    rejected = error.message;
+                }
+
+                // Near the limits in validation.js: accepted below, rejected just above
+                const printable = Array.from({ length: 1680 }, (_, i) => String.fromCharCode(32 + ((i * 7) % 95))).join('');
+                const nearLimits = [
+                    ['azteccode', 'a'.repeat(2000), true],
+                    ['azteccode', 'A'.repeat(3067), true],
+                    ['azteccode', 'A'.repeat(3068), false],
+                    ['datamatrix', 'A'.repeat(1800), true],
+                    ['datamatrix', 'A'.repeat(2336), false],
+                    ['pdf417', printable, true],
+                    ['pdf417', 'X'.repeat(1851), false],
+                ].map(([type, text, expected]) => [type, text.length, planSymbol(type, text, {}).fits, expected]);
+
+                // Payloads that fit are left to bwip-js rather than refused by the estimate
+                const rendered = [];
+                for (const [type, text] of [['azteccode', 'a'.repeat(2000)], ['datamatrix', 'A'.repeat(1800)], ['pdf417', printable]]) {
+                    try {
+                        await window.appModules.generator.generate({ type, text, format: 'png' });
+                        rendered.push([type, 'ok']);
+                    } catch (error) {
+                        rendered.push([type, error.message]);
+                    }
+                }
+
+                // Mixed content: over the byte-mode limit, but fits as an alphanumeric and a byte segment
+                const mixedText = 'A'.repeat(4000) + 'a';
+                const mixed = {
+                    plan: planSymbol('qrcode', mixedText, { eclevel: 'L' }),
+                    pinned: planSymbol('qrcode', 'ORDER ' + '1'.repeat(40) + ' abc', { eclevel: 'L', version: 3 }),
+                    tooLong: planSymbol('qrcode', mixedText + 'a'.repeat(800), { eclevel: 'L' }).fits,
+                    validation: validateValue('qrcode', mixedText),
+                    rendered: null,
+                };
+                try {
+                    const png = await window.appModules.generator.generate({
+                        type: 'qrcode', text: mixedText, options: { eclevel: 'L', mask: 'auto' }, format: 'png',
+                    });
+                    mixed.rendered = png.size > 0 ? 'ok' : 'empty';
+                } catch (error) {
+                    mixed.rendered = error.message;
+                }
+
+                return {
+                    mixed,
+                    nearLimits,
+                    rendered,
+                    versions,
+                    logo,
+                    tooLong,
+                    matrix,
+                    linear,
+                    rejected,
+                    rejectMs: performance.now() - start,
+                };
+            }""")
+
+            wrong = [pair for pair in result['versions'] if pair[0] != pair[1]]
+            if not wrong:
+                print("✅ QR versions match the published capacity table")
+            else:
+                print(f"❌ Version mismatches (predicted, expected): {wrong}")
+
+            mixed = result['mixed']
+            print(f"Mixed content plan: {mixed['plan']}")
+            if mixed['plan']['fits'] and mixed['pinned']['fits'] and not mixed['validation'] and not mixed['tooLong']:
+                print("✅ Mixed-mode QR payloads are accepted up to the real limit")
+            else:
+                print(f"❌ Mixed content: {mixed}")
+
+            if mixed['rendered'] == 'ok':
+                print("✅ Mixed-mode QR payload renders with auto pinning")
+            else:
+                print(f"❌ Mixed-mode render: {mixed['rendered']}")
+
+            wrong = [case for case in result['nearLimits'] if case[2] != case[3]]
+            if not wrong:
+                print("✅ Data Matrix, PDF417 and Aztec limits agree with validation")
+            else:
+                print(f"❌ Plans disagreeing with validation (type, length, fits, expected): {wrong}")
+
+            failed = [case for case in result['rendered'] if case[1] != 'ok']
+            if not failed:
+                print("✅ Payloads near the limits render")
+            else:
+                print(f"❌ Render failures: {failed}")
+
+            print(f"Logo plan: {result['logo']}")
+            if result['logo']['fits'] and result['logo']['overrides'].get('eclevel') == 'H':
+                print("✅ Error correction raised to H when a logo is present")
+
+            print(f"Too long: {result['tooLong']}")
+            if not result['tooLong']['fits'] and 'level M fits' in result['tooLong']['message']:
+                print("✅ Oversized payload rejected with a level that would fit")
+
+            if result['matrix']['size'] == '12x12' and result['linear'] is None:
+                print("✅ Data Matrix size predicted; linear types have no plan")
+            else:
+                print(f"❌ Unexpected plans: {result['matrix']}, {result['linear']}")
+
+            print(f"Render rejected in {result['rejectMs']:.1f}ms: {result['rejected']}")
+            if result['rejected'] and 'Too long' in result['rejected']:
+                print("✅ Generation fails fast without a render attempt")
+
+            # The form shows the predicted size as the user types
+            await page.select_option('#barcodeType', 'qrcode')
+            await page.fill('#textInput', 'HELLO WORLD')
+            info = await page.text_content('#capacityInfo')
+            print(f"Capacity info: {info}")
+            if 'Version 1' in info:
+                print("✅ Capacity info updates with the input")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_capacity_estimator())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test continuous scanning: every code in a frame, deduplication and the throughput counter
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_continuous_scan():
+    """Test that a shelf of codes is recorded once each while the camera keeps running"""
+
+    # Start server
+    PORT = 38481
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            # Fake camera showing two rows of labels; window.shelf selects which ones
+            await page.evaluate("""async () => {
+                const labels = [];
+                for (let i = 1; i <= 16; i++) {
+                    labels.push(await window.appModules.generator.generate({
+                        type: 'qrcode', text: `SHELF-${i}`, options: { scale: 4, backgroundcolor: 'ffffff' }, format: 'canvas',
+                    }));
+                }
+                window.shelf = [0, 1, 2, 3, 4, 5, 6, 7];
+                const camera = document.createElement('canvas');
+                camera.width = 1280;
+                camera.height = 720;
+                const ctx = camera.getContext('2d');
+                setInterval(() => {
+                    ctx.fillStyle = '#fff';
+                    ctx.fillRect(0, 0, 1280, 720);
+                    window.shelf.forEach((label, slot) => {
+                        ctx.drawImage(labels[label], 80 + (slot % 4) * 300, 120 + Math.floor(slot / 4) * 300);
+                    });
+                }, 33);
+
+                navigator.mediaDevices.getUserMedia = async () => camera.captureStream(30);
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+                localStorage.removeItem('barcode-tool-saved-data');
+            }""")
+
+            await page.click('button:has-text("Scan Barcodes")')
+            await page.select_option('#scanWindowSize', '0')
+            await page.check('#continuousScan')
+            await page.fill('#dedupeSeconds', '60')
+            await page.click('#scanButton')
+
+            await page.wait_for_function(
+                "window.appModules.scanner.scanStats && window.appModules.scanner.scanStats.uniqueCodes >= 8",
+                timeout=30000,
+            )
+            await page.wait_for_timeout(2000)  # Keep the same labels in view
+
+            first = await page.evaluate("""() => ({
+                unique: window.appModules.scanner.scanStats.uniqueCodes,
+                sweep: window.appModules.scanner.getSweepCodes().map((scan) => scan.text),
+                scanning: document.getElementById('scanButton').textContent.includes('Stop'),
+                counter: document.getElementById('scanThroughput').textContent,
+            })""")
+
+            print(f"Sweep: {first['sweep']}; counter: {first['counter']}")
+            if sorted(first['sweep']) == sorted(f'SHELF-{i}' for i in range(1, 9)):
+                print("✅ Every code in view recorded exactly once")
+            else:
+                print(f"❌ Unexpected sweep: {first['sweep']}")
+
+            if first['scanning']:
+                print("✅ Camera kept running")
+            else:
+                print("❌ Scan stopped after a result")
+
+            if first['counter'].startswith('8 unique codes') and 'per minute' in first['counter']:
+                print("✅ Throughput counter shown")
+            else:
+                print(f"❌ Counter: {first['counter']}")
+
+            # Sweep on to the next two rows: more codes than the scan history keeps
+            await page.evaluate("window.shelf = [8, 9, 10, 11, 12, 13, 14, 15]")
+            await page.wait_for_function(
+                "window.appModules.scanner.scanStats.uniqueCodes >= 16", timeout=30000,
+            )
+            await page.wait_for_timeout(1000)
+            await page.click('#scanButton')
+
+            second = await page.evaluate("""() => ({
+                unique: window.appModules.scanner.scanStats.uniqueCodes,
+                sweep: window.appModules.scanner.getSweepCodes().map((scan) => scan.text),
+                history: window.appModules.scanner.getScanHistory().length,
+                listed: document.querySelectorAll('#sweepList .history-item').length,
+                count: document.getElementById('sweepCount').textContent,
+                visible: !document.getElementById('sweepResults').classList.contains('hidden'),
+            })""")
+            print(f"After the sweep: {second['unique']} unique, {len(second['sweep'])} in the sweep list, "
+                  f"{second['history']} in history")
+
+            expected = sorted(f'SHELF-{i}' for i in range(1, 17))
+            if second['unique'] == 16 and sorted(second['sweep']) == expected:
+                print("✅ All 16 codes kept although history holds only 10")
+            else:
+                print(f"❌ Sweep list: {second['sweep']}")
+
+            if second['visible'] and second['listed'] == 16 and second['count'] == '16':
+                print("✅ Sweep list and count shown")
+            else:
+                print(f"❌ Sweep display: {second}")
+
+            # Save all saves the whole sweep
+            await page.click('#saveAllScans')
+            await page.wait_for_timeout(500)
+            saved = await page.evaluate("""() => JSON.parse(localStorage.getItem('barcode-tool-saved-data') || '[]')
+                .map((scan) => scan.text).filter((text) => text.startsWith('SHELF-'))""")
+            if sorted(saved) == expected:
+                print("✅ Save all stored every code of the sweep")
+            else:
+                print(f"❌ Saved {len(saved)} codes: {saved}")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_continuous_scan())
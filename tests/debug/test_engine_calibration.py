@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test the decoder engine interface and the per-device calibration that picks an engine
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_engine_calibration():
+    """Test that calibration measures the available engines, picks one and caches the choice"""
+
+    # Start server
+    PORT = 38478
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            await page.click('button:has-text("Scan Barcodes")')
+
+            # Every engine follows the same decode(bitmap, formats) -> results[] contract
+            contract = await page.evaluate("""async () => {
+                const scanner = window.appModules.scanner;
+                const symbol = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'engine-contract', options: { scale: 4, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                const results = {};
+                for (const engine of Object.values(scanner.engines)) {
+                    if (!(await engine.available())) {
+                        results[engine.name] = 'unavailable';
+                        continue;
+                    }
+                    const scans = await engine.decode(await createImageBitmap(symbol), [ZXing.BarcodeFormat.QR_CODE]);
+                    results[engine.name] = Array.isArray(scans) && scans[0]
+                        ? { text: scans[0].text, format: scans[0].format, points: scans[0].points.length }
+                        : scans;
+                }
+                return results;
+            }""")
+
+            print(f"Engines: {contract}")
+            zxing = contract['zxing']
+            if zxing['text'] == 'engine-contract' and zxing['format'] == 11 and zxing['points'] >= 3:
+                print("✅ ZXing engine returns plain results")
+            else:
+                print("❌ ZXing engine result has the wrong shape")
+
+            for name in ('native', 'zxing-wasm'):
+                result = contract.get(name)
+                if result == 'unavailable' or (isinstance(result, dict) and result['text'] == 'engine-contract'):
+                    print(f"✅ {name}: {'not available here' if result == 'unavailable' else 'same result shape'}")
+                else:
+                    print(f"❌ {name} returned {result}")
+
+            # Calibration on first use
+            calibration = await page.evaluate("""async () => {
+                localStorage.removeItem('decoderCalibration');
+                const scanner = window.appModules.scanner;
+                scanner.engine = null;
+                const start = performance.now();
+                const engine = await scanner.selectEngine();
+                return {
+                    chosen: engine.name,
+                    ms: performance.now() - start,
+                    stored: JSON.parse(localStorage.getItem('decoderCalibration')),
+                };
+            }""")
+
+            stored = calibration['stored']
+            print(f"Chose {calibration['chosen']} in {calibration['ms']:.0f}ms: {stored['results']}")
+            if stored and stored['engine'] == calibration['chosen']:
+                print("✅ Choice stored for this device")
+            else:
+                print("❌ Choice not stored")
+
+            if stored['results'].get('zxing', {}).get('accuracy') == 1:
+                print("✅ ZXing read every calibration sample")
+            else:
+                print(f"❌ ZXing calibration: {stored['results'].get('zxing')}")
+
+            chosen = stored['results'][calibration['chosen']]
+            fastest = min(
+                (r['medianMs'] for r in stored['results'].values() if r['accuracy'] >= 0.8),
+                default=None,
+            )
+            if chosen['accuracy'] >= 0.8 and chosen['medianMs'] == fastest:
+                print("✅ Fastest accurate engine chosen")
+            else:
+                print("❌ Chosen engine is not the fastest accurate one")
+
+            # A reload reuses the stored choice
+            await page.reload()
+            await page.wait_for_load_state('networkidle')
+            await page.click('button:has-text("Scan Barcodes")')
+            reused = await page.evaluate("""async () => {
+                const before = localStorage.getItem('decoderCalibration');
+                const engine = await window.appModules.scanner.selectEngine();
+                return { name: engine.name, unchanged: before === localStorage.getItem('decoderCalibration') };
+            }""")
+
+            if reused['name'] == calibration['chosen'] and reused['unchanged']:
+                print("✅ Stored choice reused without calibrating again")
+            else:
+                print("❌ Calibration ran again")
+
+            # On an uncalibrated device the camera starts first and calibration follows,
+            # decoding the shipped sample images
+            await page.evaluate("localStorage.removeItem('decoderCalibration')")
+            await page.reload()
+            await page.wait_for_load_state('networkidle')
+            await page.click('button:has-text("Scan Barcodes")')
+            await page.evaluate("""async () => {
+                const sample = new Image();
+                sample.src = 'calibration/qrcode.png';
+                await sample.decode();
+                const camera = document.createElement('canvas');
+                camera.width = 640;
+                camera.height = 480;
+                const ctx = camera.getContext('2d');
+                setInterval(() => ctx.drawImage(sample, 0, 0), 33);
+
+                window.events = [];
+                navigator.mediaDevices.getUserMedia = async () => {
+                    window.events.push('camera');
+                    return camera.captureStream(30);
+                };
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+                const fetchSample = window.fetch;
+                window.fetch = (url, ...args) => {
+                    if (String(url).startsWith('calibration/')) window.events.push(String(url));
+                    return fetchSample(url, ...args);
+                };
+                const setItem = Storage.prototype.setItem;
+                Storage.prototype.setItem = function (key, value) {
+                    if (key === 'decoderCalibration') window.events.push('calibrated');
+                    return setItem.call(this, key, value);
+                };
+            }""")
+            await page.click('#scanButton')
+            await page.wait_for_function(
+                "window.appModules.scanner.getScanHistory().some((scan) => scan.text === 'https://example.com/calibration')",
+                timeout=20000,
+            )
+            events = await page.evaluate("window.events")
+            await page.click('#scanButton')
+
+            if events and events[0] == 'camera' and 'calibrated' in events:
+                print("✅ Camera started before calibration, then frames were decoded")
+            else:
+                print(f"❌ Order of events: {events}")
+
+            if [event for event in events if event.startswith('calibration/')] == [
+                'calibration/qrcode.png', 'calibration/code128.png', 'calibration/ean13.png',
+            ]:
+                print("✅ Calibrated with the shipped sample images")
+            else:
+                print(f"❌ Calibration samples: {events}")
+
+            # Offline, zxing-wasm is left out and the choice is not stored
+            await page.evaluate("localStorage.removeItem('decoderCalibration')")
+            await page.reload()
+            await page.wait_for_load_state('networkidle')
+            await page.click('button:has-text("Scan Barcodes")')
+            offline = await page.evaluate("""async () => {
+                Object.defineProperty(navigator, 'onLine', { get: () => false });
+                const scanner = window.appModules.scanner;
+                const engine = await scanner.selectEngine();
+                return {
+                    name: engine.name,
+                    wasm: await scanner.engines['zxing-wasm'].available(),
+                    stored: localStorage.getItem('decoderCalibration'),
+                };
+            }""")
+
+            if offline['name'] != 'zxing-wasm' and not offline['wasm'] and offline['stored'] is None:
+                print(f"✅ Offline calibration chose {offline['name']} without zxing-wasm and was not stored")
+            else:
+                print(f"❌ Offline calibration: {offline}")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_engine_calibration())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test format prioritization: formats learned from saved scans are decoded first, all formats periodically
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_format_profile():
+    """Test that a station's usual format is tried first and a new format is still read and learned"""
+
+    # Start server
+    PORT = 38483
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            # A station that has only saved EAN-13 scans so far
+            await page.evaluate("""() => {
+                localStorage.removeItem('formatProfile');
+                const saved = [];
+                for (let i = 0; i < 8; i++) {
+                    saved.push({ text: `400638133393${i}`, format: 'EAN_13', time: new Date().toLocaleString() });
+                }
+                localStorage.setItem('barcode-tool-saved-data', JSON.stringify(saved));
+            }""")
+            await page.reload()
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded with saved EAN-13 scans")
+
+            await page.click('button:has-text("Scan Barcodes")')
+            profile = await page.evaluate("""async () => {
+                const scanner = window.appModules.scanner;
+                await scanner.engines.zxing.available();
+                const formats = scanner.getSelectedFormats();
+                return {
+                    counts: scanner.formatProfile.counts,
+                    likely: (scanner.getLikelyFormats(formats) || []).map((format) => ZXing.BarcodeFormat[format]),
+                };
+            }""")
+            if profile['counts'].get('EAN_13') == 8 and profile['likely'] == ['EAN_13']:
+                print("✅ Profile seeded from saved scans")
+            else:
+                print(f"❌ Profile: {profile}")
+
+            # Fake camera showing a QR code, a format this station has not scanned yet
+            await page.evaluate("""async () => {
+                const code = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'NEW-FORMAT', options: { scale: 6, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                const camera = document.createElement('canvas');
+                camera.width = 1280;
+                camera.height = 720;
+                const ctx = camera.getContext('2d');
+                setInterval(() => {
+                    ctx.fillStyle = '#fff';
+                    ctx.fillRect(0, 0, 1280, 720);
+                    ctx.drawImage(code, 540, 260);
+                }, 33);
+
+                navigator.mediaDevices.getUserMedia = async () => camera.captureStream(30);
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+
+                // Record the number of formats of every decode
+                const scanner = window.appModules.scanner;
+                const engine = await scanner.selectEngine();
+                const decode = engine.decode.bind(engine);
+                window.formatCounts = [];
+                engine.decode = (bitmap, formats, options) => {
+                    window.formatCounts.push(formats.length);
+                    return decode(bitmap, formats, options);
+                };
+            }""")
+
+            await page.click('#scanButton')
+            await page.wait_for_function(
+                "window.appModules.scanner.getScanHistory().some((scan) => scan.text === 'NEW-FORMAT')",
+                timeout=20000,
+            )
+
+            result = await page.evaluate("""() => ({
+                formatCounts: window.formatCounts,
+                stored: JSON.parse(localStorage.getItem('formatProfile')),
+            })""")
+            counts = result['formatCounts']
+            print(f"Formats per decode: {counts}")
+
+            if counts and counts[0] == 1 and counts.count(1) > counts.count(13):
+                print("✅ Most decodes try the likely format only")
+            else:
+                print(f"❌ Formats per decode: {counts}")
+
+            if counts and counts[-1] == 13:
+                print("✅ The new format was read by a full-set decode")
+            else:
+                print(f"❌ Last decode used {counts[-1] if counts else None} formats")
+
+            stored = result['stored'] or {}
+            if stored.get('counts', {}).get('QR_CODE') == 1 and stored['counts'].get('EAN_13') == 8:
+                print("✅ New format learned and stored for this device")
+            else:
+                print(f"❌ Stored profile: {stored}")
+
+            # A narrowed selection is used as it is
+            await page.uncheck('#formatDataMatrix')
+            narrowed = await page.evaluate("""() => {
+                const scanner = window.appModules.scanner;
+                return scanner.getLikelyFormats(scanner.getSelectedFormats());
+            }""")
+            if narrowed is None:
+                print("✅ A narrowed format selection is not reprioritized")
+            else:
+                print(f"❌ Likely formats with a narrowed selection: {narrowed}")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_format_profile())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test the camera frame pump: one draw per camera frame, cached context, per-frame timestamps
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_frame_pump():
+    """Test that display and decode follow the camera's frame rate and report latency"""
+
+    # Start server
+    PORT = 38476
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            # Fake 15 fps camera showing a blank frame until window.showCode is set
+            await page.evaluate("""async () => {
+                const symbol = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'frame-pump', options: { scale: 6, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                const camera = document.createElement('canvas');
+                camera.width = 640;
+                camera.height = 480;
+                const ctx = camera.getContext('2d');
+                let tick = 0;
+                setInterval(() => {
+                    ctx.fillStyle = '#fff';
+                    ctx.fillRect(0, 0, 640, 480);
+                    ctx.fillStyle = '#eee';
+                    ctx.fillRect(tick++ % 640, 0, 1, 1); // Every camera frame differs
+                    if (window.showCode) {
+                        ctx.drawImage(symbol, 320 - symbol.width / 2, 240 - symbol.height / 2);
+                    }
+                }, 66);
+
+                navigator.mediaDevices.getUserMedia = async () => camera.captureStream(15);
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+
+                const qrCanvas = document.getElementById('qrCanvas');
+                const getContext = qrCanvas.getContext.bind(qrCanvas);
+                window.contextFetches = 0;
+                qrCanvas.getContext = (...args) => {
+                    window.contextFetches++;
+                    return getContext(...args);
+                };
+
+                const scanner = window.appModules.scanner;
+                const handle = scanner.handleScanResult.bind(scanner);
+                scanner.handleScanResult = (scan) => {
+                    window.pumpScan = scan;
+                    handle(scan);
+                };
+            }""")
+
+            await page.click('button:has-text("Scan Barcodes")')
+            await page.click('#scanButton')
+            await page.wait_for_function("window.appModules.scanner.currentFrame", timeout=10000)
+
+            first = await page.evaluate("window.appModules.scanner.currentFrame.number")
+            await page.wait_for_timeout(2000)
+            second = await page.evaluate("""() => ({
+                number: window.appModules.scanner.currentFrame.number,
+                fetches: window.contextFetches,
+            })""")
+
+            frames = second['number'] - first
+            print(f"{frames} frames displayed in 2s from a 15 fps camera")
+            if 20 <= frames <= 35:
+                print("✅ One draw per camera frame")
+            else:
+                print(f"❌ Expected about 30 frames, got {frames}")
+
+            if second['fetches'] <= 1:
+                print("✅ Display context fetched once per scan")
+            else:
+                print(f"❌ Display context fetched {second['fetches']} times")
+
+            await page.evaluate("window.showCode = true")
+            await page.wait_for_function("window.pumpScan", timeout=10000)
+
+            result = await page.evaluate("""() => ({
+                text: window.pumpScan.text,
+                frame: window.pumpScan.frame,
+                latency: window.appModules.scanner.scanStats.latencyMs,
+            })""")
+
+            if result['text'] == 'frame-pump' and result['frame'] and result['frame']['timestamp'] > 0:
+                print(f"✅ Result carries its frame (#{result['frame']['number']})")
+            else:
+                print("❌ Result is missing its frame")
+
+            if result['latency'] is not None and 0 <= result['latency'] < 1000:
+                print(f"✅ Frame-to-result latency {result['latency']:.1f}ms")
+            else:
+                print(f"❌ Unexpected latency {result['latency']}")
+
+            # Frames are captured inside the frame callback, and closed when their decode fails
+            await page.click('#scanButton')
+            await page.evaluate("""() => {
+                const request = HTMLVideoElement.prototype.requestVideoFrameCallback;
+                HTMLVideoElement.prototype.requestVideoFrameCallback = function (callback) {
+                    return request.call(this, (now, metadata) => {
+                        window.inFrameCallback = true;
+                        try {
+                            callback(now, metadata);
+                        } finally {
+                            window.inFrameCallback = false;
+                        }
+                    });
+                };
+                const create = window.createImageBitmap;
+                window.captures = [];
+                window.createImageBitmap = (source, ...args) => {
+                    const inCallback = !!window.inFrameCallback;
+                    const capture = create(source, ...args);
+                    if (source instanceof HTMLVideoElement) {
+                        capture.then((bitmap) => window.captures.push({ bitmap, inCallback }));
+                    }
+                    return capture;
+                };
+                window.appModules.scanner.decodePlan = async () => {
+                    throw new Error('No engine for this frame');
+                };
+            }""")
+            await page.click('#scanButton')
+            await page.wait_for_timeout(1500)
+            await page.click('#scanButton')
+            await page.wait_for_timeout(300)
+
+            captures = await page.evaluate("""() => ({
+                count: window.captures.length,
+                outside: window.captures.filter((capture) => !capture.inCallback).length,
+                open: window.captures.filter((capture) => capture.bitmap.width > 0).length,
+            })""")
+
+            if captures['count'] > 0 and captures['outside'] == 0:
+                print(f"✅ All {captures['count']} frames captured in their frame callback")
+            else:
+                print(f"❌ Captures: {captures}")
+
+            if captures['count'] > 0 and captures['open'] == 0:
+                print("✅ Frames of failed decodes were closed")
+            else:
+                print(f"❌ {captures['open']} captured frames left open")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_frame_pump())
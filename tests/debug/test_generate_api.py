@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test the DOM-free generation API: bulk calls from automation and use inside a worker
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_generate_api():
+    """Test generate/generateMany without touching the form"""
+
+    # Start server
+    PORT = 38468
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            # 300 symbols of mixed types in a single round-trip
+            requests = []
+            for i in range(100):
+                requests.append({'type': 'qrcode', 'text': f'https://example.com/item/{i}', 'format': 'svg'})
+                requests.append({'type': 'ean13', 'text': f'590123{i:06d}', 'format': 'dataurl'})
+                requests.append({'type': 'code128', 'text': f'SKU-{i}', 'format': 'dataurl',
+                                 'options': {'scale': 2, 'includetext': True}})
+            requests.append({'type': 'ean8', 'text': 'not digits', 'format': 'svg'})
+
+            result = await page.evaluate("""async (requests) => {
+                const formBefore = document.getElementById('barcodeType').value;
+                const start = performance.now();
+                const results = await window.appModules.generator.generateMany(requests);
+                return {
+                    elapsed: performance.now() - start,
+                    results,
+                    formUnchanged: document.getElementById('barcodeType').value === formBefore,
+                };
+            }""", requests)
+
+            results = result['results']
+            ok = [r for r in results if r['ok']]
+            print(f"generateMany: {len(ok)}/{len(results)} succeeded in {result['elapsed']:.0f}ms")
+
+            if len(ok) == 300 and not results[-1]['ok']:
+                print("✅ Valid requests rendered; the invalid one reported an error without stopping the batch")
+                print(f"   Error: {results[-1]['error']}")
+            else:
+                print("❌ Unexpected generateMany results")
+
+            if results[0]['data'].startswith('<svg') and results[1]['data'].startswith('data:image/png'):
+                print("✅ SVG strings and PNG data URLs come back serializable")
+
+            if result['formUnchanged']:
+                print("✅ The form was not used")
+
+            # Blob and ImageBitmap outputs, plus a classic worker using the same module
+            native = await page.evaluate("""async () => {
+                const api = window.appModules.generator;
+                const blob = await api.generate({ type: 'datamatrix', text: 'BLOB', format: 'png' });
+                const bitmap = await api.generate({ type: 'azteccode', text: 'BITMAP', format: 'bitmap' });
+
+                const coreUrl = new URL('./modules/barcodeCore.js', location.href).href;
+                const source = `
+                    self.onmessage = async (event) => {
+                        try {
+                            const { generate } = await import(${JSON.stringify(coreUrl)});
+                            const svg = await generate({ type: 'qrcode', text: event.data, format: 'svg' });
+                            const png = await generate({ type: 'qrcode', text: event.data, format: 'png' });
+                            self.postMessage({ svgLength: svg.length, pngType: png.type });
+                        } catch (error) {
+                            self.postMessage({ error: error.message });
+                        }
+                    };
+                `;
+                const worker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+                const fromWorker = await new Promise((resolve) => {
+                    worker.onmessage = (event) => resolve(event.data);
+                    worker.postMessage('FROM A WORKER');
+                });
+                worker.terminate();
+
+                return {
+                    blobType: blob.type,
+                    bitmapWidth: bitmap.width,
+                    fromWorker,
+                };
+            }""")
+
+            print(f"Native outputs: {native}")
+            if native['blobType'] == 'image/png' and native['bitmapWidth'] > 0:
+                print("✅ Blob and ImageBitmap outputs work")
+            if native['fromWorker'].get('pngType') == 'image/png':
+                print("✅ Generation works inside a worker")
+            else:
+                print(f"❌ Worker generation failed: {native['fromWorker']}")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_generate_api())
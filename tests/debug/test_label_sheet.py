@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test label sheet composition with shared <symbol>/<use> definitions
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_label_sheet():
+    """Test that label sheets tile payloads onto pages and deduplicate repeated symbols"""
+
+    # Start server
+    PORT = 38462
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            await page.select_option('#barcodeType', 'code128')
+
+            # 200 labels but only 50 distinct payloads
+            result = await page.evaluate("""async () => {
+                const payloads = Array.from({ length: 200 }, (_, i) => `SKU-${String(i % 50).padStart(4, '0')}`);
+                const start = performance.now();
+                const { pages, skipped } = await window.appModules.generator.generateLabelSheet(payloads, 'avery5160');
+                const elapsed = performance.now() - start;
+
+                const doc = new DOMParser().parseFromString(pages[0], 'image/svg+xml');
+                return {
+                    pageCount: pages.length,
+                    skipped: skipped.length,
+                    symbolsOnFirstPage: doc.querySelectorAll('symbol').length,
+                    usesOnFirstPage: doc.querySelectorAll('use').length,
+                    nestedSvgs: doc.querySelectorAll('svg svg').length,
+                    totalBytes: pages.reduce((sum, page) => sum + page.length, 0),
+                    elapsed,
+                };
+            }""")
+
+            print(f"Label sheet result: {result}")
+
+            if result['pageCount'] == 7:
+                print("✅ 200 labels filled 7 Avery 5160 pages")
+            else:
+                print("❌ Unexpected page count")
+
+            if result['usesOnFirstPage'] == 30 and result['symbolsOnFirstPage'] == 30:
+                print("✅ First page has 30 <use> cells")
+
+            if result['nestedSvgs'] == 0:
+                print("✅ No embedded SVG documents")
+            else:
+                print("❌ Sheet contains nested SVG documents")
+
+            # Repeated payloads on the same page share one symbol
+            dedup = await page.evaluate("""async () => {
+                const payloads = Array(30).fill('SAME-CODE');
+                const { pages } = await window.appModules.generator.generateLabelSheet(payloads, 'avery5160');
+                const doc = new DOMParser().parseFromString(pages[0], 'image/svg+xml');
+                return {
+                    symbols: doc.querySelectorAll('symbol').length,
+                    uses: doc.querySelectorAll('use').length,
+                };
+            }""")
+
+            print(f"Repeated payload page: {dedup}")
+            if dedup['symbols'] == 1 and dedup['uses'] == 30:
+                print("✅ Repeated payload rendered once and referenced 30 times")
+            else:
+                print("❌ Repeated payload was not deduplicated")
+
+            # Render the first page for visual inspection
+            await page.evaluate("""async () => {
+                const { pages } = await window.appModules.generator.generateLabelSheet(
+                    Array.from({ length: 30 }, (_, i) => `SKU-${i}`), 'avery5160', { outlines: true }
+                );
+                const container = document.getElementById('generatedBarcodeContainer');
+                container.style.display = 'block';
+                container.innerHTML = pages[0];
+            }""")
+            await page.screenshot(path='screenshots/label_sheet_test.png', full_page=True)
+            print("✓ Screenshot saved")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_label_sheet())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test splitting oversized payloads across linked symbols and reassembling them
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_linked_symbols():
+    """Test QR/PDF417 splitting, parallel rendering and out-of-order reassembly"""
+
+    # Start server
+    PORT = 38471
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            result = await page.evaluate("""async () => {
+                const { splitPayload, LinkedSymbolAssembler, parseLinkedPart } = await import('./modules/linkedSymbols.js');
+                const payload = 'Large record ünïcode 🎉 '.repeat(300);
+
+                // QR parts reassemble in any order
+                const parts = splitPayload('qrcode', payload, { eclevel: 'M' });
+                const assembler = new LinkedSymbolAssembler();
+                let progress;
+                for (const part of [...parts].reverse()) {
+                    progress = assembler.add(parseLinkedPart({ text: part.text, macro: null }));
+                }
+
+                // Parts render concurrently in workers
+                const generator = window.appModules.generator;
+                const start = performance.now();
+                const bitmaps = await generator.renderParts(parts);
+                const renderMs = performance.now() - start;
+
+                // Macro PDF417 parts become raw codeword symbols
+                const pdfParts = splitPayload('pdf417', payload, { securitylevel: 2 });
+                const pdfBitmaps = await generator.renderParts(pdfParts);
+
+                return {
+                    qrParts: parts.length,
+                    reassembled: progress.complete && progress.text === payload,
+                    bitmaps: bitmaps.map((bitmap) => bitmap.width),
+                    renderMs,
+                    pdfParts: pdfParts.length,
+                    pdfRaw: pdfParts[0].text.startsWith('^927^026^'),
+                    pdfBitmaps: pdfBitmaps.length,
+                };
+            }""")
+
+            print(f"QR parts: {result['qrParts']}, rendered in {result['renderMs']:.0f}ms")
+            if result['qrParts'] > 1 and result['reassembled']:
+                print("✅ QR parts reassemble in reverse order")
+            else:
+                print("❌ QR reassembly failed")
+
+            if len(result['bitmaps']) == result['qrParts'] and all(result['bitmaps']):
+                print("✅ Every part rendered in the worker pool")
+
+            print(f"PDF417 parts: {result['pdfParts']}")
+            if result['pdfRaw'] and result['pdfBitmaps'] == result['pdfParts']:
+                print("✅ Macro PDF417 parts rendered from raw codewords")
+
+            # The generator splits automatically and lays the parts out together
+            await page.select_option('#barcodeType', 'qrcode')
+            await page.fill('#textInput', 'x' * 5000)
+            info = await page.text_content('#capacityInfo')
+            print(f"Capacity info: {info}")
+            await page.click('#generateBarcodeBtn')
+            await page.wait_for_selector('#generatedBarcodeContainer canvas.linked-symbols', timeout=15000)
+            message = await page.text_content('#mainMessageArea')
+            print(f"Message: {message}")
+            if 'linked' in message and 'will be split' in info:
+                print("✅ Oversized payload generated as linked symbols")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_linked_symbols())
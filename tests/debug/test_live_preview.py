@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test live preview: debounced reduced-scale renders and full-scale final render
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_live_preview():
+    """Test that live preview coalesces keystrokes and Generate renders at full scale"""
+
+    # Start server
+    PORT = 38460
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(viewport={'width': 1280, 'height': 720})
+            page = await context.new_page()
+
+            # Capture console errors
+            console_errors = []
+            page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            await page.select_option('#barcodeType', 'qrcode')
+            await page.select_option('#outputFormat', 'canvas')
+            await page.select_option('#livePreview', 'true')
+
+            # Count bwip renders to verify coalescing
+            await page.evaluate("""() => {
+                window.__renderCount = 0;
+                const original = bwipjs.toCanvas;
+                bwipjs.toCanvas = (...args) => {
+                    window.__renderCount++;
+                    return original.apply(bwipjs, args);
+                };
+            }""")
+
+            # Type quickly - each keystroke fires an input event
+            await page.type('#textInput', 'https://example.com/live-preview', delay=20)
+            await page.wait_for_timeout(1000)
+
+            render_count = await page.evaluate("() => window.__renderCount")
+            print(f"Renders after typing 32 characters: {render_count}")
+            if 1 <= render_count <= 3:
+                print("✅ Keystrokes were debounced and coalesced")
+            else:
+                print("❌ Unexpected number of preview renders")
+
+            preview_info = await page.evaluate("""() => {
+                const canvas = document.querySelector('#generatedBarcodeContainer canvas');
+                return canvas ? {
+                    isPreview: canvas.classList.contains('barcode-preview'),
+                    width: canvas.width,
+                } : null;
+            }""")
+            print(f"Preview canvas: {preview_info}")
+            if preview_info and preview_info['isPreview']:
+                print("✅ Preview rendered without clicking Generate")
+            else:
+                print("❌ No preview rendered")
+
+            has_download = await page.is_visible('#generatedBarcodeContainer .secondary-button')
+            print(f"Download button on preview: {has_download}")
+
+            # Final render replaces the preview at full scale
+            await page.click('#generateBarcodeBtn')
+            await page.wait_for_timeout(1500)
+
+            final_info = await page.evaluate("""() => {
+                const canvas = document.querySelector('#generatedBarcodeContainer canvas');
+                return canvas ? {
+                    isPreview: canvas.classList.contains('barcode-preview'),
+                    width: canvas.width,
+                } : null;
+            }""")
+            print(f"Final canvas: {final_info}")
+            if final_info and not final_info['isPreview'] and final_info['width'] > preview_info['width']:
+                print("✅ Generate produced a full-scale render")
+            else:
+                print("❌ Final render is missing or still at preview scale")
+
+            # A stale in-flight preview must not overwrite the final render
+            await page.type('#textInput', '/more', delay=10)
+            await page.click('#generateBarcodeBtn')
+            await page.wait_for_timeout(1000)
+            still_final = await page.evaluate("""() => {
+                const canvas = document.querySelector('#generatedBarcodeContainer canvas');
+                return canvas && !canvas.classList.contains('barcode-preview');
+            }""")
+            if still_final:
+                print("✅ Pending preview was abandoned after Generate")
+            else:
+                print("❌ Stale preview overwrote the final render")
+
+            if console_errors:
+                print("❌ Console errors:")
+                for error in console_errors:
+                    print(f"  - {error}")
+            else:
+                print("✅ No console errors")
+
+            await page.screenshot(path='screenshots/live_preview_test.png')
+            print("✓ Screenshot saved")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_live_preview())
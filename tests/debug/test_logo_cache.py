@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the decode-once logo pipeline for QR overlays
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_logo_cache():
+    """Test that the logo is decoded once, reused across renders and embedded once per SVG page"""
+
+    # Start server
+    PORT = 38465
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            await page.select_option('#barcodeType', 'qrcode')
+
+            # Upload a generated PNG through the real file input
+            logo_png = await page.evaluate("""async () => {
+                const canvas = document.createElement('canvas');
+                canvas.width = canvas.height = 512;
+                const ctx = canvas.getContext('2d');
+                ctx.fillStyle = '#d33';
+                ctx.fillRect(0, 0, 512, 512);
+                ctx.fillStyle = '#fff';
+                ctx.fillRect(128, 128, 256, 256);
+                const blob = await new Promise((resolve) => canvas.toBlob(resolve, 'image/png'));
+                return Array.from(new Uint8Array(await blob.arrayBuffer()));
+            }""")
+            await page.set_input_files('#logoUpload', files=[{
+                'name': 'logo.png', 'mimeType': 'image/png', 'buffer': bytes(logo_png),
+            }])
+            await page.wait_for_selector('#logoPreview', state='visible', timeout=5000)
+            print("✓ Logo uploaded")
+
+            result = await page.evaluate("""async () => {
+                const { stateManager } = await import('./modules/state.js');
+                const generator = window.appModules.generator;
+                const logo = stateManager.get('generator.selectedLogo');
+
+                // Time PNG renders with and without the logo
+                const time = async (withLogo) => {
+                    stateManager.set('generator.selectedLogo', withLogo ? logo : null);
+                    const start = performance.now();
+                    for (let i = 0; i < 50; i++) {
+                        await generator.generatePngCanvas('qrcode', `ITEM-${i}`);
+                    }
+                    return (performance.now() - start) / 50;
+                };
+                await time(true); // Warm up
+                const plain = await time(false);
+                const withLogo = await time(true);
+
+                // The logo's red border sits just inside its placement box
+                const { LogoCache } = await import('./modules/LogoCache.js');
+                const canvas = await generator.generatePngCanvas('qrcode', 'CENTER');
+                const { x, y } = LogoCache.placement(canvas.width, canvas.height);
+                const centre = canvas.getContext('2d').getImageData(x + 1, y + 1, 1, 1).data;
+
+                const svg = new XMLSerializer().serializeToString(await generator.generateSVGBarcode('qrcode', 'SVG LOGO'));
+                const { pages } = await generator.generateLabelSheet(
+                    Array.from({ length: 30 }, (_, i) => `LABEL-${i}`), 'avery5160'
+                );
+
+                return {
+                    plain,
+                    withLogo,
+                    scaledSizes: logo.scaled.size,
+                    centre: Array.from(centre),
+                    svgImages: (svg.match(/<image/g) || []).length,
+                    svgUses: (svg.match(/href="#qrlogo"/g) || []).length,
+                    pageImages: (pages[0].match(/<image/g) || []).length,
+                    pageLogoUses: (pages[0].match(/href="#qrlogo"/g) || []).length,
+                };
+            }""")
+
+            print(f"Logo pipeline result: {result}")
+
+            overhead = result['withLogo'] - result['plain']
+            print(f"Per-symbol logo overhead: {overhead:.2f}ms")
+            if overhead < max(1.0, result['plain'] * 0.1):
+                print("✅ Logo overlay adds near-zero cost per symbol")
+            else:
+                print("❌ Logo overlay is still expensive per symbol")
+
+            if result['scaledSizes'] == 1:
+                print("✅ One pre-scaled copy reused for every same-size render")
+
+            if result['centre'][0] > 200 and result['centre'][1] < 100:
+                print("✅ Logo drawn at its placement box")
+            else:
+                print("❌ Logo not found at the centre")
+
+            if result['svgImages'] == 1 and result['svgUses'] == 1:
+                print("✅ SVG embeds the logo once and references it")
+
+            if result['pageImages'] == 1 and result['pageLogoUses'] == 30:
+                print("✅ Label sheet shares one embedded logo across 30 symbols")
+            else:
+                print("❌ Label sheet embeds the logo more than once")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_logo_cache())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test the native BarcodeDetector fast path and its fallback to ZXing
+"""
+
+import asyncio
+import base64
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_native_detector():
+    """Test engine selection on the live and upload paths with a stand-in BarcodeDetector"""
+
+    # Start server
+    PORT = 38477
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            # Stand-in detector: reads nothing unless window.nativeResult is set
+            await page.add_init_script("""
+                // Calibration already chose the native detector on this device
+                localStorage.setItem('decoderCalibration', JSON.stringify({
+                    engine: 'native', results: {}, userAgent: navigator.userAgent, calibratedAt: Date.now(),
+                }));
+                window.nativeCalls = 0;
+                window.BarcodeDetector = class {
+                    static async getSupportedFormats() { return ['qr_code', 'code_128']; }
+                    constructor({ formats }) { window.nativeFormats = formats; }
+                    async detect() {
+                        window.nativeCalls++;
+                        return window.nativeResult ? [window.nativeResult] : [];
+                    }
+                };
+            """)
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            await page.evaluate("""async () => {
+                const symbol = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'native-fallback', options: { scale: 6, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                const camera = document.createElement('canvas');
+                camera.width = 640;
+                camera.height = 480;
+                const ctx = camera.getContext('2d');
+                setInterval(() => {
+                    ctx.fillStyle = '#fff';
+                    ctx.fillRect(0, 0, 640, 480);
+                    ctx.drawImage(symbol, 320 - symbol.width / 2, 240 - symbol.height / 2);
+                }, 33);
+
+                navigator.mediaDevices.getUserMedia = async () => camera.captureStream(30);
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+            }""")
+
+            # Live: the native detector finds nothing, so ZXing reads the code after the fallback frames
+            await page.click('button:has-text("Scan Barcodes")')
+            await page.click('#scanButton')
+            await page.wait_for_function("document.getElementById('scanResult').textContent.length > 0", timeout=15000)
+
+            live = await page.evaluate("""() => ({
+                text: document.getElementById('scanResult').textContent,
+                calls: window.nativeCalls,
+                formats: window.nativeFormats,
+                last: window.appModules.scanner.lastDecode,
+                engines: window.appModules.scanner.scanStats.engines,
+            })""")
+
+            print(f"Live: {live['text']}, native calls {live['calls']}, engines {live['engines']}")
+            if live['text'] == 'native-fallback' and live['last']['engine'] == 'zxing':
+                print("✅ ZXing read the code the native detector missed")
+            else:
+                print(f"❌ Unexpected live result: {live['last']}")
+
+            if live['calls'] >= 10 and 'native' in live['engines']:
+                print("✅ Native detector tried first")
+            else:
+                print("❌ Native detector was not tried first")
+
+            if sorted(live['formats'] or []) == ['code_128', 'qr_code']:
+                print("✅ Selected formats mapped to the native formats this device supports")
+            else:
+                print(f"❌ Unexpected native formats: {live['formats']}")
+
+            # Upload: the native detector reads the image
+            await page.evaluate("""() => {
+                window.nativeResult = {
+                    rawValue: 'native-upload', format: 'qr_code',
+                    cornerPoints: [{ x: 1, y: 1 }, { x: 20, y: 1 }, { x: 20, y: 20 }, { x: 1, y: 20 }],
+                };
+            }""")
+            image = await page.evaluate("""async () => {
+                const canvas = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'zxing-upload', options: { scale: 4 }, format: 'canvas',
+                });
+                return canvas.toDataURL('image/png');
+            }""")
+            await page.set_input_files('#imageUpload', files=[{
+                'name': 'code.png', 'mimeType': 'image/png', 'buffer': base64.b64decode(image.split(',')[1]),
+            }])
+            await page.wait_for_function("document.getElementById('scanResult').textContent.includes('native-upload')", timeout=10000)
+
+            upload = await page.evaluate("window.appModules.scanner.lastDecode")
+            if upload['engine'] == 'native' and upload['decodeMs'] >= 0:
+                print(f"✅ Upload read natively in {upload['decodeMs']:.1f}ms")
+            else:
+                print(f"❌ Unexpected upload engine: {upload}")
+
+            # A detector without QR support: ZXing reads QR codes on every frame, no fallback wait
+            partial = await browser.new_page()
+            await partial.add_init_script("""
+                localStorage.setItem('decoderCalibration', JSON.stringify({
+                    engine: 'native', results: {}, userAgent: navigator.userAgent, calibratedAt: Date.now(),
+                }));
+                window.nativeCalls = 0;
+                window.BarcodeDetector = class {
+                    static async getSupportedFormats() { return ['code_128', 'ean_13']; }
+                    async detect() {
+                        window.nativeCalls++;
+                        return [];
+                    }
+                };
+            """)
+            await partial.goto(f'http://localhost:{PORT}')
+            await partial.wait_for_load_state('networkidle')
+            await partial.evaluate("""async () => {
+                const symbol = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'zxing-only-format', options: { scale: 6, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                const camera = document.createElement('canvas');
+                camera.width = 640;
+                camera.height = 480;
+                const ctx = camera.getContext('2d');
+                setInterval(() => {
+                    ctx.fillStyle = '#fff';
+                    ctx.fillRect(0, 0, 640, 480);
+                    ctx.drawImage(symbol, 320 - symbol.width / 2, 240 - symbol.height / 2);
+                }, 33);
+
+                navigator.mediaDevices.getUserMedia = async () => camera.captureStream(30);
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+
+                // Record the formats ZXing is asked for
+                const zxing = window.appModules.scanner.engines.zxing;
+                const decode = zxing.decode.bind(zxing);
+                window.zxingFormats = [];
+                zxing.decode = (bitmap, formats, options) => {
+                    window.zxingFormats.push(formats.map((format) => ZXing.BarcodeFormat[format]));
+                    return decode(bitmap, formats, options);
+                };
+            }""")
+            await partial.click('button:has-text("Scan Barcodes")')
+            await partial.click('#scanButton')
+            await partial.wait_for_function("document.getElementById('scanResult').textContent.length > 0", timeout=15000)
+
+            split = await partial.evaluate("""() => ({
+                text: document.getElementById('scanResult').textContent,
+                calls: window.nativeCalls,
+                zxingFormats: window.zxingFormats,
+                last: window.appModules.scanner.lastDecode,
+            })""")
+
+            if split['text'] == 'zxing-only-format' and split['last']['engine'] == 'zxing' and split['calls'] < 10:
+                print(f"✅ ZXing read a format the detector lacks after {split['calls']} native frames")
+            else:
+                print(f"❌ Partial support: {split['text']}, {split['calls']} native calls, {split['last']}")
+
+            first = split['zxingFormats'][0] if split['zxingFormats'] else []
+            if 'QR_CODE' in first and 'CODE_128' not in first and 'EAN_13' not in first:
+                print("✅ ZXing was given only the formats the detector lacks")
+            else:
+                print(f"❌ ZXing formats: {split['zxingFormats']}")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_native_detector())
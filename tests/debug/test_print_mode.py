@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test print-accurate rendering: integer dots per module and no post-scaling
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_print_mode():
+    """Test that print mode renders at exact printer dots and tags PNGs with the DPI"""
+
+    # Start server
+    PORT = 38467
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            await page.select_option('#barcodeType', 'qrcode')
+            await page.select_option('#printMode', 'true')
+            await page.select_option('#printDpi', '203')
+            await page.fill('#xDimension', '20')
+            info = await page.text_content('#printModeInfo')
+            print(f"Print info: {info}")
+            if info.startswith('4 dots per module'):
+                print("✅ 20 mil at 203 DPI rounds to 4 dots per module")
+            else:
+                print("❌ Unexpected dots per module")
+
+            await page.fill('#textInput', 'PRINT MODE')
+            await page.click('#generateBarcodeBtn')
+            await page.wait_for_selector('#generatedBarcodeContainer canvas', timeout=5000)
+
+            result = await page.evaluate("""async () => {
+                const canvas = document.querySelector('#generatedBarcodeContainer canvas');
+                const generator = window.appModules.generator;
+
+                // Without padding the symbol is an exact multiple of the module size
+                document.getElementById('padding').value = '0';
+                const bare = await generator.generatePngCanvas('qrcode', 'PRINT MODE');
+
+                const blob = await generator.encodePng(bare);
+                const bytes = new Uint8Array(await blob.arrayBuffer());
+                const type = String.fromCharCode(...bytes.subarray(37, 41));
+                const view = new DataView(bytes.buffer);
+
+                return {
+                    printAccurate: canvas.classList.contains('print-accurate'),
+                    bareWidth: bare.width,
+                    chunkType: type,
+                    pixelsPerMetre: view.getUint32(41),
+                };
+            }""")
+
+            print(f"Print mode result: {result}")
+
+            if result['printAccurate']:
+                print("✅ Displayed canvas was not resampled to the container")
+
+            # QR version 1 is 21 modules wide
+            if result['bareWidth'] % 4 == 0 and result['bareWidth'] // 4 in (21, 25):
+                print(f"✅ Canvas is {result['bareWidth'] // 4} modules x 4 px")
+            else:
+                print(f"❌ Canvas width {result['bareWidth']} is not a whole number of 4 px modules")
+
+            if result['chunkType'] == 'pHYs' and result['pixelsPerMetre'] == 7992:
+                print("✅ PNG carries a 203 DPI pHYs chunk")
+            else:
+                print("❌ PNG resolution not set")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_print_mode())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test QR version/mask pinning and auto-pin per length class
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_qr_pinning():
+    """Test explicit version/mask, mask read-back, deterministic output and batch speed-up"""
+
+    # Start server
+    PORT = 38473
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            result = await page.evaluate("""async () => {
+                const { readQrMask, qrPins, clearQrPins } = await import('./modules/qrPinning.js');
+                const generator = window.appModules.generator;
+                const render = (text, options) =>
+                    generator.generate({ type: 'qrcode', text, options: { scale: 2, padding: 0, ...options }, format: 'canvas' });
+
+                // Each pinned mask is read back from the format information
+                const readBack = [];
+                for (let mask = 1; mask <= 8; mask++) {
+                    const canvas = await render('PINNING TEST', { eclevel: 'Q', version: 3, mask });
+                    readBack.push(readQrMask(canvas, 3, 'Q'));
+                }
+                const pinnedSize = (await render('HI', { version: 10 })).width;
+
+                // Auto-pin output is repeatable
+                clearQrPins();
+                const bytes = async (text) =>
+                    new Uint8Array(await (await generator.generate({ type: 'qrcode', text, options: { mask: 'auto' } })).arrayBuffer()).join();
+                const first = await bytes('ORDER-000123');
+                const second = await bytes('ORDER-000123');
+
+                // Batch of same-length payloads: all eight masks scored per code vs. pinned
+                const payloads = Array.from({ length: 300 }, (_, i) => `https://example.com/item/${String(i).padStart(6, '0')}`);
+                const time = async (mask) => {
+                    const start = performance.now();
+                    await generator.generateMany(payloads.map((text) => ({ type: 'qrcode', text, options: { mask }, format: 'canvas' })));
+                    return performance.now() - start;
+                };
+                await time(null); // Warm up
+                const unpinnedMs = await time(null);
+                clearQrPins();
+                const pinnedMs = await time('auto');
+
+                return { readBack, pinnedSize, deterministic: first === second, unpinnedMs, pinnedMs, pins: qrPins() };
+            }""")
+
+            print(f"Masks read back: {result['readBack']}")
+            if result['readBack'] == [1, 2, 3, 4, 5, 6, 7, 8]:
+                print("✅ Pinned masks are applied and read back correctly")
+            else:
+                print("❌ Mask read-back mismatch")
+
+            if result['pinnedSize'] == 57 * 2:
+                print("✅ Pinned version 10 renders 57x57 modules")
+            else:
+                print(f"❌ Pinned version size: {result['pinnedSize']}")
+
+            if result['deterministic']:
+                print("✅ Auto-pinned output is byte-identical across renders")
+
+            print(f"Pins: {result['pins']}")
+            print(f"300 QR codes: {result['unpinnedMs']:.0f}ms unpinned, {result['pinnedMs']:.0f}ms auto-pinned")
+            if result['pinnedMs'] < result['unpinnedMs']:
+                print("✅ Auto-pin speeds up same-length batches")
+            else:
+                print("❌ Auto-pin was not faster")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_qr_pinning())
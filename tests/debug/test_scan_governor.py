@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test the scan governor: idle at low resolution and decode rate, ramp up when a code is in view
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_scan_governor():
+    """Test the governor's decisions on their own and with a camera"""
+
+    # Start server
+    PORT = 38482
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            # Decisions on a simulated clock: 30 fps, no dropped frames unless asked
+            decisions = await page.evaluate("""async () => {
+                const { ScanGovernor } = await import('/modules/scanGovernor.js');
+                const governor = new ScanGovernor(0);
+                let presented = 0;
+                const run = (from, to, decodeMs, candidate, dropEvery = 0) => {
+                    const changes = [];
+                    for (let t = from; t < to; t += 33) {
+                        presented += dropEvery && presented % dropEvery === 0 ? 2 : 1;
+                        governor.recordFrame(presented);
+                        const resolution = governor.evaluate(t);
+                        if (resolution) changes.push(resolution.width);
+                        if (governor.shouldDecode(t)) governor.recordDecode(decodeMs, candidate, t);
+                    }
+                    return changes;
+                };
+                return {
+                    nearby: run(0, 2500, 20, true),
+                    idle: [...run(2500, 8000, 20, false), governor.describe()],
+                    wake: [...run(8000, 9000, 20, true), governor.describe()],
+                    slow: run(9000, 12000, 200, true),
+                    dropping: (() => { governor.decodeMs = 20; return run(12000, 15000, 20, true, 3); })(),
+                };
+            }""")
+
+            print(f"Decisions: {decisions}")
+            if decisions['nearby'] and decisions['nearby'][-1] == 1920:
+                print("✅ Fast decodes with a code nearby raise the resolution")
+            else:
+                print(f"❌ Nearby: {decisions['nearby']}")
+
+            idle_state = decisions['idle'][-1]
+            if 640 in decisions['idle'] and idle_state['idle'] and idle_state['decodeInterval'] >= 200:
+                print("✅ Idles at low resolution and a few decodes a second")
+            else:
+                print(f"❌ Idle: {decisions['idle']}")
+
+            wake_state = decisions['wake'][-1]
+            if 1920 in decisions['wake'] and not wake_state['idle'] and wake_state['decodeInterval'] == 0:
+                print("✅ Wakes to the previous resolution and full rate")
+            else:
+                print(f"❌ Wake: {decisions['wake']}")
+
+            if decisions['slow'] and decisions['slow'][0] < 1920:
+                print("✅ Slow decodes lower the resolution")
+            else:
+                print(f"❌ Slow: {decisions['slow']}")
+
+            if decisions['dropping'] and min(decisions['dropping']) < 1920:
+                print("✅ Dropped frames lower the resolution")
+            else:
+                print(f"❌ Dropping: {decisions['dropping']}")
+
+            # Fake camera showing a blank wall, then a code
+            await page.evaluate("""async () => {
+                const code = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'GOVERNOR', options: { scale: 6, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                window.showCode = false;
+                const camera = document.createElement('canvas');
+                camera.width = 1280;
+                camera.height = 720;
+                const ctx = camera.getContext('2d');
+                setInterval(() => {
+                    ctx.fillStyle = '#fff';
+                    ctx.fillRect(0, 0, 1280, 720);
+                    if (window.showCode) ctx.drawImage(code, 540, 260);
+                }, 33);
+
+                window.requestedWidths = [];
+                MediaStreamTrack.prototype.applyConstraints = async function (constraints) {
+                    window.requestedWidths.push(constraints.width.ideal);
+                };
+                navigator.mediaDevices.getUserMedia = async (constraints) => {
+                    window.initialConstraints = constraints;
+                    return camera.captureStream(30);
+                };
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+            }""")
+
+            await page.click('button:has-text("Scan Barcodes")')
+            await page.check('#continuousScan')
+            await page.click('#scanButton')
+
+            await page.wait_for_function(
+                "window.appModules.scanner.governor && window.appModules.scanner.governor.idle", timeout=20000,
+            )
+            start = await page.evaluate("window.appModules.scanner.scanStats.framesDecoded")
+            await page.wait_for_timeout(2000)
+            idle = await page.evaluate("""() => ({
+                decoded: window.appModules.scanner.scanStats.framesDecoded,
+                requested: [...window.requestedWidths],
+                initial: window.initialConstraints.video,
+            })""")
+            idle_rate = (idle['decoded'] - start) / 2
+
+            if idle['initial'].get('width') and idle['initial'].get('deviceId'):
+                print("✅ Camera opened with the governor's resolution")
+            else:
+                print(f"❌ Initial constraints: {idle['initial']}")
+
+            if 640 in idle['requested']:
+                print("✅ Camera switched to low resolution while idle")
+            else:
+                print(f"❌ Requested widths: {idle['requested']}")
+
+            if idle_rate <= 5:
+                print(f"✅ Idle decode rate {idle_rate:.1f}/s")
+            else:
+                print(f"❌ Idle decode rate {idle_rate:.1f}/s")
+
+            await page.evaluate("window.showCode = true")
+            await page.wait_for_function(
+                "window.appModules.scanner.scanStats.uniqueCodes >= 1 && !window.appModules.scanner.governor.idle",
+                timeout=20000,
+            )
+            requested = await page.evaluate("window.requestedWidths")
+            if requested and requested[-1] > 640:
+                print("✅ Resolution ramped up with a code in view")
+            else:
+                print(f"❌ Requested widths: {requested}")
+
+            await page.click('#scanButton')
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_scan_governor())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test round-trip scannability verification in decode workers
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_scan_verification():
+    """Test pass/fail, margin reporting and parallel batch verification"""
+
+    # Start server
+    PORT = 38466
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            # Single barcode: the result appears under the generated code
+            await page.select_option('#barcodeType', 'qrcode')
+            await page.select_option('#verifyScan', 'true')
+            await page.fill('#textInput', 'https://example.com/verify')
+            await page.click('#generateBarcodeBtn')
+            await page.wait_for_function(
+                "document.querySelector('.verify-result') && !document.querySelector('.verify-result').textContent.includes('Verifying')",
+                timeout=15000,
+            )
+            status = await page.text_content('.verify-result')
+            print(f"Verification: {status}")
+            if 'Scans' in status:
+                print("✅ Generated QR code verified as scannable")
+            else:
+                print("❌ Generated QR code failed verification")
+
+            result = await page.evaluate("""async () => {
+                const generator = window.appModules.generator;
+
+                // A clean symbol and one whose centre is wiped out
+                const good = await generator.generatePngCanvas('code128', 'VERIFY-128');
+                const damaged = await generator.generatePngCanvas('qrcode', 'DAMAGED SYMBOL');
+                const ctx = damaged.getContext('2d');
+                ctx.fillStyle = 'white';
+                ctx.fillRect(damaged.width * 0.2, damaged.height * 0.2, damaged.width * 0.6, damaged.height * 0.6);
+
+                const goodResult = await generator.verifyCanvas(good, 'code128', 'VERIFY-128');
+                const damagedResult = await generator.verifyCanvas(damaged, 'qrcode', 'DAMAGED SYMBOL');
+
+                // Many symbols at once spread across the pool without blocking the page
+                let frames = 0;
+                let counting = true;
+                const tick = () => { if (counting) { frames++; requestAnimationFrame(tick); } };
+                requestAnimationFrame(tick);
+
+                const canvases = await Promise.all(
+                    Array.from({ length: 24 }, (_, i) => generator.generatePngCanvas('qrcode', `BATCH-${i}`))
+                );
+                const start = performance.now();
+                const batch = await Promise.all(
+                    canvases.map((canvas, i) => generator.verifyCanvas(canvas, 'qrcode', `BATCH-${i}`))
+                );
+                const elapsed = performance.now() - start;
+                counting = false;
+
+                return {
+                    good: goodResult,
+                    damaged: damagedResult,
+                    batchPassed: batch.filter((r) => r.pass).length,
+                    elapsed,
+                    frames,
+                    workers: generator.decodePool.size,
+                };
+            }""")
+
+            print(f"Clean CODE 128: pass={result['good']['pass']} margin={result['good']['margin']:.2f} "
+                  f"decode={result['good']['decodeMs']:.1f}ms")
+            if result['good']['pass']:
+                print("✅ Clean symbol passes")
+
+            if not result['damaged']['pass']:
+                print("✅ Damaged symbol is flagged")
+            else:
+                print("❌ Damaged symbol passed verification")
+
+            print(f"Batch: {result['batchPassed']}/24 passed in {result['elapsed']:.0f}ms "
+                  f"across {result['workers']} workers, {result['frames']} frames painted meanwhile")
+            if result['batchPassed'] == 24:
+                print("✅ Batch verification passed for every symbol")
+            if result['frames'] > 0:
+                print("✅ Page kept painting while workers decoded")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_scan_verification())
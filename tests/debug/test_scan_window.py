@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test region-of-interest scanning: downscaled window captures and the full-frame retry
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+SETUP_CAMERA = """async (offset) => {
+    const symbol = await window.appModules.generator.generate({
+        type: 'qrcode', text: 'scan-window-' + offset, options: { scale: 6, backgroundcolor: 'ffffff' }, format: 'canvas',
+    });
+    const camera = document.createElement('canvas');
+    camera.width = 1920;
+    camera.height = 1080;
+    const ctx = camera.getContext('2d');
+    clearInterval(window.cameraTimer);
+    window.cameraTimer = setInterval(() => {
+        ctx.fillStyle = '#fff';
+        ctx.fillRect(0, 0, 1920, 1080);
+        ctx.drawImage(symbol, 960 + offset - symbol.width / 2, 540 - symbol.height / 2);
+    }, 33);
+
+    navigator.mediaDevices.getUserMedia = async () => camera.captureStream(30);
+    navigator.mediaDevices.enumerateDevices = async () => [
+        { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+    ];
+
+    // Record the size of every bitmap handed to the decoder
+    const scanner = window.appModules.scanner;
+    const engine = await scanner.selectEngine();
+    if (!engine.recorded) {
+        const decode = engine.decode.bind(engine);
+        window.decodedSizes = [];
+        engine.decode = (bitmap, formats) => {
+            window.decodedSizes.push([bitmap.width, bitmap.height]);
+            return decode(bitmap, formats);
+        };
+        engine.recorded = true;
+        const handle = scanner.handleScanResult.bind(scanner);
+        scanner.handleScanResult = (scan) => {
+            window.windowScan = scan;
+            handle(scan);
+        };
+    }
+    window.decodedSizes.length = 0;
+    window.windowScan = null;
+}"""
+
+async def test_scan_window():
+    """Test that a centred code decodes from the window and an off-centre one from a full frame"""
+
+    # Start server
+    PORT = 38479
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            await page.click('button:has-text("Scan Barcodes")')
+            await page.uncheck('#selectAllFormats')
+            await page.check('#formatQR')
+            await page.select_option('#scanWindowSize', '0.6')
+
+            # Centred code: read from the downscaled window
+            await page.evaluate(SETUP_CAMERA, 0)
+            await page.click('#scanButton')
+            await page.wait_for_function("window.windowScan", timeout=15000)
+
+            centred = await page.evaluate("""() => ({
+                scan: window.windowScan,
+                sizes: window.decodedSizes,
+            })""")
+
+            scan = centred['scan']
+            print(f"Centred: {scan['text']} from {scan['region']}; decoded sizes {centred['sizes'][:3]}")
+            if scan['text'] == 'scan-window-0' and scan['region'] == 'window':
+                print("✅ Centred code read from the scan window")
+            else:
+                print("❌ Centred code not read from the window")
+
+            if [480, 480] in centred['sizes']:
+                print("✅ Square window downscaled to 480x480 for a 2D format")
+            else:
+                print(f"❌ Unexpected capture sizes: {centred['sizes']}")
+
+            xs = [point['x'] for point in scan['points']]
+            if xs and 700 < min(xs) and max(xs) < 1220:
+                print("✅ Outline mapped back to frame coordinates")
+            else:
+                print(f"❌ Outline points not in frame coordinates: {scan['points']}")
+
+            # Off-centre code: only the periodic full-frame decode can see it
+            await page.evaluate(SETUP_CAMERA, 700)
+            await page.click('#scanButton')
+            await page.wait_for_function("window.windowScan", timeout=15000)
+
+            offset = await page.evaluate("""() => ({
+                scan: window.windowScan,
+                full: window.decodedSizes.filter(([w, h]) => w === 1920 && h === 1080).length,
+                total: window.decodedSizes.length,
+            })""")
+
+            if offset['scan']['text'] == 'scan-window-700' and offset['scan']['region'] == 'full':
+                print(f"✅ Off-centre code found by a full-frame retry ({offset['full']} of {offset['total']} decodes)")
+            else:
+                print(f"❌ Off-centre code: {offset['scan']}")
+
+            if offset['full'] < offset['total']:
+                print("✅ Full frames decoded at a lower rate than the window")
+            else:
+                print("❌ Every decode used the full frame")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_scan_window())
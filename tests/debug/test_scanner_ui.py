@@ -104,30 +104,31 @@ async def test_scanner_ui():
                 console.log('window.barcodeApp:', window.barcodeApp);
                 console.log('window.appModules:', window.appModules);
                 if (scanner) {
-                    // Create a mock ZXing result
+                    // Create a mock decode result
                     const mockResult = {
-                        getText: () => 'https://example.com',
-                        getBarcodeFormat: () => 1, // QR_CODE format
-                        getResultPoints: () => [
-                            { getX: () => 250, getY: () => 150 },
-                            { getX: () => 350, getY: () => 150 },
-                            { getX: () => 350, getY: () => 250 },
-                            { getX: () => 250, getY: () => 250 }
-                        ]
+                        text: 'https://example.com',
+                        format: 1, // CODABAR format
+                        points: [
+                            { x: 250, y: 150 },
+                            { x: 350, y: 150 },
+                            { x: 350, y: 250 },
+                            { x: 250, y: 250 }
+                        ],
+                        macro: null,
                     };
                     
-                    console.log('About to call handleZXingCode with:', mockResult);
+                    console.log('About to call handleScanResult with:', mockResult);
                     
                     // Check video visibility before
                     const videoBefore = document.getElementById('video');
-                    console.log('Video display before handleZXingCode:', videoBefore.style.display);
+                    console.log('Video display before handleScanResult:', videoBefore.style.display);
                     
                     // Trigger the scan result handler
-                    scanner.handleZXingCode(mockResult);
+                    scanner.handleScanResult(mockResult);
                     
                     // Check video visibility after
                     const videoAfter = document.getElementById('video');
-                    console.log('Video display after handleZXingCode:', videoAfter.style.display);
+                    console.log('Video display after handleScanResult:', videoAfter.style.display);
                 } else {
                     console.log('Scanner not found');
                 }
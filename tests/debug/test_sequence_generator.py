@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test serial sequence generation with vectorized check digits
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_sequence_generator():
+    """Test check digits, range validation and feeding sequences into batch export"""
+
+    # Start server
+    PORT = 38464
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            result = await page.evaluate("""async () => {
+                const { generateSequence, gs1CheckDigit } = await import('./modules/sequence.js');
+
+                const start = performance.now();
+                const million = generateSequence({ type: 'ean13', prefix: '590123', start: 0, count: 1000000, step: 1 });
+                const elapsed = performance.now() - start;
+
+                // Spot-check against the scalar implementation
+                let mismatches = 0;
+                for (let i = 0; i < million.length; i += 997) {
+                    const code = million.get(i);
+                    if (gs1CheckDigit(code.slice(0, -1)) !== Number(code.slice(-1))) mismatches++;
+                }
+
+                let overflowRejected = false;
+                try {
+                    generateSequence({ type: 'ean8', prefix: '1234', start: 990, count: 20, step: 1 });
+                } catch (e) {
+                    overflowRejected = true;
+                }
+
+                const rejectedSteps = [0, -1, 1.5].filter((step) => {
+                    try {
+                        generateSequence({ type: 'ean13', prefix: '590123', start: 10, count: 5, step });
+                        return false;
+                    } catch (e) {
+                        return true;
+                    }
+                });
+
+                return {
+                    elapsed,
+                    rejectedSteps,
+                    first: million.get(0),
+                    known: generateSequence({ type: 'ean13', prefix: '590123412', start: 345, count: 1 }).get(0),
+                    itf: generateSequence({ type: 'interleaved2of5', prefix: '1', start: 5, count: 3, step: 5 }).get(2),
+                    mismatches,
+                    overflowRejected,
+                };
+            }""")
+
+            print(f"Sequence result: {result}")
+
+            if result['known'] == '5901234123457':
+                print("✅ Known EAN-13 check digit matches")
+            else:
+                print("❌ Wrong EAN-13 check digit")
+
+            if result['mismatches'] == 0:
+                print("✅ Vectorized check digits agree with scalar implementation")
+            else:
+                print(f"❌ {result['mismatches']} check digit mismatches")
+
+            if result['elapsed'] < 1000:
+                print(f"✅ 1,000,000 GTINs in {result['elapsed']:.0f}ms")
+            else:
+                print(f"❌ Sequence generation too slow: {result['elapsed']:.0f}ms")
+
+            if result['overflowRejected']:
+                print("✅ Ranges that overflow the serial width are rejected")
+
+            if result['rejectedSteps'] == [0, -1, 1.5]:
+                print("✅ Zero, negative and fractional steps are rejected")
+            else:
+                print(f"❌ Rejected steps: {result['rejectedSteps']}")
+
+            # Fill the batch list from the UI
+            await page.select_option('#barcodeType', 'ean13')
+            if await page.is_visible('#sequenceGroup'):
+                print("✅ Sequence options shown for EAN-13")
+            await page.fill('#sequencePrefix', '590123')
+            await page.fill('#sequenceStart', '1')
+            await page.fill('#sequenceCount', '25')
+            await page.click('#sequenceFillBtn')
+            lines = (await page.input_value('#batchInput')).split('\n')
+            if len(lines) == 25 and all(len(line) == 13 for line in lines):
+                print("✅ Batch list filled with 25 full-length codes")
+            else:
+                print(f"❌ Unexpected batch list: {lines[:3]}")
+
+            # A zero step is reported like the other sequence fields and leaves the list alone
+            await page.fill('#sequenceStep', '0')
+            await page.click('#sequenceFillBtn')
+            message = await page.text_content('#generatorMessages') or ''
+            unchanged = (await page.input_value('#batchInput')).split('\n') == lines
+            if 'step' in message and unchanged:
+                print("✅ Zero step reported in the UI")
+            else:
+                print(f"❌ Zero step: message {message!r}, batch list unchanged {unchanged}")
+            await page.fill('#sequenceStep', '1')
+
+            # Full-length codes pass validation and render
+            await page.fill('#textInput', lines[0])
+            await page.click('#generateBarcodeBtn')
+            await page.wait_for_selector('#generatedBarcodeContainer canvas, #generatedBarcodeContainer svg', timeout=5000)
+            print("✅ Full-length EAN-13 from the sequence rendered")
+
+            await page.select_option('#barcodeType', 'qrcode')
+            if not await page.is_visible('#sequenceGroup'):
+                print("✅ Sequence options hidden for QR Code")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_sequence_generator())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the persistent-stream decode loop: one getUserMedia call, no overlapping decodes
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_single_stream_decode():
+    """Test that a live scan opens the camera once and decodes a code from the stream"""
+
+    # Start server
+    PORT = 38474
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            # Fake camera: a QR Code drawn onto a canvas stream
+            await page.evaluate("""async () => {
+                const symbol = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'single-stream', options: { scale: 6, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                const camera = document.createElement('canvas');
+                camera.width = 640;
+                camera.height = 480;
+                const ctx = camera.getContext('2d');
+                setInterval(() => {
+                    ctx.fillStyle = '#fff';
+                    ctx.fillRect(0, 0, 640, 480);
+                    ctx.drawImage(symbol, 320 - symbol.width / 2, 240 - symbol.height / 2);
+                }, 33);
+
+                window.cameraOpens = 0;
+                navigator.mediaDevices.getUserMedia = async () => {
+                    window.cameraOpens++;
+                    return camera.captureStream(30);
+                };
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+            }""")
+
+            await page.click('button:has-text("Scan Barcodes")')
+            await page.click('#scanButton')
+            await page.wait_for_function("document.getElementById('scanResult').textContent.length > 0", timeout=15000)
+
+            result = await page.evaluate("""() => ({
+                text: document.getElementById('scanResult').textContent,
+                opens: window.cameraOpens,
+                stats: window.appModules.scanner.scanStats,
+            })""")
+
+            print(f"Decoded: {result['text']}; stats: {result['stats']}")
+            if result['text'] == 'single-stream':
+                print("✅ Code decoded from the persistent stream")
+            else:
+                print("❌ Wrong or missing result")
+
+            if result['opens'] == 1:
+                print("✅ Camera opened exactly once")
+            else:
+                print(f"❌ Camera opened {result['opens']} times")
+
+            if result['stats']['firstDecodeMs'] is not None and result['stats']['firstDecodeMs'] < 2000:
+                print(f"✅ First decode after {result['stats']['firstDecodeMs']:.0f}ms")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_single_stream_decode())
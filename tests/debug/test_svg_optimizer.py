@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test the SVG path optimizer: smaller output that renders the same pixels
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_svg_optimizer():
+    """Compare bwip-js SVG output before and after optimization"""
+
+    # Start server
+    PORT = 38463
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            results = await page.evaluate("""async () => {
+                const { optimizeSvg } = await import('./modules/svgOptimizer.js');
+
+                const rasterize = (svg) => new Promise((resolve, reject) => {
+                    const img = new Image();
+                    img.onload = () => {
+                        const canvas = document.createElement('canvas');
+                        canvas.width = img.naturalWidth;
+                        canvas.height = img.naturalHeight;
+                        const ctx = canvas.getContext('2d');
+                        ctx.fillStyle = 'white';
+                        ctx.fillRect(0, 0, canvas.width, canvas.height);
+                        ctx.drawImage(img, 0, 0);
+                        resolve(ctx.getImageData(0, 0, canvas.width, canvas.height).data);
+                    };
+                    img.onerror = reject;
+                    img.src = 'data:image/svg+xml;charset=utf-8,' + encodeURIComponent(svg);
+                });
+
+                const cases = [
+                    { bcid: 'qrcode', text: 'https://example.com/' + 'x'.repeat(300), eclevel: 'H' },
+                    { bcid: 'datamatrix', text: 'D'.repeat(400) },
+                    { bcid: 'pdf417', text: 'PDF417 '.repeat(40) },
+                    { bcid: 'azteccode', text: 'Aztec '.repeat(40) },
+                    { bcid: 'code128', text: 'CODE128-0123456789', height: 10, includetext: true },
+                    { bcid: 'ean13', text: '590123412345', height: 10, includetext: true },
+                    // bwip-js draws the background as a 100% x 100% rect
+                    { bcid: 'qrcode', text: 'Background', backgroundcolor: 'ffffff' },
+                ];
+
+                const results = [];
+                for (const options of cases) {
+                    const original = bwipjs.toSVG({ scale: 3, padding: 10, ...options });
+                    const optimized = optimizeSvg(original);
+
+                    const a = await rasterize(original);
+                    const b = await rasterize(optimized);
+                    let differing = 0;
+                    for (let i = 0; i < a.length; i += 4) {
+                        if (Math.abs(a[i] - b[i]) > 128) differing++;
+                    }
+
+                    results.push({
+                        bcid: options.backgroundcolor ? `${options.bcid} (background)` : options.bcid,
+                        hasNaN: optimized.includes('NaN'),
+                        originalBytes: original.length,
+                        optimizedBytes: optimized.length,
+                        ratio: +(original.length / optimized.length).toFixed(2),
+                        differingPixels: differing,
+                        totalPixels: a.length / 4,
+                    });
+                }
+                return results;
+            }""")
+
+            for result in results:
+                print(f"{result['bcid']}: {result['originalBytes']} -> {result['optimizedBytes']} bytes "
+                      f"({result['ratio']}x), {result['differingPixels']} differing pixels")
+
+                # Anti-aliasing along merged edges may flip a handful of pixels
+                if result['differingPixels'] <= result['totalPixels'] * 0.001:
+                    print(f"  ✅ {result['bcid']} renders identically")
+                else:
+                    print(f"  ❌ {result['bcid']} rendering changed")
+
+                if result['hasNaN']:
+                    print(f"  ❌ {result['bcid']} output contains NaN coordinates")
+
+                if result['optimizedBytes'] < result['originalBytes']:
+                    print(f"  ✅ {result['bcid']} output is smaller")
+                else:
+                    print(f"  ❌ {result['bcid']} output did not shrink")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_svg_optimizer())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test the table-driven validation engine: per-row results and bulk throughput
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_validation_engine():
+    """Test rule coverage for all symbologies and 100k-row CSV validation speed"""
+
+    # Start server
+    PORT = 38469
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            result = await page.evaluate("""async () => {
+                const { validateValue, validateRows, csvColumn, VALIDATION_RULES } = await import('./modules/validation.js');
+
+                const cases = [
+                    ['ean13', '590123412345', []],
+                    ['ean13', '5901234123457', []],
+                    ['ean13', '5901234123450', ['checkDigit']],
+                    ['ean13', '59012a', ['charset', 'length']],
+                    ['ean8', '96385074', []],
+                    ['upca', '036000291452', []],
+                    ['upce', '12345', ['length']],
+                    ['code39', 'abc', ['charset']],
+                    ['code128', 'héllo', ['charset']],
+                    ['interleaved2of5', '123', ['length']],
+                    ['codabar', 'A1A3B', ['guards']],
+                    ['codabar', 'A123B', []],
+                    ['qrcode', 'x'.repeat(3000), ['capacity']],
+                    ['qrcode', '1'.repeat(7000), []],
+                    ['datamatrix', 'A'.repeat(2400), ['capacity']],
+                    ['pdf417', 'é'.repeat(600), ['capacity']],
+                    ['azteccode', 'hello', []],
+                ];
+                const failures = cases
+                    .map(([type, text, expected]) => ({ type, text: text.slice(0, 16), expected,
+                        actual: validateValue(type, text).map((e) => e.code) }))
+                    .filter((c) => c.actual.join() !== c.expected.join());
+
+                // 100k-row CSV, payload in the second column, every tenth row invalid
+                const lines = [];
+                for (let i = 0; i < 100000; i++) {
+                    lines.push(`${i},"${i % 10 ? '590123' + String(i).padStart(6, '0') : 'bad-' + i}",note`);
+                }
+                const csv = lines.join('\\n');
+                const start = performance.now();
+                const { results, validCount, invalidCount } = validateRows('ean13', csvColumn(csv, 1));
+                const elapsed = performance.now() - start;
+
+                return {
+                    types: Object.keys(VALIDATION_RULES).length,
+                    failures,
+                    elapsed,
+                    validCount,
+                    invalidCount,
+                    firstInvalid: results.find((r) => !r.ok),
+                };
+            }""")
+
+            print(f"Rules defined for {result['types']} barcode types")
+            if result['types'] == 12:
+                print("✅ All 12 generator types have rules")
+
+            if not result['failures']:
+                print("✅ Every rule case produced the expected error codes")
+            else:
+                for failure in result['failures']:
+                    print(f"❌ {failure}")
+
+            print(f"100k rows: {result['validCount']} valid, {result['invalidCount']} invalid "
+                  f"in {result['elapsed']:.0f}ms; first invalid: {result['firstInvalid']}")
+            if result['elapsed'] < 1000 and result['invalidCount'] == 10000:
+                print("✅ 100k-row CSV validated well under a second")
+            else:
+                print("❌ Bulk validation too slow or wrong")
+
+            # The batch check button reports row-level problems
+            await page.select_option('#barcodeType', 'ean8')
+            await page.fill('#batchInput', '9638507\n96385074\n96385070\n\nabc')
+            await page.click('#batchCheckBtn')
+            message = await page.text_content('#mainMessageArea')
+            print(f"Batch check: {message}")
+            if '2 of 4 rows are invalid' in message and 'line 3' in message:
+                print("✅ Batch check lists invalid rows")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_validation_engine())
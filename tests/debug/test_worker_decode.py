@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test live decoding in the worker: frames transferred as ImageBitmaps, results posted back with points
+"""
+
+import asyncio
+import http.server
+import socketserver
+import threading
+from playwright.async_api import async_playwright
+
+async def test_worker_decode():
+    """Test that camera frames decode in the worker while the main thread keeps drawing"""
+
+    # Start server
+    PORT = 38475
+    handler = http.server.SimpleHTTPRequestHandler
+    httpd = socketserver.TCPServer(("", PORT), handler)
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    print(f"Server started on port {PORT}")
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+
+            await page.goto(f'http://localhost:{PORT}')
+            await page.wait_for_load_state('networkidle')
+
+            print("✓ App loaded")
+
+            # Fake camera, and a record of main-thread frame gaps and worker results
+            await page.evaluate("""async () => {
+                const symbol = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'worker-decode', options: { scale: 6, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                const camera = document.createElement('canvas');
+                camera.width = 1280;
+                camera.height = 720;
+                const ctx = camera.getContext('2d');
+                setInterval(() => {
+                    ctx.fillStyle = '#fff';
+                    ctx.fillRect(0, 0, 1280, 720);
+                    ctx.drawImage(symbol, 640 - symbol.width / 2, 360 - symbol.height / 2);
+                }, 33);
+
+                navigator.mediaDevices.getUserMedia = async () => camera.captureStream(30);
+                navigator.mediaDevices.enumerateDevices = async () => [
+                    { kind: 'videoinput', deviceId: 'fake', label: 'Fake camera', groupId: 'fake' },
+                ];
+
+                const scanner = window.appModules.scanner;
+                const handle = scanner.handleScanResult.bind(scanner);
+                scanner.handleScanResult = (scan) => {
+                    window.workerScan = scan;
+                    handle(scan);
+                };
+
+                window.longestFrameGap = 0;
+                let last = performance.now();
+                const tick = (now) => {
+                    window.longestFrameGap = Math.max(window.longestFrameGap, now - last);
+                    last = now;
+                    if (!window.workerScan) requestAnimationFrame(tick);
+                };
+                requestAnimationFrame(tick);
+            }""")
+
+            await page.click('button:has-text("Scan Barcodes")')
+            await page.click('#scanButton')
+            await page.wait_for_function("window.workerScan", timeout=15000)
+
+            result = await page.evaluate("""() => ({
+                scan: window.workerScan,
+                pool: !!window.appModules.scanner.engines.zxing.pool,
+                frames: window.appModules.scanner.scanStats.framesDecoded,
+                gap: window.longestFrameGap,
+            })""")
+
+            scan = result['scan']
+            print(f"Worker result: {scan['text']} in {scan.get('decodeMs', 0):.1f}ms after {result['frames']} frames")
+
+            if result['pool'] and 'decodeMs' in scan:
+                print("✅ Frames decoded in the worker")
+            else:
+                print("❌ Frames were not decoded in the worker")
+
+            if scan['text'] == 'worker-decode':
+                print("✅ Correct text posted back")
+            else:
+                print("❌ Wrong text posted back")
+
+            if len(scan['points']) >= 3 and all('x' in point and 'y' in point for point in scan['points']):
+                print(f"✅ {len(scan['points'])} result points posted back")
+            else:
+                print("❌ Missing result points")
+
+            if result['gap'] < 100:
+                print(f"✅ Main thread kept drawing (longest frame gap {result['gap']:.0f}ms)")
+            else:
+                print(f"❌ Main thread stalled for {result['gap']:.0f}ms")
+
+            # A worker that crashes is replaced, and is never idle twice
+            pool = await page.evaluate("""async () => {
+                const { DecodePool } = await import('/modules/DecodePool.js');
+                const script = URL.createObjectURL(new Blob([`
+                    self.onmessage = (event) => {
+                        const { id, type } = event.data;
+                        if (type === 'crash') throw new Error('crashed');
+                        if (type === 'echo') self.postMessage({ id, result: event.data.value });
+                    };
+                `], { type: 'text/javascript' }));
+                const pool = new DecodePool(1, script);
+                const first = await pool.run({ type: 'echo', value: 1 });
+                const crashed = pool.workers[0];
+                const error = await pool.run({ type: 'crash' }).then(() => null, (e) => e.message);
+                const second = await pool.run({ type: 'echo', value: 2 });
+                const state = {
+                    first, second, error,
+                    replaced: pool.workers.length === 1 && pool.workers[0] !== crashed,
+                    idle: pool.idle.length,
+                };
+                pool.terminate();
+                return state;
+            }""")
+
+            if pool['first'] == 1 and pool['second'] == 2 and pool['error'] and pool['replaced'] and pool['idle'] == 1:
+                print("✅ Crashed worker replaced; the pool keeps one idle entry per worker")
+            else:
+                print(f"❌ Pool after a crash: {pool}")
+
+            # A failed worker decode of a frame it never received is retried on the main thread
+            retried = await page.evaluate("""async () => {
+                const { ZXingEngine } = await import('/modules/engines.js');
+                const engine = new ZXingEngine();
+                engine.pool = { run: async () => { throw new Error('Worker failed'); } };
+                const symbol = await window.appModules.generator.generate({
+                    type: 'qrcode', text: 'retried-here', options: { scale: 4, backgroundcolor: 'ffffff' }, format: 'canvas',
+                });
+                const bitmap = await createImageBitmap(symbol);
+                const scans = await engine.decode(bitmap, [ZXing.BarcodeFormat.QR_CODE]);
+                return { text: scans[0] && scans[0].text, closed: bitmap.width === 0, useWorker: engine.useWorker };
+            }""")
+
+            if retried['text'] == 'retried-here' and retried['closed'] and not retried['useWorker']:
+                print("✅ Frame retried on the main thread and its bitmap closed")
+            else:
+                print(f"❌ Retry after a worker failure: {retried}")
+
+            await browser.close()
+
+    finally:
+        httpd.shutdown()
+        print("Server stopped")
+
+if __name__ == "__main__":
+    asyncio.run(test_worker_decode())